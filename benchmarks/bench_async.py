@@ -0,0 +1,59 @@
+"""
+Compare throughput of the sync and async clients against the local stub.
+
+Usage: ``python -m benchmarks.bench_async --requests 2000 --concurrency 100``
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_server import start_stub_server
+from evolutionapi import AsyncEvolutionAPI, EvolutionAPI
+
+
+def bench_sync(base_url: str, total: int, concurrency: int) -> float:
+    client = EvolutionAPI(base_url, "bench-key")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda i: client.instances.fetch(f"i-{i}"), range(total)))
+    return total / (time.perf_counter() - started)
+
+
+async def bench_async(base_url: str, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncEvolutionAPI(
+        base_url, "bench-key", max_connections=concurrency
+    ) as client:
+
+        async def fetch(i: int) -> None:
+            async with semaphore:
+                await client.instances.fetch(f"i-{i}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch(i) for i in range(total)))
+        return total / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(latency=args.latency)
+    try:
+        sync_rps = bench_sync(base_url, args.requests, args.concurrency)
+        async_rps = asyncio.run(bench_async(base_url, args.requests, args.concurrency))
+    finally:
+        server.shutdown()
+
+    print(f"sync  (threads={args.concurrency}): {sync_rps:10.1f} req/s")
+    print(f"async (tasks={args.concurrency}):   {async_rps:10.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
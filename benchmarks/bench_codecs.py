@@ -0,0 +1,71 @@
+"""
+Compare JSON codecs on representative Evolution API payloads.
+
+Usage: ``python -m benchmarks.bench_codecs --instances 500 --repeat 200``
+"""
+
+import argparse
+import time
+from typing import Any, Callable, List
+
+from benchmarks.stub_server import instance_payload
+from evolutionapi.codecs import Codec, JSONCodec, LazyResponse, OrjsonCodec
+
+
+def send_text_payload(i: int) -> dict:
+    return {
+        "number": f"55119{i:08d}",
+        "options": {"delay": 1200, "presence": "composing", "linkPreview": False},
+        "textMessage": {"text": f"Olá! Seu pedido #{i} foi confirmado. ✅"},
+    }
+
+
+def fetch_instances_payload(count: int) -> List[dict]:
+    return [instance_payload(f"instance-{i}") for i in range(count)]
+
+
+def timeit(func: Callable[[], Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def available_codecs() -> List[Codec]:
+    codecs: List[Codec] = [JSONCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        print("orjson is not installed, skipping it")
+    return codecs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instances", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    message = send_text_payload(1)
+    listing = fetch_instances_payload(args.instances)
+    print(f"{'codec':8} {'operation':32} {'us/op':>10}")
+    for codec in available_codecs():
+        body = codec.dumps(listing)
+        results = {
+            "encode sendText": timeit(lambda: codec.dumps(message), args.repeat * 50),
+            f"decode fetchInstances ({args.instances})": timeit(
+                lambda: codec.loads(body), args.repeat
+            ),
+            "lazy fetchInstances, unread": timeit(
+                lambda: LazyResponse(body, codec), args.repeat
+            ),
+            "lazy fetchInstances, one field": timeit(
+                lambda: LazyResponse(body, codec)[0]["instance"], args.repeat
+            ),
+        }
+        for operation, micros in results.items():
+            print(f"{codec.name:8} {operation:32} {micros:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare memory use and build time of instance representations.
+
+Usage: ``python -m benchmarks.bench_models --instances 50000``
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+from evolutionapi.schemas import InstanceInfo, InstanceRecord
+
+
+def fetch_instances_body(count: int) -> bytes:
+    return json.dumps(
+        [
+            {
+                "instance": {
+                    "instanceName": f"instance-{i}",
+                    "instanceId": f"af6c5b7c-ee27-4f94-9ea8-{i:012d}",
+                    "owner": f"55119{i:08d}@s.whatsapp.net",
+                    "profileName": f"Profile {i}",
+                    "profilePictureUrl": None,
+                    "profileStatus": "Available",
+                    "status": "open",
+                    "serverUrl": "https://evolution.example.com",
+                    "apikey": f"B3844804-481D-47A4-{i:016d}",
+                    "integration": {"integration": "WHATSAPP-BAILEYS"},
+                }
+            }
+            for i in range(count)
+        ]
+    ).encode()
+
+
+def measure(build: Callable[[bytes], List[Any]], body: bytes):
+    started = time.perf_counter()
+    build(body)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    result = build(body)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instances", type=int, default=50_000)
+    args = parser.parse_args()
+
+    body = fetch_instances_body(args.instances)
+    candidates = {
+        "raw dicts": json.loads,
+        "InstanceRecord": lambda b: list(InstanceRecord.from_payloads(json.loads(b))),
+        "pydantic InstanceInfo": lambda b: [
+            InstanceInfo.model_validate(item["instance"]) for item in json.loads(b)
+        ],
+    }
+
+    print(f"{'representation':24} {'retained MB':>12} {'build ms':>10}")
+    for name, build in candidates.items():
+        elapsed, size = measure(build, body)
+        print(f"{name:24} {size / 2**20:12.1f} {elapsed * 1000:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
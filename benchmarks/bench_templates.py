@@ -0,0 +1,67 @@
+"""
+Measure the per-call overhead of building ``/instance/create`` payloads.
+
+Compares `Instance.create` with `Instance.create_from_template`, without
+network I/O. Usage: ``python -m benchmarks.bench_templates --calls 100000``
+"""
+
+import argparse
+import time
+from typing import Any, Dict
+
+from evolutionapi.resources.instances import Instance, InstanceTemplate
+from evolutionapi.schemas import ProxySettings
+
+SETTINGS: Dict[str, Any] = {
+    "webhook": "https://webhook.example.com/evolution",
+    "webhook_by_events": True,
+    "events": ["MESSAGES_UPSERT", "CONNECTION_UPDATE", "QRCODE_UPDATED"],
+    "chatwoot_account_id": 1,
+    "chatwoot_token": "chatwoot-token",
+    "chatwoot_url": "https://chatwoot.example.com",
+    "typebot_url": "https://typebot.example.com",
+    "typebot": "support-bot",
+}
+
+
+class NullClient:
+    def _post(self, path: str, json: Dict[str, Any]) -> Dict[str, Any]:
+        return json
+
+
+def per_call(func, calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+
+    instances = Instance(NullClient())
+    proxy = {"host": "proxy.example.com", "port": "3128", "protocol": "socks5"}
+    template = InstanceTemplate(proxy=proxy, **SETTINGS)
+
+    results = {
+        "create": per_call(
+            lambda i: instances.create(
+                instance_name=f"tenant-{i}",
+                proxy=ProxySettings(**proxy),
+                **SETTINGS,
+            ),
+            args.calls,
+        ),
+        "create_from_template": per_call(
+            lambda i: instances.create_from_template(template, f"tenant-{i}"),
+            args.calls,
+        ),
+    }
+    for name, micros in results.items():
+        print(f"{name:22} {micros:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare connection count and throughput of the HTTP/1.1 and HTTP/2 transports.
+
+``RequestsTransport`` runs against the HTTP/1.1 stub server, ``HTTP2Transport``
+against its cleartext HTTP/2 counterpart, both adding the same latency.
+
+Usage: ``python -m benchmarks.bench_transports --concurrency 100,1000``
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Tuple
+
+from benchmarks.h2_stub_server import H2StubServer
+from benchmarks.stub_server import start_stub_server
+from evolutionapi import EvolutionAPI
+from evolutionapi.pool import PoolConfig
+from evolutionapi.transports import HTTP2Transport, RequestsTransport, Transport
+
+
+def bench(
+    base_url: str, transport: Transport, total: int, concurrency: int
+) -> Tuple[float, int]:
+    with EvolutionAPI(base_url, "bench-key", transport=transport) as client:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda i: client.instances.fetch(f"i-{i}"), range(total)))
+        elapsed = time.perf_counter() - started
+        return total / elapsed, client.pool_stats().created
+
+
+def run(
+    name: str,
+    base_url: str,
+    make_transport: Callable[[int], Transport],
+    total: int,
+    concurrency: int,
+) -> None:
+    rps, connections = bench(base_url, make_transport(concurrency), total, concurrency)
+    print(
+        f"{name:<8} concurrency={concurrency:<5} {rps:10.1f} req/s "
+        f"{connections:6d} connections"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", default="100,1000")
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=5,
+        help="requests per unit of concurrency",
+    )
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--max-streams", type=int, default=128)
+    args = parser.parse_args()
+
+    http1_server, http1_url = start_stub_server(latency=args.latency)
+    http2_server = H2StubServer(args.latency, args.max_streams)
+    http2_url = http2_server.start()
+    try:
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            total = args.requests * concurrency
+            run(
+                "HTTP/1.1",
+                http1_url,
+                lambda n: RequestsTransport(PoolConfig(pool_maxsize=n)),
+                total,
+                concurrency,
+            )
+            run(
+                "HTTP/2",
+                http2_url,
+                lambda n: HTTP2Transport(max_connections=n, http1=False),
+                total,
+                concurrency,
+            )
+    finally:
+        http1_server.shutdown()
+        http2_server.stop()
+
+
+if __name__ == "__main__":
+    main()
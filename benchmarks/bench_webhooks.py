@@ -0,0 +1,137 @@
+"""
+Load-test the webhook receiver with synthetic Evolution API events.
+
+Starts a local webhook server, posts events at it from concurrent clients and
+reports throughput, refused events and handler activity.
+
+Usage: ``python -m benchmarks.bench_webhooks --events 20000 --concurrency 32``
+"""
+
+import argparse
+import json
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+import requests
+
+from evolutionapi.webhooks import DedupWindow, WebhookDispatcher, make_server
+
+EVENTS = ("messages.upsert", "messages.update", "connection.update")
+
+
+def synthetic_event(i: int, instances: int, duplicate_rate: float) -> bytes:
+    # Resend the previous event for a share of the posts, like a redelivery.
+    if duplicate_rate and i and i % round(1 / duplicate_rate) == 0:
+        i -= 1
+    return json.dumps(
+        {
+            "event": EVENTS[i % len(EVENTS)],
+            "instance": f"instance-{i % instances}",
+            "data": {
+                "key": {
+                    "remoteJid": f"55119{i % 10_000:08d}@s.whatsapp.net",
+                    "fromMe": False,
+                    "id": f"3EB0{i:016X}",
+                },
+                "pushName": "Load Test",
+                "message": {"conversation": f"synthetic message {i}"},
+                "messageTimestamp": 1_700_000_000 + i,
+            },
+            "server_url": "http://127.0.0.1",
+            "apikey": "bench",
+        }
+    ).encode()
+
+
+def post_events(url: str, total: int, concurrency: int, args) -> Dict[int, int]:
+    local = threading.local()
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+
+    def post(i: int) -> None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        body = synthetic_event(i, args.instances, args.duplicates)
+        status = session.post(
+            url, data=body, headers={"Content-Type": "application/json"}
+        ).status_code
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(post, range(total)))
+    return statuses
+
+
+def serve(args, ports: multiprocessing.Queue, stop: multiprocessing.Event) -> None:
+    dispatcher = WebhookDispatcher(
+        workers=args.workers,
+        queue_size=args.queue_size,
+        dedup=DedupWindow() if args.duplicates else None,
+        put_timeout=0.5,
+    )
+    if args.batch_size:
+        dispatcher.on_batch(
+            handler=lambda batch: time.sleep(args.handler_latency),
+            max_size=args.batch_size,
+            max_wait=0.1,
+        )
+    else:
+        dispatcher.on(handler=lambda event: time.sleep(args.handler_latency))
+
+    server = make_server(dispatcher, host="127.0.0.1", port=0)
+    threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    ).start()
+    ports.put(server.server_address[1])
+    stop.wait()
+    server.shutdown()
+    dispatcher.stop()
+    ports.put(dispatcher.stats())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--instances", type=int, default=50)
+    parser.add_argument("--duplicates", type=float, default=0.05)
+    parser.add_argument("--handler-latency", type=float, default=0.0)
+    parser.add_argument("--batch-size", type=int, default=0)
+    parser.add_argument(
+        "--url", help="Post to an already running receiver instead of a local one"
+    )
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        # The receiver runs in its own process so that the load generator
+        # does not compete with it for the GIL.
+        ports: multiprocessing.Queue = multiprocessing.Queue()
+        stop = multiprocessing.Event()
+        server = multiprocessing.Process(target=serve, args=(args, ports, stop))
+        server.start()
+        url = f"http://127.0.0.1:{ports.get()}/webhook"
+
+    started = time.perf_counter()
+    statuses = post_events(url, args.events, args.concurrency, args)
+    posted = time.perf_counter() - started
+
+    print(f"posted:     {args.events} events in {posted:.2f}s")
+    print(f"throughput: {args.events / posted:10.1f} events/s")
+    print(f"statuses:   {dict(sorted(statuses.items()))}")
+    if server is not None:
+        stop.set()
+        print(f"dispatcher: {ports.get()}")
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
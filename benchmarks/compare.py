@@ -0,0 +1,80 @@
+"""
+Compare two result files of `benchmarks.suite` and flag regressions.
+
+A case regresses when its throughput drops, or its p99 latency grows, by more
+than the threshold. Exits with status 1 if any case regressed.
+
+Usage: ``python -m benchmarks.compare baseline.json current.json --threshold 0.1``
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def load(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as source:
+        document = json.load(source)
+    return {result["name"]: result for result in document["results"]}
+
+
+def compare(
+    baseline: Dict[str, Dict[str, Any]],
+    current: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[Dict[str, Any]]:
+    """
+    Compare the cases present in both documents.
+
+    Returns:
+        One row per case with the relative throughput and p99 changes and
+        whether the case regressed.
+    """
+    rows = []
+    for name in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[name], current[name]
+        throughput = _change(before["throughput"], after["throughput"])
+        p99 = _change(before["p99_ms"], after["p99_ms"])
+        rows.append(
+            {
+                "name": name,
+                "throughput": throughput,
+                "p99": p99,
+                "regressed": throughput < -threshold or p99 > threshold,
+            }
+        )
+    return rows
+
+
+def _change(before: float, after: float) -> float:
+    if not before:
+        return 0.0
+    return (after - before) / before
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    baseline, current = load(args.baseline), load(args.current)
+    rows = compare(baseline, current, args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regressed"] else ""
+        print(
+            f"{row['name']:32} throughput {row['throughput']:+8.1%}  "
+            f"p99 {row['p99']:+8.1%}  {flag}"
+        )
+    for name in sorted(baseline.keys() - current.keys()):
+        print(f"{name:32} missing from {args.current}")
+
+    regressions = sum(row["regressed"] for row in rows)
+    print(f"{regressions} regression(s) out of {len(rows)} case(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
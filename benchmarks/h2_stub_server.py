@@ -0,0 +1,144 @@
+"""
+HTTP/2 counterpart of the stub server, used by the transport benchmark.
+
+Speaks cleartext HTTP/2 with prior knowledge (h2c), as `HTTP2Transport`
+does with ``http1=False``, serves ``/instance/fetchInstances`` like
+`benchmarks.stub_server` and counts the connections it accepts. Streams are
+answered concurrently, so latency does not serialize a connection.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import h2.settings
+
+from benchmarks.stub_server import instance_payload
+
+
+class H2StubServer:
+    """Cleartext HTTP/2 stub server running an event loop in a daemon thread."""
+
+    def __init__(self, latency: float = 0.0, max_concurrent_streams: int = 128):
+        """
+        Initialize the server.
+
+        Args:
+            latency: Artificial delay in seconds added to every response
+            max_concurrent_streams: Streams a client may open per connection.
+                Defaults to 128, like nginx
+        """
+        self.latency = latency
+        self.max_concurrent_streams = max_concurrent_streams
+        self.connections = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind, 0 picks a free one
+
+        Returns:
+            The base URL of the server.
+        """
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(host, port, ready), daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+        return f"http://{host}:{self._server.sockets[0].getsockname()[1]}"
+
+    def stop(self) -> None:
+        """Stop serving and close the open connections."""
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _run(self, host: str, port: int, ready: threading.Event) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._serve, host, port, backlog=1024)
+        )
+        ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer) -> None:
+        self.connections += 1
+        connection = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False)
+        )
+        connection.initiate_connection()
+        connection.update_settings(
+            {
+                h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: (
+                    self.max_concurrent_streams
+                )
+            }
+        )
+        writer.write(connection.data_to_send())
+        paths: Dict[int, str] = {}
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                for event in connection.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        paths[event.stream_id] = dict(event.headers)[b":path"].decode()
+                    elif isinstance(event, h2.events.DataReceived):
+                        connection.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                    elif isinstance(event, h2.events.StreamEnded):
+                        path = paths.pop(event.stream_id)
+                        asyncio.ensure_future(
+                            self._respond(connection, writer, event.stream_id, path)
+                        )
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                writer.write(connection.data_to_send())
+        except (ConnectionError, h2.exceptions.ProtocolError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, connection, writer, stream_id: int, path: str) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        url = urlsplit(path)
+        if url.path == "/instance/fetchInstances":
+            name = parse_qs(url.query).get("instanceName", ["stub"])[0]
+            status, payload = 200, [instance_payload(name)]
+        else:
+            status, payload = 404, {"error": "Not Found"}
+        body = json.dumps(payload).encode()
+        connection.send_headers(
+            stream_id,
+            [
+                (":status", str(status)),
+                ("content-type", "application/json"),
+                ("content-length", str(len(body))),
+            ],
+        )
+        connection.send_data(stream_id, body, end_stream=True)
+        writer.write(connection.data_to_send())
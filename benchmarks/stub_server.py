@@ -0,0 +1,162 @@
+"""
+Minimal local stand-in for an Evolution API server, used by the benchmarks.
+
+Run it standalone with ``python -m benchmarks.stub_server --port 8080`` or
+start it in-process with `start_stub_server`. Latency, server errors, 429s
+and response sizes can be simulated to exercise retries and pooling.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+def instance_payload(name: str, padding: int = 0) -> dict:
+    payload = {
+        "instance": {
+            "instanceName": name,
+            "instanceId": "af6c5b7c-ee27-4f94-9ea8-192393746ddd",
+            "status": "open",
+            "serverUrl": "http://127.0.0.1",
+            "apikey": "123456",
+        }
+    }
+    if padding:
+        payload["instance"]["profileStatus"] = "x" * padding
+    return payload
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY every
+    # keep-alive response stalls on delayed ACKs.
+    disable_nagle_algorithm = True
+    latency = 0.0
+    error_rate = 0.0
+    throttle_rate = 0.0
+    retry_after = 0
+    payload_size = 0
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send_json(self, status: int, payload, headers=()) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _simulate(self) -> bool:
+        """Apply latency and injected failures; return True if a reply was sent."""
+        if self.latency:
+            time.sleep(self.latency)
+        roll = random.random()
+        if roll < self.throttle_rate:
+            retry_after = (("Retry-After", str(self.retry_after)),)
+            self._send_json(429, {"error": "Too Many Requests"}, retry_after)
+            return True
+        if roll < self.throttle_rate + self.error_rate:
+            self._send_json(500, {"error": "Internal Server Error"})
+            return True
+        return False
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if self._simulate():
+            return
+        if url.path == "/instance/fetchInstances":
+            name = parse_qs(url.query).get("instanceName", ["stub"])[0]
+            self._send_json(200, [instance_payload(name, self.payload_size)])
+        else:
+            self._send_json(404, {"error": "Not Found"})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self._simulate():
+            return
+        if urlsplit(self.path).path == "/instance/create":
+            name = body.get("instanceName", "stub")
+            self._send_json(201, instance_payload(name, self.payload_size))
+        else:
+            self._send_json(404, {"error": "Not Found"})
+
+
+def make_handler(
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    throttle_rate: float = 0.0,
+    retry_after: int = 0,
+    payload_size: int = 0,
+) -> type:
+    """
+    Build a `StubHandler` subclass with the given behaviour.
+
+    Args:
+        latency: Artificial delay in seconds added to every response
+        error_rate: Fraction of requests answered with ``500``
+        throttle_rate: Fraction of requests answered with ``429``
+        retry_after: ``Retry-After`` value in seconds sent with ``429``
+        payload_size: Bytes of padding added to every instance payload
+    """
+    return type(
+        "Handler",
+        (StubHandler,),
+        {
+            "latency": latency,
+            "error_rate": error_rate,
+            "throttle_rate": throttle_rate,
+            "retry_after": retry_after,
+            "payload_size": payload_size,
+        },
+    )
+
+
+def start_stub_server(
+    host: str = "127.0.0.1", port: int = 0, **behaviour
+) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the stub server in a daemon thread.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind, 0 picks a free one
+        **behaviour: Keyword arguments of `make_handler`, e.g. ``latency``
+
+    Returns:
+        The running server and its base URL.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(**behaviour))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=0)
+    parser.add_argument("--payload-size", type=int, default=0)
+    args = parser.parse_args()
+
+    handler = make_handler(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        payload_size=args.payload_size,
+    )
+    ThreadingHTTPServer((args.host, args.port), handler).serve_forever()
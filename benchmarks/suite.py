@@ -0,0 +1,291 @@
+"""
+Benchmark suite for the client against the local stub server.
+
+Measures throughput and p50/p99 latency of ``instances.create`` and
+``instances.fetch`` across concurrency levels, response payload sizes and
+modes (threads, ``create_many`` bulk and, when httpx is installed, the async
+client), and writes the results as JSON for `benchmarks.compare`.
+
+Usage: ``python -m benchmarks.suite --output results.json``
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from benchmarks.stub_server import start_stub_server
+from evolutionapi import EvolutionAPI, __version__
+from evolutionapi.instrumentation import Instrument, RequestMetrics
+from evolutionapi.pool import PoolConfig
+from evolutionapi.retry import RetryPolicy
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+OPERATIONS = ("create", "fetch")
+
+
+@dataclass(frozen=True)
+class Case:
+    operation: str
+    mode: str
+    concurrency: int
+    payload_size: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.operation}/{self.mode}/c{self.concurrency}/p{self.payload_size}"
+
+
+class LatencyRecorder(Instrument):
+    """Collect the total duration of every request, retries included."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        with self._lock:
+            self.latencies.append(metrics.total)
+            self.errors += metrics.error is not None
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def make_client(base_url: str, case: Case, retry: bool, recorder: Instrument):
+    return EvolutionAPI(
+        base_url,
+        "bench-key",
+        pool_config=PoolConfig(pool_maxsize=max(10, case.concurrency)),
+        retry_policy=(
+            RetryPolicy(
+                backoff_factor=0.01, retry_post_paths=frozenset({"/instance/create"})
+            )
+            if retry
+            else None
+        ),
+        instruments=[recorder],
+    )
+
+
+def call(client, operation: str, i: int):
+    if operation == "create":
+        return client.instances.create(instance_name=f"bench-{i}")
+    return client.instances.fetch(f"bench-{i}")
+
+
+def run_threads(base_url: str, case: Case, total: int, retry: bool):
+    recorder = LatencyRecorder()
+    client = make_client(base_url, case, retry, recorder)
+
+    def safe_call(i: int) -> None:
+        try:
+            call(client, case.operation, i)
+        except Exception:
+            pass  # counted by the recorder
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=case.concurrency) as executor:
+        list(executor.map(safe_call, range(total)))
+    elapsed = time.perf_counter() - started
+    client.session.close()
+    return elapsed, recorder.latencies, recorder.errors
+
+
+def run_bulk(base_url: str, case: Case, total: int, retry: bool):
+    recorder = LatencyRecorder()
+    client = make_client(base_url, case, retry, recorder)
+    specs = ({"instance_name": f"bench-{i}"} for i in range(total))
+
+    started = time.perf_counter()
+    for _ in client.instances.create_many(specs, max_concurrency=case.concurrency):
+        pass
+    elapsed = time.perf_counter() - started
+    client.session.close()
+    return elapsed, recorder.latencies, recorder.errors
+
+
+def run_async(base_url: str, case: Case, total: int, retry: bool):
+    from evolutionapi import AsyncEvolutionAPI
+
+    async def main():
+        latencies: List[float] = []
+        errors = 0
+        semaphore = asyncio.Semaphore(case.concurrency)
+
+        async with AsyncEvolutionAPI(
+            base_url, "bench-key", max_connections=case.concurrency
+        ) as client:
+
+            async def one(i: int) -> None:
+                nonlocal errors
+                async with semaphore:
+                    started = time.perf_counter()
+                    try:
+                        await call(client, case.operation, i)
+                    except Exception:
+                        errors += 1
+                    latencies.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(total)))
+            return time.perf_counter() - started, latencies, errors
+
+    return asyncio.run(main())
+
+
+RUNNERS = {"threads": run_threads, "bulk": run_bulk, "async": run_async}
+
+
+def cases(
+    concurrency: Sequence[int], payload_sizes: Sequence[int], modes: Sequence[str]
+) -> List[Case]:
+    result = []
+    for operation, mode, workers, size in itertools.product(
+        OPERATIONS, modes, concurrency, payload_sizes
+    ):
+        if mode == "bulk" and operation != "create":
+            continue
+        result.append(Case(operation, mode, workers, size))
+    return result
+
+
+def run_suite(
+    requests: int,
+    concurrency: Sequence[int],
+    payload_sizes: Sequence[int],
+    modes: Sequence[str],
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    throttle_rate: float = 0.0,
+    retry: bool = False,
+    warmup: int = 50,
+) -> Dict[str, Any]:
+    """
+    Run every benchmark case and return the results document.
+
+    A stub server is started per payload size. Each case is warmed up with
+    ``warmup`` requests before being measured.
+    """
+    results = []
+    for size in payload_sizes:
+        server, base_url = start_stub_server(
+            latency=latency,
+            error_rate=error_rate,
+            throttle_rate=throttle_rate,
+            payload_size=size,
+        )
+        try:
+            for case in cases(concurrency, [size], modes):
+                runner = RUNNERS[case.mode]
+                if warmup:
+                    runner(base_url, case, warmup, retry)
+                elapsed, latencies, errors = runner(base_url, case, requests, retry)
+                result = {
+                    "name": case.name,
+                    **asdict(case),
+                    "requests": requests,
+                    "errors": errors,
+                    "seconds": round(elapsed, 6),
+                    "throughput": round(requests / elapsed, 2),
+                    "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+                    "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+                }
+                results.append(result)
+                print(
+                    f"{case.name:32} {result['throughput']:10.1f} req/s  "
+                    f"p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  "
+                    f"errors {errors}"
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    return {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "settings": {
+                "requests": requests,
+                "latency": latency,
+                "error_rate": error_rate,
+                "throttle_rate": throttle_rate,
+                "retry": retry,
+            },
+        },
+        "results": results,
+    }
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32])
+    parser.add_argument("--payload-sizes", type=_int_list, default=[0, 16384])
+    parser.add_argument(
+        "--modes",
+        default="threads,bulk" + (",async" if httpx is not None else ""),
+        help="Comma-separated subset of: threads, bulk, async",
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--retry", action="store_true", help="Retry 429 and 5xx in the client"
+    )
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    modes = [mode for mode in args.modes.split(",") if mode]
+    unknown = set(modes) - set(RUNNERS)
+    if unknown:
+        parser.error(f"unknown modes: {sorted(unknown)}")
+    if "async" in modes and httpx is None:
+        parser.error("async mode requires httpx")
+
+    document = run_suite(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        payload_sizes=args.payload_sizes,
+        modes=modes,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry=args.retry,
+        warmup=args.warmup,
+    )
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(document, output, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,32 @@
-from .client import EvolutionAPI  # noqa: F401
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
 __version__ = "0.1.0"
+
+# Public names and the module defining them. They are imported on first
+# access, so ``import evolutionapi`` does not load requests, httpx or pydantic.
+_LAZY_ATTRIBUTES = {
+    "EvolutionAPI": "evolutionapi.client",
+    "AsyncEvolutionAPI": "evolutionapi.async_client",
+    "ProxySettings": "evolutionapi.schemas",
+}
+
+__all__ = ["AsyncEvolutionAPI", "EvolutionAPI", "ProxySettings", "__version__"]
+
+if TYPE_CHECKING:
+    from .async_client import AsyncEvolutionAPI  # noqa: F401
+    from .client import EvolutionAPI  # noqa: F401
+    from .schemas import ProxySettings  # noqa: F401
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
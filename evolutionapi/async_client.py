@@ -0,0 +1,224 @@
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Optional,
+    Union,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from evolutionapi.client import _handle_response
+from evolutionapi.media import Destination, MediaSource, upload_body
+from evolutionapi.resources import LazyResource
+from evolutionapi.singleflight import AsyncSingleFlight
+from evolutionapi.streaming import aiter_json_array
+from evolutionapi.utils import request_key
+
+if TYPE_CHECKING:
+    from evolutionapi.batch import AsyncBatch
+    from evolutionapi.websocket import EventStream
+
+
+class AsyncEvolutionAPI:
+    """Asynchronous client for Evolution API."""
+
+    # Resources, imported on first access
+    instances = LazyResource("evolutionapi.resources.instances", "AsyncInstance")
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: Optional[float] = None,
+        transport: Optional[Any] = None,
+        coalesce: bool = False,
+        http2: bool = False,
+    ) -> None:
+        """
+        Initialize the asynchronous Evolution API client.
+
+        Requests are sent through a pooled ``httpx.AsyncClient``, so a single
+        event loop can drive many concurrent calls over a bounded number of
+        connections.
+
+        Args:
+            base_url: Base URL for the Evolution API
+            api_key: API key for authentication
+            max_connections: Maximum number of concurrent connections
+            max_keepalive_connections: Maximum number of idle connections kept alive
+            timeout: Request timeout in seconds. Default is no timeout
+            transport: Optional httpx transport, mainly useful for testing
+            coalesce: Share one HTTP call between concurrent identical GET
+                requests. The number of deduplicated calls is available from
+                ``single_flight.coalesced``
+            http2: Multiplex concurrent requests over HTTP/2 connections when
+                the server supports it. Requires the h2 package
+                (``pip install python_evolution_api[http2]``)
+
+        Raises:
+            ImportError: If httpx, or h2 when ``http2`` is set, is not installed
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncEvolutionAPI requires httpx. "
+                "Install it with: pip install python_evolution_api[async]"
+            )
+
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.session = httpx.AsyncClient(
+            headers={"Content-Type": "application/json", "apikey": api_key},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=timeout,
+            transport=transport,
+            http2=http2,
+        )
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+
+    async def __aenter__(self) -> "AsyncEvolutionAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self.session.aclose()
+
+    def events(self, instance_name: Optional[str] = None, **kwargs) -> "EventStream":
+        """
+        Open the websocket event stream of an instance.
+
+        Requires ``websocket_enabled`` on the instance (see `Instance.create`).
+
+        Args:
+            instance_name: Instance whose events to receive. None receives the
+                events of every instance when the server emits them globally
+            **kwargs: Other `EventStream` options (events, queue_size, ...)
+
+        Returns:
+            The stream, to iterate with ``async for`` or use with callbacks.
+        """
+        from evolutionapi.websocket import EventStream
+
+        return EventStream(self.base_url, instance_name, api_key=self.api_key, **kwargs)
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        if method == "GET" and self.single_flight is not None:
+            key = request_key(method, path, kwargs.get("params"))
+            return await self.single_flight.do(
+                key, lambda: self._send(method, path, **kwargs)
+            )
+        return await self._send(method, path, **kwargs)
+
+    async def _send(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        url = f"{self.base_url}{path}"
+
+        response = await self.session.request(method, url, **kwargs)
+
+        return _handle_response(response)
+
+    async def _stream_json_array(self, path: str, **kwargs) -> AsyncIterator[Any]:
+        """Send a GET request and yield the items of its JSON array body."""
+        url = f"{self.base_url}{path}"
+
+        async with self.session.stream("GET", url, **kwargs) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                _handle_response(response)
+            async for item in aiter_json_array(response.aiter_bytes()):
+                yield item
+
+    def batch(
+        self, max_concurrency: int = 10, raise_errors: bool = True
+    ) -> "AsyncBatch":
+        """
+        Record calls and run them concurrently, chaining dependent ones.
+
+        Use as ``async with client.batch() as b:``; calls made through ``b`` (e.g.
+        ``b.instances.create(...)``) return futures that later calls can
+        take as arguments. See `AsyncBatch`.
+
+        Args:
+            max_concurrency: Maximum number of calls running at once
+            raise_errors: Raise `BatchError` on exit if any call failed
+
+        Returns:
+            The batch.
+        """
+        from evolutionapi.batch import AsyncBatch
+
+        return AsyncBatch(self, max_concurrency, raise_errors)
+
+    async def upload(
+        self,
+        path: str,
+        file: Union[MediaSource, Iterable[bytes]],
+        field: Optional[str] = "file",
+        fields: Optional[Dict[str, Any]] = None,
+        file_name: Optional[str] = None,
+        content_type: Optional[str] = None,
+        method: str = "POST",
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Upload a file without loading it in memory. See `EvolutionAPI.upload`.
+
+        Chunks are read from the file in the event loop, one at a time.
+        """
+        body = upload_body(file, field, fields, file_name, content_type)
+        headers = {**kwargs.pop("headers", {}), "Content-Type": body.content_type}
+        if body.size is not None:
+            headers["Content-Length"] = str(body.size)
+        return await self._send(
+            method, path, content=aiter(body), headers=headers, **kwargs
+        )
+
+    async def download(
+        self,
+        path: str,
+        destination: Union[str, os.PathLike, BinaryIO],
+        method: str = "GET",
+        chunk_size: int = 65536,
+        **kwargs,
+    ) -> int:
+        """
+        Download a response body straight to disk. See `EvolutionAPI.download`.
+
+        Chunks are written in the event loop, one at a time.
+        """
+        url = f"{self.base_url}{path}"
+
+        async with self.session.stream(method, url, **kwargs) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                _handle_response(response)
+            with Destination(destination) as target:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    target.write(chunk)
+        return target.written
+
+    async def _get(self, path: str, **kwargs) -> Dict[str, Any]:
+        return await self._request("GET", path, **kwargs)
+
+    async def _post(self, path: str, **kwargs) -> Dict[str, Any]:
+        return await self._request("POST", path, **kwargs)
+
+    async def _put(self, path: str, **kwargs) -> Dict[str, Any]:
+        return await self._request("PUT", path, **kwargs)
+
+    async def _delete(self, path: str, **kwargs) -> Dict[str, Any]:
+        return await self._request("DELETE", path, **kwargs)
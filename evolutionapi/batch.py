@@ -0,0 +1,380 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from operator import itemgetter
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+
+class BatchError(Exception):
+    """Error raised when leaving a batch in which some calls failed."""
+
+    def __init__(self, errors: Sequence[Exception], total: int) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            errors: Exceptions of the failed calls, in recording order
+            total: Number of calls recorded in the batch
+        """
+        self.errors = list(errors)
+        self.total = total
+
+        super().__init__(
+            f"{len(self.errors)} of {total} batch calls failed: {self.errors[0]!r}"
+        )
+
+
+class DependencyError(Exception):
+    """Error of a batch call skipped because a call it depends on failed."""
+
+    def __init__(self, cause: BaseException) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            cause: The exception of the failed dependency
+        """
+        self.cause = cause
+
+        super().__init__(f"A dependency failed: {cause!r}")
+
+
+class _Chaining(ABC):
+    """Derivation of futures from the result of other futures."""
+
+    def __getitem__(self, key: Any):
+        """Return a future of ``result[key]``."""
+        return self.then(itemgetter(key))
+
+    def then(self, func: Callable[[Any], Any]):
+        """
+        Return a future of ``func(result)``.
+
+        Args:
+            func: Called with the result once it is available
+
+        Returns:
+            A future of the same batch, usable as a call argument.
+        """
+        derived = self._derive()
+
+        def resolve(future) -> None:
+            if derived.done():
+                return
+            if future.cancelled():
+                derived.cancel()
+                return
+            error = future.exception()
+            if error is not None:
+                derived.set_exception(error)
+                return
+            try:
+                derived.set_result(func(future.result()))
+            except Exception as exc:
+                derived.set_exception(exc)
+
+        self.add_done_callback(resolve)
+        return derived
+
+    @abstractmethod
+    def _derive(self):
+        """Return a new pending future of the same kind."""
+
+
+class BatchFuture(_Chaining, Future):
+    """
+    Result of a call recorded in a `Batch`.
+
+    Pass it, or a future derived with ``future["key"]`` or `then`, as an
+    argument of a later call to make that call wait for this one.
+    """
+
+    def _derive(self) -> "BatchFuture":
+        return BatchFuture()
+
+
+class AsyncBatchFuture(_Chaining, asyncio.Future):
+    """Result of a call recorded in an `AsyncBatch`. See `BatchFuture`."""
+
+    def _derive(self) -> "AsyncBatchFuture":
+        return AsyncBatchFuture(loop=self.get_loop())
+
+
+class _Recorder:
+    """Stand-in recording the calls of a client, resource or method."""
+
+    def __init__(self, batch, target: Any, after: Tuple[Any, ...] = ()) -> None:
+        self._batch = batch
+        self._target = target
+        self._after = after
+
+    def __getattr__(self, name: str) -> "_Recorder":
+        return _Recorder(self._batch, getattr(self._target, name), self._after)
+
+    def __call__(self, *args, **kwargs):
+        return self._batch._record(self._target, args, kwargs, self._after)
+
+
+class _BaseBatch(ABC):
+    def __init__(self, client, max_concurrency: int, raise_errors: bool) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.raise_errors = raise_errors
+        self.futures: List[Any] = []
+
+    def __getattr__(self, name: str) -> _Recorder:
+        return _Recorder(self, getattr(self.client, name))
+
+    def call(self, func: Callable[..., Any], *args, **kwargs):
+        """
+        Record a call of any function, e.g. a helper running several calls.
+
+        Args:
+            func: The function. Futures in its arguments are resolved first
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            A future of its result.
+        """
+        return self._record(func, args, kwargs, ())
+
+    def after(self, *futures) -> _Recorder:
+        """
+        Make the next call wait for ``futures``, without using their results.
+
+        Example: ``b.after(created)._post(f"/webhook/set/{name}", json=...)``.
+
+        Args:
+            *futures: Futures of this batch
+
+        Returns:
+            A stand-in for the client recording calls with these dependencies.
+        """
+        return _Recorder(self, self.client, futures)
+
+    @abstractmethod
+    def _record(self, func, args, kwargs, after) -> Any:
+        """Schedule ``func(*args, **kwargs)`` and return a future of its result."""
+
+    def _raise_errors(self) -> None:
+        errors = [
+            future.exception()
+            for future in self.futures
+            if not future.cancelled() and future.exception() is not None
+        ]
+        if errors and self.raise_errors:
+            raise BatchError(errors, len(self.futures))
+
+
+class Batch(_BaseBatch):
+    """
+    Records client calls and runs them concurrently, chaining dependent ones.
+
+    Calls recorded in the batch return a `BatchFuture` at once. A call
+    starts as soon as the futures in its arguments are resolved, on a pool
+    of ``max_concurrency`` threads, so independent calls run concurrently
+    and a multi-step workflow takes as long as its critical path rather
+    than the sum of its calls. Everything is resolved when the block exits.
+
+    Example::
+
+        with client.batch() as b:
+            created = b.instances.create(instance_name="shop", qrcode=True)
+            b.after(created)._post("/webhook/set/shop", json=webhook)
+            b.after(created)._post("/settings/set/shop", json=settings)
+            fetched = b.instances.fetch(created["instance"]["instanceName"])
+        print(fetched.result())
+    """
+
+    def __init__(
+        self, client, max_concurrency: int = 10, raise_errors: bool = True
+    ) -> None:
+        """
+        Initialize the batch.
+
+        Args:
+            client: `EvolutionAPI` client
+            max_concurrency: Maximum number of calls running at once
+            raise_errors: Raise `BatchError` on exit if any call failed.
+                Otherwise errors are only raised by ``future.result()``
+        """
+        super().__init__(client, max_concurrency, raise_errors)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._lock = threading.Lock()
+
+    def _record(self, func, args, kwargs, after) -> BatchFuture:
+        future = BatchFuture()
+        self.futures.append(future)
+        dependencies = _find_futures((args, kwargs, after))
+        remaining = [len(dependencies)]
+
+        def start(_=None) -> None:
+            with self._lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+            if future.done():  # cancelled
+                return
+            try:
+                self._executor.submit(self._run, future, func, args, kwargs, after)
+            except RuntimeError as exc:  # the batch is shutting down
+                future.set_exception(exc)
+
+        remaining[0] += 1
+        for dependency in dependencies:
+            dependency.add_done_callback(start)
+        start()
+        return future
+
+    def _run(self, future: BatchFuture, func, args, kwargs, after) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            _resolve(after)
+            args, kwargs = _resolve((args, kwargs))
+        except DependencyError as exc:
+            future.set_exception(exc)
+            return
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+
+    def wait(self) -> None:
+        """Wait until every recorded call completed."""
+        while True:
+            futures = list(self.futures)
+            wait_futures(futures)
+            if len(futures) == len(self.futures):
+                return
+
+    def __enter__(self) -> "Batch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            for future in self.futures:
+                future.cancel()
+        self.wait()
+        self._executor.shutdown(wait=True)
+        if exc_type is None:
+            self._raise_errors()
+
+
+class AsyncBatch(_BaseBatch):
+    """
+    Asynchronous `Batch` for `AsyncEvolutionAPI`.
+
+    Recorded calls return an `AsyncBatchFuture` and run as tasks of the
+    event loop, at most ``max_concurrency`` at once::
+
+        async with client.batch() as b:
+            created = b.instances.create(instance_name="shop")
+            fetched = b.instances.fetch(created["instance"]["instanceName"])
+        print(fetched.result())
+    """
+
+    def __init__(
+        self, client, max_concurrency: int = 10, raise_errors: bool = True
+    ) -> None:
+        """
+        Initialize the batch.
+
+        Args:
+            client: `AsyncEvolutionAPI` client
+            max_concurrency: Maximum number of calls running at once
+            raise_errors: Raise `BatchError` on exit if any call failed.
+                Otherwise errors are only raised by ``future.result()``
+        """
+        super().__init__(client, max_concurrency, raise_errors)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _record(self, func, args, kwargs, after) -> AsyncBatchFuture:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        future = AsyncBatchFuture()
+        self.futures.append(future)
+        self._tasks.append(
+            asyncio.ensure_future(self._run(future, func, args, kwargs, after))
+        )
+        return future
+
+    async def _run(self, future: AsyncBatchFuture, func, args, kwargs, after) -> None:
+        dependencies = _find_futures((args, kwargs, after))
+        if dependencies:
+            await asyncio.wait(dependencies)
+        try:
+            _resolve(after)
+            args, kwargs = _resolve((args, kwargs))
+        except DependencyError as exc:
+            future.set_exception(exc)
+            return
+        try:
+            async with self._semaphore:
+                result = func(*args, **kwargs)
+                if asyncio.iscoroutine(result):
+                    result = await result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    async def wait(self) -> None:
+        """Wait until every recorded call completed."""
+        while True:
+            tasks = list(self._tasks)
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if len(tasks) == len(self._tasks):
+                return
+
+    async def __aenter__(self) -> "AsyncBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            for task in self._tasks:
+                task.cancel()
+        await self.wait()
+        if exc_type is None:
+            self._raise_errors()
+
+
+def _find_futures(value: Any) -> List[Any]:
+    found: List[Any] = []
+    _collect(value, found)
+    return found
+
+
+def _collect(value: Any, found: List[Any]) -> None:
+    if isinstance(value, _Chaining):
+        found.append(value)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            _collect(item, found)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect(item, found)
+
+
+def _resolve(value: Any) -> Any:
+    """Replace the futures in ``value`` with their results."""
+    if isinstance(value, _Chaining):
+        if value.cancelled():
+            raise DependencyError(CancelledError())
+        if value.exception() is not None:
+            raise DependencyError(value.exception())
+        return value.result()
+    if isinstance(value, (list, tuple, set)):
+        return type(value)(_resolve(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _resolve(item) for key, item in value.items()}
+    return value
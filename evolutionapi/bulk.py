@@ -0,0 +1,235 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+@dataclass(frozen=True)
+class BulkResult:
+    """
+    Outcome of one item of a bulk operation.
+
+    Attributes:
+        index: Position of the item in the input iterable
+        item: The input item
+        result: The response payload when the call succeeded
+        error: The exception raised when the call failed
+    """
+
+    index: int
+    item: Any
+    result: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the call succeeded."""
+        return self.error is None
+
+
+def _call(func: Callable[[Any], Any], index: int, item: Any) -> BulkResult:
+    try:
+        return BulkResult(index=index, item=item, result=func(item))
+    except Exception as error:
+        return BulkResult(index=index, item=item, error=error)
+
+
+def run_concurrently(
+    func: Callable[[Any], Any], items: Iterable[Any], max_concurrency: int = 10
+) -> Iterator[BulkResult]:
+    """
+    Call ``func`` for every item using a bounded pool of threads.
+
+    Items are consumed lazily and at most ``max_concurrency`` calls are in
+    flight at once, so memory stays bounded for arbitrarily large inputs.
+    Failures are returned as results instead of aborting the batch.
+
+    Args:
+        func: Callable invoked with each item
+        items: Items to process
+        max_concurrency: Maximum number of concurrent calls
+
+    Yields:
+        A `BulkResult` per item, in completion order.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    pending = set()
+    try:
+        for index, item in enumerate(items):
+            if len(pending) >= max_concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(_call, func, index, item))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def run_partitioned(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    partition: Callable[[Any], Hashable],
+    max_concurrency: int = 10,
+    max_pending: Optional[int] = None,
+    throttle: Optional[Callable[[Any], float]] = None,
+) -> Iterator[BulkResult]:
+    """
+    Call ``func`` for every item, concurrently across partitions only.
+
+    Items sharing a partition key are processed one at a time, in input
+    order; items of different partitions run concurrently on a bounded pool
+    of threads. Items are consumed lazily: at most ``max_pending`` items wait
+    for their turn, so a busy partition slows down reading of the input
+    instead of buffering it.
+
+    Args:
+        func: Callable invoked with each item
+        items: Items to process
+        partition: Returns the partition key of an item
+        max_concurrency: Maximum number of concurrent calls
+        max_pending: Maximum number of items read but not started. Defaults
+            to ten times ``max_concurrency``
+        throttle: Called before an item starts. Returns 0 to start it now, or
+            the seconds to wait, during which other partitions keep running
+
+    Yields:
+        A `BulkResult` per item, in completion order.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    max_pending = max_pending or 10 * max_concurrency
+
+    source = enumerate(items)
+    exhausted = False
+    # Partitions with pending or running items; a partition is in `ready`
+    # when it has pending items and none running.
+    lanes: Dict[Hashable, Deque[Tuple[int, Any]]] = {}
+    ready: List[Tuple[float, int, Hashable]] = []
+    order = itertools.count()
+    running: Dict[Future, Hashable] = {}
+    pending = 0
+
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    try:
+        while True:
+            while not exhausted and pending < max_pending:
+                try:
+                    index, item = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                key = partition(item)
+                if key not in lanes:
+                    lanes[key] = deque()
+                    heapq.heappush(ready, (0.0, next(order), key))
+                lanes[key].append((index, item))
+                pending += 1
+
+            now = time.monotonic()
+            while ready and ready[0][0] <= now and len(running) < max_concurrency:
+                _, _, key = heapq.heappop(ready)
+                index, item = lanes[key][0]
+                delay = throttle(item) if throttle is not None else 0
+                if delay > 0:
+                    heapq.heappush(ready, (now + delay, next(order), key))
+                    continue
+                lanes[key].popleft()
+                pending -= 1
+                running[executor.submit(_call, func, index, item)] = key
+
+            if not running:
+                if not ready:
+                    if exhausted:
+                        return
+                    continue
+                time.sleep(max(0.0, ready[0][0] - time.monotonic()))
+                continue
+
+            timeout = None
+            if ready and len(running) < max_concurrency:
+                timeout = max(0.0, ready[0][0] - time.monotonic())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                if lanes[key]:
+                    heapq.heappush(ready, (0.0, next(order), key))
+                else:
+                    del lanes[key]
+                yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def _acall(
+    func: Callable[[Any], Awaitable[Any]], index: int, item: Any
+) -> BulkResult:
+    try:
+        return BulkResult(index=index, item=item, result=await func(item))
+    except Exception as error:
+        return BulkResult(index=index, item=item, error=error)
+
+
+async def arun_concurrently(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    max_concurrency: int = 10,
+) -> AsyncIterator[BulkResult]:
+    """
+    Asynchronous counterpart of `run_concurrently`.
+
+    Args:
+        func: Coroutine function invoked with each item
+        items: Items to process
+        max_concurrency: Maximum number of concurrent calls
+
+    Yields:
+        A `BulkResult` per item, in completion order.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    pending = set()
+    try:
+        for index, item in enumerate(items):
+            if len(pending) >= max_concurrency:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+            pending.add(asyncio.ensure_future(_acall(func, index, item)))
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Snapshot of response cache usage.
+
+    Attributes:
+        hits: Lookups answered from the cache
+        misses: Lookups that required a request, including expired entries
+        evictions: Entries dropped because the cache was full
+        invalidations: Entries dropped because of a write on their instance
+        size: Entries currently stored
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU cache for read responses.
+
+    The lock only guards dictionary operations, never the HTTP call, so
+    threads sharing a cache do not serialize on each other's requests.
+    Cached payloads are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 5.0,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Default time to live in seconds
+            ttls: Time to live per path or path prefix, e.g.
+                ``{"/instance/fetchInstances": 1.0}``. A TTL of 0 disables
+                caching for matching paths
+            clock: Monotonic clock, mainly useful for testing
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, instance_name, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Optional[str], Any]]" = (
+            OrderedDict()
+        )
+        self._by_instance: Dict[Optional[str], Set[Hashable]] = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def ttl_for(self, path: str) -> float:
+        """
+        Return the time to live configured for a path.
+
+        An exact match wins over the longest matching prefix, which wins over
+        the default TTL.
+        """
+        if path in self.ttls:
+            return self.ttls[path]
+        prefixes = [prefix for prefix in self.ttls if path.startswith(prefix)]
+        if prefixes:
+            return self.ttls[max(prefixes, key=len)]
+        return self.ttl
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every invalidation."""
+        return self._generation
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """
+        Return the cached value for ``key``.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or ``default`` if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[2]
+            if entry is not None:
+                self._remove(key)
+            self._misses += 1
+            return default
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        path: str,
+        instance_name: Optional[str] = None,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            path: Request path, used to look up the TTL
+            instance_name: Instance the value belongs to, None for listings
+            generation: `generation` read before the request was sent. The
+                value is dropped if an invalidation happened meanwhile
+        """
+        ttl = self.ttl_for(path)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self._clock() + ttl, instance_name, value)
+            self._by_instance.setdefault(instance_name, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def invalidate(self, instance_name: Optional[str] = None) -> None:
+        """
+        Drop entries affected by a write.
+
+        Entries of ``instance_name`` and listings that are not tied to a single
+        instance are removed. Without an instance name everything is removed.
+
+        Args:
+            instance_name: Instance that was written to
+        """
+        with self._lock:
+            self._generation += 1
+            if instance_name is None:
+                keys = list(self._entries)
+            else:
+                keys = list(self._by_instance.get(instance_name, ()))
+                keys.extend(self._by_instance.get(None, ()))
+            for key in keys:
+                self._remove(key)
+            self._invalidations += len(keys)
+
+    def clear(self) -> None:
+        """Remove every entry without touching the counters."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_instance.clear()
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+            )
+
+    def _remove(self, key: Hashable) -> None:
+        _, instance_name, _ = self._entries.pop(key)
+        keys = self._by_instance.get(instance_name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_instance[instance_name]
@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from evolutionapi.exceptions import CircuitOpenError
+
+
+class CircuitState(str, Enum):
+    """States of a circuit."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+StateListener = Callable[[str, CircuitState, CircuitState], None]
+
+
+class _Circuit:
+    __slots__ = ("state", "outcomes", "opened_at", "trials", "trial_successes")
+
+    def __init__(self, window_size: int) -> None:
+        self.state = CircuitState.CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.opened_at = 0.0
+        self.trials = 0
+        self.trial_successes = 0
+
+
+class CircuitBreaker:
+    """
+    Fail fast while an Evolution API node is unhealthy.
+
+    Each circuit tracks the outcome of the last ``window_size`` calls. Once at
+    least ``minimum_calls`` were made and the failure rate reaches
+    ``failure_rate_threshold``, the circuit opens and calls fail immediately
+    with `CircuitOpenError`. After ``cooldown`` seconds it lets
+    ``half_open_max_calls`` trial calls through: if they all succeed the
+    circuit closes, otherwise it opens again.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_size: int = 20,
+        cooldown: float = 30.0,
+        half_open_max_calls: int = 1,
+        per_path: bool = False,
+        on_state_change: Optional[StateListener] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_rate_threshold: Failure rate (0-1) that opens the circuit
+            minimum_calls: Calls needed before the failure rate is evaluated
+            window_size: Number of recent calls the failure rate is computed on
+            cooldown: Seconds a circuit stays open before trial calls
+            half_open_max_calls: Trial calls allowed while half-open
+            per_path: Keep a circuit per base URL and path instead of one per
+                base URL
+            on_state_change: Called with ``(key, old_state, new_state)`` on
+                every transition
+            clock: Monotonic clock, mainly useful for testing
+        """
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError("failure_rate_threshold must be between 0 and 1")
+        if minimum_calls > window_size:
+            raise ValueError("minimum_calls cannot exceed window_size")
+
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_size = window_size
+        self.cooldown = cooldown
+        self.half_open_max_calls = half_open_max_calls
+        self.per_path = per_path
+        self._listeners: List[StateListener] = []
+        if on_state_change is not None:
+            self._listeners.append(on_state_change)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def add_listener(self, listener: StateListener) -> None:
+        """Register a callback for state transitions."""
+        self._listeners.append(listener)
+
+    def key_for(self, base_url: str, path: str) -> str:
+        """Return the circuit key of a request."""
+        return f"{base_url}{path}" if self.per_path else base_url
+
+    def state(self, key: str) -> CircuitState:
+        """Return the current state of a circuit."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return CircuitState.CLOSED
+            if (
+                circuit.state is CircuitState.OPEN
+                and self._clock() - circuit.opened_at >= self.cooldown
+            ):
+                return CircuitState.HALF_OPEN
+            return circuit.state
+
+    def before_call(self, key: str) -> None:
+        """
+        Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all
+                trial calls already in flight
+        """
+        transition = None
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state is CircuitState.OPEN:
+                remaining = self.cooldown - (self._clock() - circuit.opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(key=key, retry_after=remaining)
+                transition = self._transition(key, circuit, CircuitState.HALF_OPEN)
+
+            if circuit.state is CircuitState.HALF_OPEN:
+                if circuit.trials >= self.half_open_max_calls:
+                    raise CircuitOpenError(key=key, retry_after=0.0)
+                circuit.trials += 1
+
+        self._notify(transition)
+
+    def release(self, key: str) -> None:
+        """
+        Give back a call allowed by `before_call` without recording an outcome.
+
+        For calls that fail for reasons unrelated to the node's health. A
+        half-open circuit lets another trial call through instead of waiting
+        forever for the outcome of this one.
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state is CircuitState.HALF_OPEN and circuit.trials:
+                circuit.trials -= 1
+
+    def record_success(self, key: str) -> None:
+        """Record a successful call."""
+        self._record(key, success=True)
+
+    def record_failure(self, key: str) -> None:
+        """Record a failed call."""
+        self._record(key, success=False)
+
+    def _record(self, key: str, success: bool) -> None:
+        transition = None
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state is CircuitState.HALF_OPEN:
+                if not success:
+                    transition = self._open(key, circuit)
+                else:
+                    circuit.trial_successes += 1
+                    if circuit.trial_successes >= self.half_open_max_calls:
+                        circuit.outcomes.clear()
+                        transition = self._transition(key, circuit, CircuitState.CLOSED)
+            elif circuit.state is CircuitState.CLOSED:
+                circuit.outcomes.append(success)
+                calls = len(circuit.outcomes)
+                failures = calls - sum(circuit.outcomes)
+                if (
+                    calls >= self.minimum_calls
+                    and failures / calls >= self.failure_rate_threshold
+                ):
+                    transition = self._open(key, circuit)
+
+        self._notify(transition)
+
+    def _circuit(self, key: str) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit(self.window_size)
+        return circuit
+
+    def _open(self, key: str, circuit: _Circuit) -> Tuple:
+        circuit.opened_at = self._clock()
+        return self._transition(key, circuit, CircuitState.OPEN)
+
+    def _transition(self, key: str, circuit: _Circuit, state: CircuitState) -> Tuple:
+        old_state = circuit.state
+        circuit.state = state
+        circuit.trials = 0
+        circuit.trial_successes = 0
+        return (key, old_state, state)
+
+    def _notify(self, transition: Optional[Tuple]) -> None:
+        if transition is None:
+            return
+        for listener in self._listeners:
+            listener(*transition)
@@ -1,56 +1,519 @@
-from typing import Any, Dict
+import os
+import time
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import requests
 
+from evolutionapi.cache import ResponseCache
+from evolutionapi.circuitbreaker import CircuitBreaker
+from evolutionapi.codecs import Codec, JSONCodec, LazyResponse
 from evolutionapi.exceptions import EvolutionAPIError
-from evolutionapi.resources.instances import Instance
+from evolutionapi.instrumentation import Instrument, RequestMetrics
+from evolutionapi.media import Destination, MediaSource, upload_body
+from evolutionapi.pool import (
+    PoolConfig,
+    PooledHTTPAdapter,
+    PoolStats,
+    connection_info,
+    reset_connection_info,
+)
+from evolutionapi.ratelimit import RateLimiter, api_key_scope
+from evolutionapi.resources import LazyResource
+from evolutionapi.retry import RetryCounters, RetryPolicy, RetryStats
+from evolutionapi.singleflight import SingleFlight
+from evolutionapi.streaming import iter_json_array
+from evolutionapi.transports import RequestsTransport, Transport
+from evolutionapi.utils import instance_name_from_request, path_template, request_key
+
+if TYPE_CHECKING:
+    from evolutionapi.batch import Batch
+
+_MISSING = object()
+
+
+def _handle_response(
+    response, codec: Optional[Codec] = None, lazy: bool = False
+) -> Dict[str, Any]:
+    """
+    Decode a response, raising on HTTP errors.
+
+    Works with any response object exposing ``status_code``, ``content`` and
+    ``json()``, so it is shared by the sync and async clients.
+
+    Args:
+        response: The HTTP response to handle
+        codec: Codec decoding the body. Defaults to ``response.json()``
+        lazy: Return a `LazyResponse` decoded on first access
+
+    Returns:
+        The decoded JSON body.
+
+    Raises:
+        EvolutionAPIError: If the response has an error status code
+    """
+    if response.status_code >= 400:
+        error_message = "Unknown error"
+        error_response = None
+
+        try:
+            error_data = response.json()
+            error_message = error_data.get("error", "Unknown error")
+            error_response = error_data
+        except Exception:
+            error_message = "Failed to parse error response"
+            error_response = None
+
+        raise EvolutionAPIError(
+            status_code=response.status_code,
+            error_message=error_message,
+            response=error_response,
+        )
+
+    if lazy:
+        return LazyResponse(response.content, codec or JSONCodec())
+    if codec is not None:
+        return codec.loads(response.content)
+    return response.json()
+
+
+def _body_size(body: Any) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode())
+    try:
+        return len(body)
+    except TypeError:
+        return 0
 
 
 class EvolutionAPI:
     """Client for Evolution API."""
 
-    def __init__(self, base_url: str, api_key: str) -> None:
+    # Resources, imported on first access
+    instances = LazyResource("evolutionapi.resources.instances", "Instance")
+    messages = LazyResource("evolutionapi.resources.messages", "Message")
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        pool_config: Optional[PoolConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        instruments: Optional[Sequence[Instrument]] = None,
+        codec: Optional[Codec] = None,
+        lazy_responses: bool = False,
+        transport: Optional[Transport] = None,
+    ) -> None:
         """
         Initialize the Evolution API client.
 
         Args:
             base_url: Base URL for the Evolution API
             api_key: API key for authentication
+            pool_config: Connection pool, keep-alive and timeout settings
+            cache: Optional read-through cache for GET responses. Writes
+                invalidate the cached entries of the instance they target
+            coalesce: Share one HTTP call between concurrent identical GET
+                requests. The number of deduplicated calls is available from
+                ``single_flight.coalesced``
+            retry_policy: Retry transient failures (429, 5xx, connection
+                errors) with exponential backoff. Disabled by default
+            rate_limiter: Client-side token bucket limiter consulted before
+                every request sent over the network
+            circuit_breaker: Fail fast with `CircuitOpenError` while the
+                server keeps returning 5xx responses or connection errors
+            instruments: Hooks receiving the timings, sizes and outcome of
+                every request sent over the network, e.g.
+                `HistogramAggregator`
+            codec: JSON codec for request bodies and responses, e.g.
+                `default_codec()` to use orjson when installed. Defaults to
+                the standard library through requests
+            lazy_responses: Return responses as `LazyResponse` objects that
+                are only decoded when accessed
+            transport: Sends the requests. Defaults to a `RequestsTransport`
+                built from ``pool_config``; see `HTTP2Transport` and
+                `InMemoryTransport`
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
-        self.session = requests.Session()
-        self.session.headers.update(
-            {"Content-Type": "application/json", "apikey": api_key}
+        self.pool_config = pool_config or PoolConfig()
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.retry_policy = retry_policy
+        self._retry_counters = RetryCounters()
+        self.rate_limiter = rate_limiter
+        self._rate_limit_scope = api_key_scope(api_key)
+        self.circuit_breaker = circuit_breaker
+        self.instruments = list(instruments or [])
+        self.codec = codec
+        self.lazy_responses = lazy_responses
+        self.transport = self._add_headers(transport or self._default_transport())
+
+    def _default_transport(self) -> Transport:
+        return RequestsTransport(self.pool_config)
+
+    def _add_headers(self, transport: Transport) -> Transport:
+        transport.update_headers(
+            {"Content-Type": "application/json", "apikey": self.api_key}
         )
+        return transport
+
+    @property
+    def session(self) -> Optional[requests.Session]:
+        """Session of the default `RequestsTransport`, None with other transports."""
+        if isinstance(self.transport, RequestsTransport):
+            return self.transport.session
+        return None
+
+    @property
+    def adapter(self) -> Optional[PooledHTTPAdapter]:
+        """Pooled adapter of the default `RequestsTransport`, None otherwise."""
+        if isinstance(self.transport, RequestsTransport):
+            return self.transport.adapter
+        return None
+
+    def pool_stats(self) -> PoolStats:
+        """
+        Return connection pool statistics.
+
+        Returns:
+            Counts of connections created, reused and discarded so far.
+        """
+        return self.transport.stats()
 
-        # Register resources
-        self.instances = Instance(self)
+    def close(self) -> None:
+        """Close the connections of the transport."""
+        self.transport.close()
+
+    def __enter__(self) -> "EvolutionAPI":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def retry_stats(self) -> RetryStats:
+        """
+        Return retry statistics.
+
+        Returns:
+            Retries performed and time spent backing off so far.
+        """
+        return self._retry_counters.snapshot()
 
     def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
-        url = f"{self.base_url}{path}"
+        if method != "GET":
+            return self._write(method, path, **kwargs)
 
-        response = self.session.request(method, url, **kwargs)
+        if self.cache is None and self.single_flight is None:
+            return self._send(method, path, **kwargs)
 
-        if response.status_code >= 400:
-            error_message = "Unknown error"
-            error_response = None
+        key = request_key(method, path, kwargs.get("params"))
+        if self.cache is not None:
+            cached = self.cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+
+        if self.single_flight is not None:
+            return self.single_flight.do(
+                key, partial(self._read, key, method, path, **kwargs)
+            )
+        return self._read(key, method, path, **kwargs)
+
+    def _read(self, key: Hashable, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        if self.cache is None:
+            return self._send(method, path, **kwargs)
+
+        generation = self.cache.generation
+        result = self._send(method, path, **kwargs)
+        instance_name = instance_name_from_request(path, kwargs.get("params"))
+        self.cache.set(key, result, path, instance_name, generation=generation)
+        return result
+
+    def _write(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        if self.cache is None:
+            return self._send(method, path, **kwargs)
+
+        try:
+            return self._send(method, path, **kwargs)
+        finally:
+            self.cache.invalidate(
+                instance_name_from_request(
+                    path, kwargs.get("params"), kwargs.get("json")
+                )
+            )
+
+    def _send(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        if self.pool_config.timeout is not None:
+            kwargs.setdefault("timeout", self.pool_config.timeout)
+
+        if self.instruments:
+            return self._send_instrumented(method, path, **kwargs)
+        return self._decode(self._attempt(method, path, None, **kwargs))
+
+    def _decode(self, response: requests.Response) -> Dict[str, Any]:
+        return _handle_response(response, self.codec, self.lazy_responses)
+
+    def _send_instrumented(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        metrics = RequestMetrics(method=method, path_template=path_template(path))
+        for instrument in self.instruments:
+            instrument.on_request_start(metrics)
 
+        reset_connection_info()
+        started = time.perf_counter()
+        try:
+            response = self._attempt(method, path, metrics, **kwargs)
+            connect = connection_info().connect or 0.0
+            metrics.status_code = response.status_code
+            metrics.ttfb = response.elapsed.total_seconds() - connect
+            metrics.request_bytes = _body_size(response.request.body)
+            metrics.response_bytes = len(response.content)
+            return self._decode(response)
+        except Exception as exc:
+            metrics.error = exc
+            raise
+        finally:
+            metrics.total = time.perf_counter() - started
+            info = connection_info()
+            metrics.connection_reused = info.reused
+            metrics.connect = info.connect
+            for instrument in self.instruments:
+                instrument.on_request_end(metrics)
+
+    def _attempt(
+        self, method: str, path: str, metrics: Optional[RequestMetrics], **kwargs
+    ) -> requests.Response:
+        # A one-shot body, such as an upload of unknown size, cannot be sent
+        # again: a retry would send whatever is left of it.
+        if self.retry_policy is None or isinstance(kwargs.get("data"), Iterator):
+            return self._transmit(method, path, **kwargs)
+        return self._send_with_retries(method, path, metrics, **kwargs)
+
+    def _send_with_retries(
+        self, method: str, path: str, metrics: Optional[RequestMetrics], **kwargs
+    ) -> requests.Response:
+        policy = self.retry_policy
+        started = time.monotonic()
+        attempt = 1
+        backoff_seconds = 0.0
+        while True:
+            if metrics is not None:
+                metrics.retries = attempt - 1
+
+            response = error = None
             try:
-                error_data = response.json()
-                error_message = error_data.get("error", "Unknown error")
-                error_response = error_data
-            except Exception:
-                error_message = "Failed to parse error response"
-                error_response = None
-
-            raise EvolutionAPIError(
-                status_code=response.status_code,
-                error_message=error_message,
-                response=error_response,
+                response = self._transmit(method, path, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error = exc
+
+            if response is not None and response.status_code not in (
+                policy.retry_statuses
+            ):
+                self._retry_counters.record(attempt - 1, backoff_seconds, False)
+                return response
+
+            delay = policy.next_delay(
+                method,
+                path,
+                attempt,
+                time.monotonic() - started,
+                response.headers.get("Retry-After") if response is not None else None,
             )
+            if delay is None:
+                self._retry_counters.record(attempt - 1, backoff_seconds, attempt > 1)
+                if error is not None:
+                    raise error
+                return response
+
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            backoff_seconds += delay
+            attempt += 1
+
+    def _transmit(self, method: str, path: str, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(
+                path,
+                instance_name_from_request(
+                    path, kwargs.get("params"), kwargs.get("json")
+                ),
+                scope=self._rate_limit_scope,
+            )
+
+        if self.instruments:
+            reset_connection_info()
+        return self._exchange(method, path, **kwargs)
+
+    def _exchange(self, method: str, path: str, **kwargs):
+        return self._call(self.base_url, self.transport, method, path, **kwargs)
+
+    def _call(
+        self,
+        base_url: str,
+        transport: Transport,
+        method: str,
+        path: str,
+        **kwargs,
+    ):
+        url = f"{base_url}{path}"
+        if self.codec is not None and kwargs.get("json") is not None:
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+
+        if self.circuit_breaker is None:
+            return transport.request(method, url, **kwargs)
+
+        key = self.circuit_breaker.key_for(base_url, path)
+        self.circuit_breaker.before_call(key)
+        try:
+            response = transport.request(method, url, **kwargs)
+        except requests.RequestException:
+            self.circuit_breaker.record_failure(key)
+            raise
+        except BaseException:
+            self.circuit_breaker.release(key)
+            raise
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure(key)
+        else:
+            self.circuit_breaker.record_success(key)
+        return response
+
+    def _stream_json_array(
+        self, path: str, chunk_size: int = 65536, **kwargs
+    ) -> Iterator[Any]:
+        """
+        Send a GET request and yield the items of its JSON array body.
+
+        The body is parsed as it is received instead of being loaded whole.
+        Streamed requests bypass the cache, coalescing and retries, since the
+        response cannot be replayed once items were yielded.
+        """
+        if self.pool_config.timeout is not None:
+            kwargs.setdefault("timeout", self.pool_config.timeout)
+
+        response = self._transmit("GET", path, stream=True, **kwargs)
+        with response:
+            if response.status_code >= 400:
+                _handle_response(response)
+            yield from iter_json_array(response.iter_content(chunk_size))
+
+    def batch(self, max_concurrency: int = 10, raise_errors: bool = True) -> "Batch":
+        """
+        Record calls and run them concurrently, chaining dependent ones.
+
+        Use as ``with client.batch() as b:``; calls made through ``b`` (e.g.
+        ``b.instances.create(...)``) return futures that later calls can
+        take as arguments. See `Batch`.
+
+        Args:
+            max_concurrency: Maximum number of calls running at once
+            raise_errors: Raise `BatchError` on exit if any call failed
+
+        Returns:
+            The batch.
+        """
+        from evolutionapi.batch import Batch
+
+        return Batch(self, max_concurrency, raise_errors)
+
+    def upload(
+        self,
+        path: str,
+        file: Union[MediaSource, Iterable[bytes]],
+        field: Optional[str] = "file",
+        fields: Optional[Dict[str, Any]] = None,
+        file_name: Optional[str] = None,
+        content_type: Optional[str] = None,
+        method: str = "POST",
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Upload a file without loading it in memory.
+
+        The file is sent as a ``multipart/form-data`` body, or as the raw
+        request body when ``field`` is None, and is read chunk by chunk while
+        the request is sent. Memory-mapped buffers are sent without copying.
+
+        Args:
+            path: API path, e.g. ``/message/sendMedia/my-instance``
+            file: Path, binary file object, bytes-like buffer (e.g. ``mmap``)
+                or iterable of bytes. Iterables are sent with chunked
+                transfer encoding and cannot be retried
+            field: Form field of the file. None sends the raw file
+            fields: Other form fields
+            file_name: File name sent with the file. Defaults to its name
+            content_type: Content type of the file. Guessed from its name
+                when None
+            method: HTTP method
+            **kwargs: Other arguments passed to requests, e.g. ``params``
+
+        Returns:
+            The decoded JSON response.
+
+        Raises:
+            EvolutionAPIError: If the API returns an error
+        """
+        body = upload_body(file, field, fields, file_name, content_type)
+        headers = {**kwargs.pop("headers", {}), "Content-Type": body.content_type}
+        data = body if body.size is not None else iter(body)
+        return self._request(method, path, data=data, headers=headers, **kwargs)
+
+    def download(
+        self,
+        path: str,
+        destination: Union[str, os.PathLike, BinaryIO],
+        method: str = "GET",
+        chunk_size: int = 65536,
+        **kwargs,
+    ) -> int:
+        """
+        Download a response body straight to disk.
+
+        The body is written chunk by chunk as it is received. A path is only
+        replaced once the download completed (see `Destination`). Downloads
+        bypass the cache, coalescing and retries.
+
+        Args:
+            path: API path
+            destination: File path or writable binary file object
+            method: HTTP method
+            chunk_size: Bytes read from the connection at a time
+            **kwargs: Other arguments passed to requests, e.g. ``json``
+
+        Returns:
+            The number of bytes written.
+
+        Raises:
+            EvolutionAPIError: If the API returns an error
+        """
+        if self.pool_config.timeout is not None:
+            kwargs.setdefault("timeout", self.pool_config.timeout)
 
-        return response.json()
+        response = self._transmit(method, path, stream=True, **kwargs)
+        with response:
+            if response.status_code >= 400:
+                _handle_response(response)
+            with Destination(destination) as target:
+                for chunk in response.iter_content(chunk_size):
+                    target.write(chunk)
+        return target.written
 
     def _get(self, path: str, **kwargs) -> Dict[str, Any]:
         return self._request("GET", path, **kwargs)
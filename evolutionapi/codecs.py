@@ -0,0 +1,165 @@
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+class Codec(ABC):
+    """Serializer used for request bodies and responses."""
+
+    name: str = ""
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """Encode an object to JSON bytes."""
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """Decode JSON bytes."""
+
+
+class JSONCodec(Codec):
+    """Codec based on the standard library `json` module."""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    """Codec based on `orjson`, several times faster than `json`."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        """
+        Initialize the codec.
+
+        Raises:
+            ImportError: If orjson is not installed
+        """
+        if orjson is None:
+            raise ImportError(
+                "OrjsonCodec requires orjson. Install it with "
+                "`pip install python_evolution_api[fast]`."
+            )
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+def default_codec() -> Codec:
+    """Return the fastest codec available in this environment."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
+
+
+class LazyResponse:
+    """
+    Response body decoded on first access.
+
+    Behaves like the decoded dict or list for item access, iteration,
+    ``len``, ``in``, ``get`` and equality. Responses that are never read, such
+    as the result of most writes, are never decoded.
+
+    Creating a `LazyResponse` returns a `LazyObject` (a read-only `Mapping`,
+    with ``keys``, ``items`` and ``values``) for JSON object bodies and a
+    `LazyArray` (a `Sequence`) for arrays, told apart from the first byte of
+    the body without decoding it. They are not `dict` or `list` instances;
+    use ``value`` where one is required.
+    """
+
+    __slots__ = ("_data", "_codec", "_value")
+
+    def __new__(cls, data: bytes = b"", codec: Optional[Codec] = None):
+        if cls is LazyResponse:
+            start = data.lstrip()[:1]
+            if start == b"{":
+                cls = LazyObject
+            elif start == b"[":
+                cls = LazyArray
+        return super().__new__(cls)
+
+    def __init__(self, data: bytes, codec: Codec) -> None:
+        """
+        Initialize the response.
+
+        Args:
+            data: Raw JSON body
+            codec: Codec used to decode it
+        """
+        self._data = data
+        self._codec = codec
+        self._value: Any = _UNDECODED
+
+    @property
+    def raw(self) -> bytes:
+        """The undecoded body."""
+        return self._data
+
+    @property
+    def decoded(self) -> bool:
+        """Whether the body was decoded already."""
+        return self._value is not _UNDECODED
+
+    @property
+    def value(self) -> Any:
+        """The decoded body."""
+        if self._value is _UNDECODED:
+            self._value = self._codec.loads(self._data)
+        return self._value
+
+    def get(self, key: Any, default: Optional[Any] = None) -> Any:
+        return self.value.get(key, default)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.value[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.value
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyResponse):
+            other = other.value
+        return self.value == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        if self.decoded:
+            return f"LazyResponse({self._value!r})"
+        return f"LazyResponse(<{len(self._data)} bytes>)"
+
+
+class LazyObject(LazyResponse, Mapping):
+    """`LazyResponse` of a JSON object, with the read API of a dict."""
+
+    __slots__ = ()
+
+
+class LazyArray(LazyResponse, Sequence):
+    """`LazyResponse` of a JSON array, with the read API of a list."""
+
+    __slots__ = ()
+
+
+_UNDECODED = object()
@@ -23,3 +23,58 @@ class EvolutionAPIError(Exception):
         self.response = response
 
         super().__init__(f"HTTP {status_code}: {error_message}")
+
+    def __reduce__(self):
+        # Keeps errors picklable, e.g. across `ProcessPool` workers.
+        return self.__class__, (self.status_code, self.error_message, self.response)
+
+
+class RateLimitError(EvolutionAPIError):
+    """Error raised when the client-side rate limit is exceeded."""
+
+    def __init__(self, retry_after: float, key: str) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            retry_after: Seconds until the request would be allowed
+            key: The rate limit bucket that was exhausted
+        """
+        self.retry_after = retry_after
+        self.key = key
+
+        super().__init__(
+            status_code=429,
+            error_message=f"Client rate limit exceeded for {key}, "
+            f"retry in {retry_after:.3f}s",
+        )
+
+    def __reduce__(self):
+        return self.__class__, (self.retry_after, self.key)
+
+
+class CircuitOpenError(EvolutionAPIError):
+    """Error raised without calling the server while its circuit is open."""
+
+    def __init__(self, key: str, retry_after: float) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            key: The circuit that is open
+            retry_after: Seconds until trial calls are allowed again
+        """
+        self.key = key
+        self.retry_after = retry_after
+
+        super().__init__(
+            status_code=503,
+            error_message=f"Circuit open for {key}, retry in {retry_after:.3f}s",
+        )
+
+    def __reduce__(self):
+        return self.__class__, (self.key, self.retry_after)
+
+
+class WebhookPayloadError(ValueError):
+    """Error raised when a webhook request body is not a valid event."""
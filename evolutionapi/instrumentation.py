@@ -0,0 +1,258 @@
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Latency bucket upper bounds in seconds: 1ms to ~65s, 4 buckets per doubling,
+# so a percentile read from a bucket is at most ~19% above the true value.
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(0.001 * 2 ** (i / 4) for i in range(65))
+
+
+@dataclass
+class RequestMetrics:
+    """
+    Measurements of one client request, including its retries.
+
+    Attributes:
+        method: HTTP method
+        path_template: Path with the instance name replaced by ``{instance}``
+        status_code: Status code of the final response, None on transport errors
+        error: Exception raised to the caller, if any
+        dns: Seconds spent resolving the host name. The requests transport
+            cannot separate it from ``connect``, so it is None there
+        connect: Seconds spent opening a new connection (DNS, TCP and TLS), or
+            None when a pooled connection was reused
+        ttfb: Seconds from sending the request until the response headers
+            were received
+        total: Seconds spent in the client, including retries and decoding
+        request_bytes: Size of the request body
+        response_bytes: Size of the response body
+        retries: Attempts made after the first one
+        connection_reused: Whether the final attempt used a pooled connection
+        started_at: Wall clock time when the request started
+    """
+
+    method: str
+    path_template: str
+    status_code: Optional[int] = None
+    error: Optional[BaseException] = None
+    dns: Optional[float] = None
+    connect: Optional[float] = None
+    ttfb: Optional[float] = None
+    total: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    connection_reused: Optional[bool] = None
+    started_at: float = field(default_factory=time.time)
+
+
+class Instrument:
+    """
+    Base class for request instrumentation.
+
+    Subclasses override the hooks they need. Hooks run on the thread making
+    the request, so they should be fast.
+    """
+
+    def on_request_start(self, metrics: RequestMetrics) -> None:
+        """Called before a request is sent."""
+
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        """Called once a request finished, successfully or not."""
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                if index < len(LATENCY_BUCKETS):
+                    return LATENCY_BUCKETS[index]
+                return float("inf")
+        return float("inf")
+
+
+@dataclass(frozen=True)
+class EndpointSummary:
+    """
+    Latency summary of one endpoint.
+
+    Attributes:
+        method: HTTP method
+        path_template: Path template of the endpoint
+        count: Requests observed
+        errors: Requests that raised an error
+        p50: Median latency in seconds
+        p95: 95th percentile latency in seconds
+        p99: 99th percentile latency in seconds
+        mean: Mean latency in seconds
+    """
+
+    method: str
+    path_template: str
+    count: int
+    errors: int
+    p50: float
+    p95: float
+    p99: float
+    mean: float
+
+
+class HistogramAggregator(Instrument):
+    """In-process latency histograms and status counters per endpoint."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], _Histogram] = {}
+        self._statuses: Dict[Tuple[str, str, str], int] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        endpoint = (metrics.method, metrics.path_template)
+        status = str(metrics.status_code) if metrics.status_code else "error"
+        with self._lock:
+            histogram = self._histograms.get(endpoint)
+            if histogram is None:
+                histogram = self._histograms[endpoint] = _Histogram()
+            histogram.observe(metrics.total)
+            key = (*endpoint, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+            if metrics.error is not None:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+
+    def summary(self) -> List[EndpointSummary]:
+        """Return p50/p95/p99 latencies per endpoint."""
+        with self._lock:
+            return [
+                EndpointSummary(
+                    method=method,
+                    path_template=path_template,
+                    count=histogram.count,
+                    errors=self._errors.get((method, path_template), 0),
+                    p50=histogram.percentile(50),
+                    p95=histogram.percentile(95),
+                    p99=histogram.percentile(99),
+                    mean=histogram.sum / histogram.count,
+                )
+                for (method, path_template), histogram in sorted(
+                    self._histograms.items()
+                )
+            ]
+
+    def to_prometheus(self, prefix: str = "evolutionapi") -> str:
+        """
+        Render the collected metrics in the Prometheus text format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            The exposition text, ready to be served on a ``/metrics`` endpoint.
+        """
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds Request latency.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (method, path), histogram in sorted(self._histograms.items()):
+                labels = f'method="{method}",path="{_escape(path)}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f"{prefix}_request_duration_seconds_bucket"
+                        f'{{{labels},le="{bound:.6g}"}} {cumulative}'
+                    )
+                lines.append(
+                    f"{prefix}_request_duration_seconds_bucket"
+                    f'{{{labels},le="+Inf"}} {histogram.count}'
+                )
+                lines.append(
+                    f"{prefix}_request_duration_seconds_sum{{{labels}}} {histogram.sum}"
+                )
+                lines.append(
+                    f"{prefix}_request_duration_seconds_count{{{labels}}} "
+                    f"{histogram.count}"
+                )
+
+            lines.append(f"# HELP {prefix}_requests_total Requests by status.")
+            lines.append(f"# TYPE {prefix}_requests_total counter")
+            for (method, path, status), count in sorted(self._statuses.items()):
+                lines.append(
+                    f"{prefix}_requests_total"
+                    f'{{method="{method}",path="{_escape(path)}",status="{status}"}} '
+                    f"{count}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryInstrument(Instrument):
+    """
+    Emit an OpenTelemetry span per request.
+
+    Works with any tracer exposing ``start_span(name, start_time=...)`` and
+    spans with ``set_attribute``/``end(end_time=...)``. When no tracer is
+    given, ``opentelemetry-api`` is imported on first use.
+    """
+
+    def __init__(self, tracer: Optional[Any] = None) -> None:
+        """
+        Initialize the instrument.
+
+        Args:
+            tracer: OpenTelemetry tracer. Defaults to the global tracer
+        """
+        self._tracer = tracer
+
+    @property
+    def tracer(self) -> Any:
+        if self._tracer is None:
+            from opentelemetry import trace
+
+            self._tracer = trace.get_tracer("evolutionapi")
+        return self._tracer
+
+    def on_request_end(self, metrics: RequestMetrics) -> None:
+        start_ns = int(metrics.started_at * 1e9)
+        span = self.tracer.start_span(
+            f"{metrics.method} {metrics.path_template}", start_time=start_ns
+        )
+        attributes = {
+            "http.request.method": metrics.method,
+            "url.template": metrics.path_template,
+            "http.response.status_code": metrics.status_code,
+            "http.request.body.size": metrics.request_bytes,
+            "http.response.body.size": metrics.response_bytes,
+            "http.request.resend_count": metrics.retries,
+            "evolutionapi.connection.reused": metrics.connection_reused,
+            "evolutionapi.connect.duration": metrics.connect,
+            "evolutionapi.ttfb.duration": metrics.ttfb,
+        }
+        for key, value in attributes.items():
+            if value is not None:
+                span.set_attribute(key, value)
+        if metrics.error is not None:
+            span.set_attribute("error.type", type(metrics.error).__name__)
+        span.end(end_time=start_ns + int(metrics.total * 1e9))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
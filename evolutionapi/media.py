@@ -0,0 +1,414 @@
+import base64
+import io
+import json
+import mimetypes
+import mmap
+import os
+import uuid
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+MediaSource = Union[bytes, bytearray, memoryview, mmap.mmap, os.PathLike, BinaryIO]
+
+# Multipart file: a source, or a (file name, source[, content type]) tuple
+MultipartFile = Union[
+    MediaSource, Tuple[str, MediaSource], Tuple[str, MediaSource, str]
+]
+
+# Marks where the encoded file goes in the serialized payload
+MEDIA_PLACEHOLDER = "\x00evolutionapi-media\x00"
+
+_CHUNK_SIZE = 3 * 64 * 1024  # a multiple of 3, so chunks encode independently
+
+_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+def is_streamable(media: Any) -> bool:
+    """
+    Whether ``media`` is a local file or buffer rather than a URL or base64 string.
+
+    Paths must be `os.PathLike` (e.g. `pathlib.Path`): plain strings are sent
+    unchanged, since Evolution API accepts URLs and base64 strings there.
+    """
+    return isinstance(media, _BUFFER_TYPES + (os.PathLike,)) or hasattr(media, "read")
+
+
+class StreamingBody(ABC):
+    """
+    Base class of request bodies produced chunk by chunk.
+
+    Bodies of known ``size`` are sent with a ``Content-Length`` header and
+    can be iterated again when a request is retried. Bodies of unknown size
+    are sent with chunked transfer encoding, and only once.
+    """
+
+    size: Optional[int] = None
+    content_type = "application/octet-stream"
+
+    def __len__(self) -> int:
+        if self.size is None:
+            raise TypeError("body length is unknown")
+        return self.size
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        """Yield the body chunk by chunk."""
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        # httpx only accepts bytes; sources are read in the event loop.
+        for chunk in self:
+            yield bytes(chunk)
+
+
+class Base64JSONBody(StreamingBody):
+    """
+    JSON request body embedding a file as a base64 string.
+
+    The file is read and encoded chunk by chunk while the request is sent, so
+    neither the file nor its base64 form is ever held in memory whole. The
+    body length is known in advance and sent as ``Content-Length``, and the
+    body can be iterated again when a request is retried.
+    """
+
+    content_type = "application/json"
+
+    def __init__(
+        self,
+        payload: Dict[str, Any],
+        source: MediaSource,
+        chunk_size: int = _CHUNK_SIZE,
+    ) -> None:
+        """
+        Initialize the body.
+
+        Args:
+            payload: The JSON payload, with `MEDIA_PLACEHOLDER` as the value
+                to replace with the encoded file
+            source: Path, binary file object or bytes-like buffer. File
+                objects must be seekable; they are read from their current
+                position and are not closed
+            chunk_size: Bytes read per chunk, rounded down to a multiple of 3
+
+        Raises:
+            ValueError: If the placeholder is missing from the payload
+        """
+        serialized = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        placeholder = json.dumps(MEDIA_PLACEHOLDER)[1:-1]
+        if serialized.count(placeholder) != 1:
+            raise ValueError("payload must contain MEDIA_PLACEHOLDER exactly once")
+        prefix, suffix = serialized.split(placeholder)
+        self.prefix = prefix.encode()
+        self.suffix = suffix.encode()
+        self.source = source
+        self.chunk_size = max(3, chunk_size - chunk_size % 3)
+        self._start = _position(source)
+        length = _source_size(source) - self._start
+        self.size = len(self.prefix) + 4 * -(-length // 3) + len(self.suffix)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self.prefix
+        for chunk in iter_chunks(self.source, self.chunk_size, self._start):
+            yield base64.b64encode(chunk)
+        yield self.suffix
+
+
+class FileBody(StreamingBody):
+    """
+    Raw request body streamed from a file, buffer or iterable of chunks.
+
+    Buffers, including ``mmap`` objects, are sent in slices without being
+    copied. Iterables of bytes have no known size and are sent with chunked
+    transfer encoding.
+    """
+
+    def __init__(
+        self,
+        source: Union[MediaSource, Iterable[bytes]],
+        content_type: Optional[str] = None,
+        chunk_size: int = _CHUNK_SIZE,
+    ) -> None:
+        """
+        Initialize the body.
+
+        Args:
+            source: Path, binary file object, bytes-like buffer or iterable
+                of bytes. File objects are read from their current position
+                and are not closed
+            content_type: Content type of the body. Guessed from the file
+                name when None
+            chunk_size: Bytes read per chunk
+        """
+        self.source = source
+        self.content_type = content_type or guess_content_type(source)
+        self.chunk_size = chunk_size
+        self._start = _position(source)
+        if is_streamable(source):
+            self.size = _source_size(source) - self._start
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        return iter_chunks(self.source, self.chunk_size, self._start)
+
+
+class MultipartBody(StreamingBody):
+    """
+    ``multipart/form-data`` request body streaming its files.
+
+    Only the part headers are built in memory; file contents are read chunk
+    by chunk while the request is sent.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[Mapping[str, Any]] = None,
+        files: Optional[Mapping[str, MultipartFile]] = None,
+        boundary: Optional[str] = None,
+        chunk_size: int = _CHUNK_SIZE,
+    ) -> None:
+        """
+        Initialize the body.
+
+        Args:
+            fields: Form fields. Values are converted with ``str``
+            files: Files by field name, given like in requests: a source, or
+                a ``(file_name, source)`` or ``(file_name, source,
+                content_type)`` tuple. File objects must be seekable
+            boundary: Part boundary. Random when None
+            chunk_size: Bytes read per chunk
+
+        Raises:
+            TypeError: If a file is not a path, file object or buffer
+        """
+        self.boundary = boundary or uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+        self._parts: List[Tuple[bytes, Optional[MediaSource], int]] = []
+        for name, value in (fields or {}).items():
+            header = self._header(name)
+            self._parts.append((header + str(value).encode() + b"\r\n", None, 0))
+        for name, file in (files or {}).items():
+            file_name, source, content_type = _file_tuple(file)
+            if not is_streamable(source):
+                raise TypeError(f"File {name!r} must be a path, file object or buffer")
+            header = self._header(name, file_name, content_type)
+            self._parts.append((header, source, _position(source)))
+        self._closing = f"--{self.boundary}--\r\n".encode()
+        self.size = len(self._closing) + sum(
+            len(header)
+            + (_source_size(source) - start + 2 if source is not None else 0)
+            for header, source, start in self._parts
+        )
+
+    def _header(
+        self,
+        name: str,
+        file_name: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> bytes:
+        disposition = f'form-data; name="{_quote(name)}"'
+        if file_name is not None:
+            disposition += f'; filename="{_quote(file_name)}"'
+        lines = [f"--{self.boundary}", f"Content-Disposition: {disposition}"]
+        if content_type is not None:
+            lines.append(f"Content-Type: {content_type}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        for header, source, start in self._parts:
+            yield header
+            if source is not None:
+                yield from iter_chunks(source, self.chunk_size, start)
+                yield b"\r\n"
+        yield self._closing
+
+
+class Destination:
+    """
+    Download target written chunk by chunk.
+
+    A path is written to a ``.part`` file next to it, renamed over the path
+    once the download completes and removed if it fails, so an interrupted
+    download never leaves a truncated file behind. A file object is written
+    at its current position and is not closed.
+
+    Use as a context manager::
+
+        with Destination(path) as target:
+            for chunk in chunks:
+                target.write(chunk)
+    """
+
+    def __init__(self, destination: Union[os.PathLike, str, BinaryIO]) -> None:
+        """
+        Initialize the target.
+
+        Args:
+            destination: File path or writable binary file object
+        """
+        self.destination = destination
+        self.written = 0
+        self._file: Optional[BinaryIO] = None
+        self._partial: Optional[str] = None
+
+    def __enter__(self) -> "Destination":
+        if hasattr(self.destination, "write"):
+            self._file = self.destination
+        else:
+            self._partial = os.fspath(self.destination) + ".part"
+            self._file = open(self._partial, "wb")
+        return self
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk to the target."""
+        self._file.write(chunk)
+        self.written += len(chunk)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._partial is None:
+            return
+        self._file.close()
+        if exc_type is None:
+            os.replace(self._partial, self.destination)
+        else:
+            os.remove(self._partial)
+
+
+def upload_body(
+    file: Union[MediaSource, Iterable[bytes]],
+    field: Optional[str] = "file",
+    fields: Optional[Mapping[str, Any]] = None,
+    file_name: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> StreamingBody:
+    """
+    Build the streaming body of an upload.
+
+    Args:
+        file: Path, binary file object, bytes-like buffer (e.g. ``mmap``) or
+            iterable of bytes
+        field: Form field of the file in a ``multipart/form-data`` body. None
+            sends the file as the raw request body
+        fields: Other form fields of the multipart body
+        file_name: File name sent in the multipart body. Defaults to the
+            name of the file
+        content_type: Content type of the file. Guessed from its name when
+            None
+
+    Returns:
+        A `MultipartBody`, or a `FileBody` when ``field`` is None.
+
+    Raises:
+        ValueError: If form fields are given without a file field
+    """
+    if field is None:
+        if fields:
+            raise ValueError("form fields require a multipart body (field)")
+        return FileBody(file, content_type or guess_content_type(file_name or file))
+    file_name = file_name or os.path.basename(_file_name(file) or "") or field
+    content_type = content_type or guess_content_type(file_name)
+    return MultipartBody(fields, {field: (file_name, file, content_type)})
+
+
+def iter_chunks(
+    source: Union[MediaSource, Iterable[bytes]],
+    chunk_size: int = _CHUNK_SIZE,
+    start: int = 0,
+) -> Iterator[Union[bytes, memoryview]]:
+    """
+    Read a media source in chunks.
+
+    Args:
+        source: Path, binary file object, bytes-like buffer or iterable of
+            bytes
+        chunk_size: Maximum size of a chunk. Iterables keep their own chunks
+        start: Offset to read from. File objects are seeked to it
+
+    Yields:
+        The content of the source. Buffers are sliced without copying.
+    """
+    if isinstance(source, _BUFFER_TYPES):
+        view = memoryview(source).cast("B")
+        for offset in range(start, len(view), chunk_size):
+            yield view[offset : offset + chunk_size]
+        return
+
+    if not is_streamable(source):
+        yield from source
+        return
+
+    close = isinstance(source, os.PathLike)
+    stream = open(source, "rb") if close else source
+    stream.seek(start)
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        if close:
+            stream.close()
+
+
+def guess_content_type(source: Any, default: str = "application/octet-stream") -> str:
+    """
+    Guess the content type of a media source from its file name.
+
+    Args:
+        source: Path or file object opened from a path
+        default: Type returned when the name gives no hint
+
+    Returns:
+        The content type.
+    """
+    name = _file_name(source)
+    return (mimetypes.guess_type(name)[0] if name else None) or default
+
+
+def _file_tuple(file: MultipartFile) -> Tuple[Optional[str], MediaSource, str]:
+    if isinstance(file, tuple):
+        file_name, source = file[:2]
+        content_type = file[2] if len(file) > 2 else guess_content_type(file_name)
+        return file_name, source, content_type
+    name = _file_name(file)
+    return name and os.path.basename(name), file, guess_content_type(file)
+
+
+def _file_name(source: Any) -> Optional[str]:
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    name = getattr(source, "name", None)
+    return name if isinstance(name, str) else None
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', "%22").replace("\r\n", "%0D%0A")
+
+
+def _position(source: Any) -> int:
+    return source.tell() if hasattr(source, "read") and hasattr(source, "tell") else 0
+
+
+def _source_size(source: MediaSource) -> int:
+    if isinstance(source, os.PathLike):
+        return os.path.getsize(source)
+    if isinstance(source, _BUFFER_TYPES):
+        return memoryview(source).nbytes
+    try:
+        return os.fstat(source.fileno()).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        position = source.tell()
+        size = source.seek(0, os.SEEK_END)
+        source.seek(position)
+        return size
@@ -0,0 +1,258 @@
+import hashlib
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import requests
+
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.pool import PoolStats
+from evolutionapi.transports import Transport
+from evolutionapi.utils import instance_name_from_request
+
+
+class BalancingStrategy(str, Enum):
+    """How requests are spread across nodes."""
+
+    ROUND_ROBIN = "round_robin"
+    LEAST_OUTSTANDING = "least_outstanding"
+    STICKY = "sticky"
+
+
+@dataclass(frozen=True)
+class NodeStats:
+    """
+    Snapshot of a node's state.
+
+    Attributes:
+        base_url: Base URL of the node
+        healthy: Whether the node currently receives traffic
+        outstanding: Requests in flight
+        consecutive_failures: Failures since the last success
+        pool: Connection pool statistics of the node
+    """
+
+    base_url: str
+    healthy: bool
+    outstanding: int
+    consecutive_failures: int
+    pool: PoolStats
+
+
+class Node:
+    """An Evolution API server with its own connection pool."""
+
+    def __init__(self, base_url: str, transport: Transport) -> None:
+        """
+        Initialize the node.
+
+        Args:
+            base_url: Base URL of the server
+            transport: Transport used to reach it
+        """
+        self.base_url = base_url
+        self.transport = transport
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.probing = False
+
+
+class MultiNodeEvolutionAPI(EvolutionAPI):
+    """
+    Client that spreads requests across several Evolution API servers.
+
+    Nodes that fail ``eject_after`` times in a row (5xx responses or
+    connection errors) stop receiving traffic for ``eject_for`` seconds. After
+    that, a single probe request is let through: a success puts the node back
+    in rotation, a failure ejects it again. Sticky requests are never used as
+    probes, since they must reach their instance's node; use `probe_ejected`
+    to check nodes actively. If every node is ejected, requests are spread
+    over all of them rather than failing outright.
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        api_key: str,
+        strategy: BalancingStrategy = BalancingStrategy.ROUND_ROBIN,
+        owners: Optional[Dict[str, str]] = None,
+        eject_after: int = 3,
+        eject_for: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize the multi-node client.
+
+        Args:
+            base_urls: Base URLs of the Evolution API servers
+            api_key: API key for authentication, shared by every server
+            strategy: Balancing strategy. With ``STICKY``, requests for an
+                instance always go to the same node, chosen by rendezvous
+                hashing so that ejecting a node only moves its own instances
+            owners: Explicit instance name to base URL assignments, used by the
+                sticky strategy before hashing
+            eject_after: Consecutive failures that eject a node
+            eject_for: Seconds an ejected node is kept out of rotation
+            clock: Monotonic clock, mainly useful for testing
+            **kwargs: Other `EvolutionAPI` options (pool_config, cache, ...).
+                A ``transport`` given here is shared by every node
+        """
+        if not base_urls:
+            raise ValueError("At least one base URL is required")
+
+        super().__init__(base_urls[0], api_key, **kwargs)
+        self.strategy = BalancingStrategy(strategy)
+        self.owners = {name: url.rstrip("/") for name, url in (owners or {}).items()}
+        self.eject_after = eject_after
+        self.eject_for = eject_for
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+        shared = kwargs.get("transport") is not None
+        self.nodes: List[Node] = [Node(self.base_url, self.transport)]
+        for base_url in base_urls[1:]:
+            transport = (
+                self.transport
+                if shared
+                else self._add_headers(self._default_transport())
+            )
+            self.nodes.append(Node(base_url.rstrip("/"), transport))
+        self._nodes_by_url = {node.base_url: node for node in self.nodes}
+
+    @property
+    def base_urls(self) -> List[str]:
+        """Base URLs of every node."""
+        return [node.base_url for node in self.nodes]
+
+    def pool_stats(self) -> PoolStats:
+        """Return connection pool statistics summed over every transport."""
+        transports = {id(node.transport): node.transport for node in self.nodes}
+        totals = [transport.stats() for transport in transports.values()]
+        return PoolStats(
+            created=sum(stats.created for stats in totals),
+            reused=sum(stats.reused for stats in totals),
+            discarded=sum(stats.discarded for stats in totals),
+        )
+
+    def node_stats(self) -> List[NodeStats]:
+        """Return the state of every node."""
+        with self._lock:
+            return [
+                NodeStats(
+                    base_url=node.base_url,
+                    healthy=not node.ejected_until,
+                    outstanding=node.outstanding,
+                    consecutive_failures=node.consecutive_failures,
+                    pool=node.transport.stats(),
+                )
+                for node in self.nodes
+            ]
+
+    def probe_ejected(self, path: str = "/") -> List[str]:
+        """
+        Actively probe ejected nodes and restore the ones that respond.
+
+        Args:
+            path: Path requested on each node, the API root by default
+
+        Returns:
+            Base URLs of the nodes put back in rotation.
+        """
+        with self._lock:
+            ejected = [node for node in self.nodes if node.ejected_until]
+
+        restored = []
+        for node in ejected:
+            try:
+                response = node.transport.request("GET", f"{node.base_url}{path}")
+                healthy = response.status_code < 500
+            except requests.RequestException:
+                healthy = False
+            self._record(node, success=healthy)
+            if healthy:
+                restored.append(node.base_url)
+        return restored
+
+    def node_for(self, instance_name: Optional[str]) -> Node:
+        """
+        Pick the node for a request.
+
+        Args:
+            instance_name: Instance targeted by the request, if any
+
+        Returns:
+            The selected node.
+        """
+        now = self._clock()
+        sticky = self.strategy is BalancingStrategy.STICKY and bool(instance_name)
+        with self._lock:
+            if not sticky:
+                for node in self.nodes:
+                    if node.ejected_until and node.ejected_until <= now:
+                        if not node.probing:
+                            node.probing = True
+                            return node
+
+            candidates = [node for node in self.nodes if not node.ejected_until]
+            if not candidates:
+                candidates = self.nodes
+
+            if sticky:
+                owner = self._nodes_by_url.get(self.owners.get(instance_name, ""))
+                if owner is not None and owner in candidates:
+                    return owner
+                return max(
+                    candidates,
+                    key=lambda node: _rendezvous_score(instance_name, node.base_url),
+                )
+
+            offset = next(self._counter) % len(candidates)
+            rotated = candidates[offset:] + candidates[:offset]
+            if self.strategy is BalancingStrategy.LEAST_OUTSTANDING:
+                return min(rotated, key=lambda node: node.outstanding)
+            return rotated[0]
+
+    def _exchange(self, method: str, path: str, **kwargs):
+        instance_name = instance_name_from_request(
+            path, kwargs.get("params"), kwargs.get("json")
+        )
+        node = self.node_for(instance_name)
+        with self._lock:
+            node.outstanding += 1
+
+        try:
+            response = self._call(node.base_url, node.transport, method, path, **kwargs)
+        except requests.RequestException:
+            self._record(node, success=False)
+            raise
+        else:
+            self._record(node, success=response.status_code < 500)
+            return response
+        finally:
+            # Other errors (CircuitOpenError, a failing hook...) record no
+            # outcome, but must not leave the node waiting for a probe forever.
+            with self._lock:
+                node.outstanding -= 1
+                node.probing = False
+
+    def _record(self, node: Node, success: bool) -> None:
+        with self._lock:
+            node.probing = False
+            if success:
+                node.consecutive_failures = 0
+                node.ejected_until = 0.0
+                return
+            node.consecutive_failures += 1
+            if node.ejected_until or node.consecutive_failures >= self.eject_after:
+                node.ejected_until = self._clock() + self.eject_for
+
+
+def _rendezvous_score(key: str, node_id: str) -> int:
+    digest = hashlib.blake2b(f"{node_id}|{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
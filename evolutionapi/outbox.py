@@ -0,0 +1,426 @@
+import json
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import uuid
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import requests
+
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.resources.instances import Instance
+from evolutionapi.retry import RetryPolicy
+from evolutionapi.utils import instance_name_from_request
+
+logger = logging.getLogger(__name__)
+
+# seq, payload length, payload crc32
+_HEADER = struct.Struct("<QII")
+_ACK = struct.Struct("<Q")
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+@dataclass(frozen=True)
+class OutboxRecord:
+    """
+    A queued request.
+
+    Attributes:
+        seq: Position in the log
+        method: HTTP method
+        path: Request path relative to the base URL
+        json: JSON request body
+        params: Query string parameters
+        idempotency_key: Key sent in the ``Idempotency-Key`` header of every
+            delivery attempt
+        instance_name: Instance targeted by the request, used for ordering
+    """
+
+    seq: int
+    method: str
+    path: str
+    json: Any
+    params: Optional[Dict[str, Any]]
+    idempotency_key: str
+    instance_name: Optional[str]
+
+
+@dataclass(frozen=True)
+class OutboxStats:
+    """
+    Snapshot of the outbox.
+
+    Attributes:
+        enqueued: Requests appended since the outbox was opened
+        delivered: Requests delivered successfully
+        retries: Failed delivery attempts that will be retried
+        dead_lettered: Requests dropped after a permanent error
+        pending: Requests waiting for delivery, including recovered ones
+    """
+
+    enqueued: int = 0
+    delivered: int = 0
+    retries: int = 0
+    dead_lettered: int = 0
+    pending: int = 0
+
+
+class Outbox:
+    """
+    Durable queue for write requests.
+
+    Requests are appended to a log file and acknowledged in a second file once
+    delivered, so producers return as soon as the record is written and
+    nothing is lost across restarts: unacknowledged records are sent again
+    when the outbox is reopened. Delivery is at-least-once; every attempt
+    carries the same ``Idempotency-Key`` header so that duplicates can be
+    recognized downstream.
+
+    Records are sharded over ``concurrency`` sender threads by instance name,
+    so the requests of an instance are delivered in order. A request failing
+    with a transient error (connection error, 429 or 5xx) blocks its shard and
+    is retried with exponential backoff; other 4xx errors are permanent and
+    the record is dropped and passed to ``on_dead_letter``.
+    """
+
+    def __init__(
+        self,
+        client,
+        directory: str,
+        concurrency: int = 4,
+        fsync: bool = False,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0,
+        compact_threshold: int = 64 * 1024 * 1024,
+        on_dead_letter: Optional[Callable[[OutboxRecord, Exception], None]] = None,
+    ) -> None:
+        """
+        Open the outbox, recovering the requests left pending in ``directory``.
+
+        Args:
+            client: `EvolutionAPI` client used to deliver the requests
+            directory: Directory holding the log files, created if needed
+            concurrency: Number of sender threads
+            fsync: Sync every append to disk. Without it, records survive a
+                process crash but not an operating system crash
+            retry_delay: Base delay before retrying a failed delivery, doubled
+                after every failure
+            max_retry_delay: Upper bound of the retry delay
+            compact_threshold: Log size in bytes above which the files are
+                truncated once every record was delivered
+            on_dead_letter: Called with records dropped after a permanent error
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.client = client
+        self.directory = directory
+        self.concurrency = concurrency
+        self.fsync = fsync
+        self.compact_threshold = compact_threshold
+        self.on_dead_letter = on_dead_letter
+        self._backoff = RetryPolicy(
+            backoff_factor=retry_delay, max_backoff=max_retry_delay
+        )
+
+        os.makedirs(directory, exist_ok=True)
+        self._log_path = os.path.join(directory, "outbox.log")
+        self._ack_path = os.path.join(directory, "outbox.ack")
+        self._lock = threading.Lock()
+        self._map_lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._map: Optional[mmap.mmap] = None
+        self._counts = dict.fromkeys(OutboxStats.__dataclass_fields__, 0)
+        self._shards: List[queue.Queue] = [queue.Queue() for _ in range(concurrency)]
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+
+        recovered = self._recover()
+        self._log = open(self._log_path, "ab")
+        self._acks = open(self._ack_path, "ab")
+        for entry in recovered:
+            self._dispatch(*entry)
+
+        # Resources whose write calls go through the outbox
+        self.instances = Instance(_QueuedClient(self))
+
+    def enqueue(
+        self,
+        method: str,
+        path: str,
+        json: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        """
+        Append a request to the log for delivery.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to the base URL
+            json: JSON request body
+            params: Query string parameters
+            idempotency_key: Key identifying the request. Generated if omitted
+
+        Returns:
+            The idempotency key of the request.
+        """
+        key = idempotency_key or uuid.uuid4().hex
+        instance_name = instance_name_from_request(path, params, json)
+        payload = _dumps(
+            {
+                "method": method.upper(),
+                "path": path,
+                "json": json,
+                "params": params,
+                "key": key,
+                "instance": instance_name,
+            }
+        )
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            offset = self._log.tell()
+            self._log.write(_HEADER.pack(seq, len(payload), zlib.crc32(payload)))
+            self._log.write(payload)
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+            self._counts["enqueued"] += 1
+            self._counts["pending"] += 1
+        self._dispatch(seq, offset + _HEADER.size, len(payload), instance_name)
+        return key
+
+    def start(self) -> None:
+        """Start the sender threads."""
+        if self._threads:
+            return
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._send_forever, args=(shard,), daemon=True)
+            for shard in self._shards
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every pending request was delivered or dead-lettered.
+
+        Returns:
+            False if the timeout expired first.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._counts["pending"], timeout)
+
+    def close(self) -> None:
+        """
+        Stop the senders after their current attempt and close the files.
+
+        Requests still pending stay in the log and are delivered when the
+        outbox is opened again.
+        """
+        self._stopping.set()
+        for shard in self._shards:
+            shard.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        with self._lock:
+            self._log.close()
+            self._acks.close()
+            with self._map_lock:
+                if self._map is not None:
+                    self._map.close()
+                    self._map = None
+
+    def __enter__(self) -> "Outbox":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def stats(self) -> OutboxStats:
+        """Return a snapshot of the outbox counters."""
+        with self._lock:
+            return OutboxStats(**self._counts)
+
+    def _dispatch(
+        self, seq: int, offset: int, length: int, instance_name: Optional[str]
+    ) -> None:
+        shard = zlib.crc32((instance_name or "").encode()) % self.concurrency
+        self._shards[shard].put((seq, offset, length))
+
+    def _send_forever(self, shard: queue.Queue) -> None:
+        while True:
+            entry = shard.get()
+            if entry is None or self._stopping.is_set():
+                return
+            try:
+                if not self._send(entry):
+                    return
+            except Exception:
+                # Keep the shard alive: its other records must still be sent.
+                logger.exception("Outbox failed to process record %d", entry[0])
+
+    def _send(self, entry: Tuple[int, int, int]) -> bool:
+        """Deliver a record until it is acknowledged; False when closing."""
+        try:
+            record = self._read(*entry)
+        except Exception:
+            # An unreadable record can never be delivered.
+            self._ack(entry[0], "dead_lettered")
+            raise
+        failures = 0
+        while True:
+            try:
+                self._deliver(record)
+            except Exception as exc:
+                if _is_permanent(exc):
+                    self._ack(record.seq, "dead_lettered")
+                    if self.on_dead_letter is not None:
+                        self.on_dead_letter(record, exc)
+                    return True
+                failures += 1
+                with self._lock:
+                    self._counts["retries"] += 1
+                if self._stopping.wait(self._backoff.backoff(failures)):
+                    return False
+            else:
+                self._ack(record.seq, "delivered")
+                return True
+
+    def _deliver(self, record: OutboxRecord) -> None:
+        kwargs: Dict[str, Any] = {
+            "headers": {IDEMPOTENCY_HEADER: record.idempotency_key}
+        }
+        if record.json is not None:
+            kwargs["json"] = record.json
+        if record.params is not None:
+            kwargs["params"] = record.params
+        self.client._request(record.method, record.path, **kwargs)
+
+    def _ack(self, seq: int, outcome: str) -> None:
+        with self._lock:
+            self._acks.write(_ACK.pack(seq))
+            self._acks.flush()
+            if self.fsync:
+                os.fsync(self._acks.fileno())
+            self._counts[outcome] += 1
+            self._counts["pending"] -= 1
+            if not self._counts["pending"]:
+                if self._log.tell() >= self.compact_threshold:
+                    self._compact()
+                self._idle.notify_all()
+
+    def _compact(self) -> None:
+        # Called with the lock held, when every record was acknowledged.
+        # Acknowledgements go first: after a crash between the two steps,
+        # the records left in the log are only sent again, whereas stale
+        # acknowledgements would match the sequence numbers of new records.
+        self._acks.truncate(0)
+        self._acks.seek(0)
+        if self.fsync:
+            os.fsync(self._acks.fileno())
+        with self._map_lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._log.truncate(0)
+            self._log.seek(0)
+
+    def _read(self, seq: int, offset: int, length: int) -> OutboxRecord:
+        with self._map_lock:
+            if self._map is None or offset + length > len(self._map):
+                if self._map is not None:
+                    self._map.close()
+                with open(self._log_path, "rb") as log:
+                    self._map = mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ)
+            data = json.loads(self._map[offset : offset + length])
+        return OutboxRecord(
+            seq=seq,
+            method=data["method"],
+            path=data["path"],
+            json=data["json"],
+            params=data["params"],
+            idempotency_key=data["key"],
+            instance_name=data["instance"],
+        )
+
+    def _recover(self) -> List[Tuple[int, int, int, Optional[str]]]:
+        acked: Set[int] = set()
+        if os.path.exists(self._ack_path):
+            with open(self._ack_path, "rb") as acks:
+                data = acks.read()
+            usable = len(data) - len(data) % _ACK.size
+            acked.update(seq for (seq,) in _ACK.iter_unpack(data[:usable]))
+
+        pending = []
+        self._next_seq = 1
+        if not os.path.exists(self._log_path) or not os.path.getsize(self._log_path):
+            return pending
+
+        with open(self._log_path, "r+b") as log:
+            with mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                offset, size = 0, len(view)
+                while offset + _HEADER.size <= size:
+                    seq, length, crc = _HEADER.unpack_from(view, offset)
+                    start = offset + _HEADER.size
+                    payload = view[start : start + length]
+                    if len(payload) < length or zlib.crc32(payload) != crc:
+                        break
+                    self._next_seq = max(self._next_seq, seq + 1)
+                    if seq not in acked:
+                        instance = json.loads(payload)["instance"]
+                        pending.append((seq, start, length, instance))
+                    offset = start + length
+            if offset < size:
+                # Torn write from a crash: drop the partial record.
+                log.truncate(offset)
+
+        self._counts["pending"] = len(pending)
+        return pending
+
+
+class _QueuedClient:
+    """Client stand-in that queues writes in an outbox and sends reads directly."""
+
+    def __init__(self, outbox: Outbox) -> None:
+        self.outbox = outbox
+
+    def _get(self, path: str, **kwargs) -> Dict[str, Any]:
+        return self.outbox.client._get(path, **kwargs)
+
+    def _write(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        key = self.outbox.enqueue(
+            method, path, json=kwargs.get("json"), params=kwargs.get("params")
+        )
+        return {"queued": True, "idempotencyKey": key}
+
+    def _post(self, path: str, **kwargs) -> Dict[str, Any]:
+        return self._write("POST", path, **kwargs)
+
+    def _put(self, path: str, **kwargs) -> Dict[str, Any]:
+        return self._write("PUT", path, **kwargs)
+
+    def _delete(self, path: str, **kwargs) -> Dict[str, Any]:
+        return self._write("DELETE", path, **kwargs)
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _is_permanent(exc: Exception) -> bool:
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return False
+    if isinstance(exc, EvolutionAPIError):
+        return 400 <= exc.status_code < 500 and exc.status_code not in (408, 429)
+    return True
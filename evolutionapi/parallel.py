@@ -0,0 +1,451 @@
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import signal
+import threading
+import traceback
+import zlib
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Set
+
+from evolutionapi.bulk import BulkResult, run_partitioned
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.multinode import MultiNodeEvolutionAPI
+from evolutionapi.transports import RequestsTransport
+
+logger = logging.getLogger(__name__)
+
+# Messages sent by workers on the results queue
+_RESULT = "result"
+_DONE = "done"
+_FAILED = "failed"
+
+_POLL_INTERVAL = 0.1
+
+
+class ShardError(Exception):
+    """Error reported for the items of a worker process that failed."""
+
+    def __init__(self, shard: int, message: str, remote_traceback: str = "") -> None:
+        """
+        Initialize the error.
+
+        Args:
+            shard: Index of the failed worker
+            message: What went wrong
+            remote_traceback: Traceback formatted in the worker, if any
+        """
+        self.shard = shard
+        self.message = message
+        self.remote_traceback = remote_traceback
+
+        super().__init__(f"Shard {shard} failed: {message}")
+
+    def __reduce__(self):
+        return self.__class__, (self.shard, self.message, self.remote_traceback)
+
+
+class RemoteError(Exception):
+    """Stands for an exception raised in a worker that could not be pickled."""
+
+    def __init__(self, message: str, remote_traceback: str = "") -> None:
+        """
+        Initialize the error.
+
+        Args:
+            message: Type and message of the original exception
+            remote_traceback: Traceback formatted in the worker
+        """
+        self.message = message
+        self.remote_traceback = remote_traceback
+
+        super().__init__(message)
+
+    def __reduce__(self):
+        return self.__class__, (self.message, self.remote_traceback)
+
+
+def instance_key(item: Any) -> str:
+    """
+    Default sharding key of `ProcessPool.map`: the instance name of an item.
+
+    Args:
+        item: An instance name, a tuple starting with one (like the items of
+            `Message.send_many`), or a mapping with an ``instance_name`` key
+
+    Returns:
+        The instance name.
+    """
+    if isinstance(item, str):
+        return item
+    if isinstance(item, tuple):
+        return item[0]
+    if isinstance(item, Mapping):
+        return item["instance_name"]
+    raise TypeError(f"Cannot find the instance name of {item!r}, pass key=")
+
+
+class ProcessPool:
+    """
+    Run calls on many instances over several worker processes.
+
+    For jobs touching every instance, encoding, decoding and validating
+    responses in a single process is limited by the GIL long before the
+    network is. The pool shards items by instance name across ``processes``
+    workers; each worker builds its own client (and so its own connection
+    pool) and runs up to ``threads`` calls at once.
+
+    Sharding is sticky: every item of an instance goes to the same worker,
+    which runs them one at a time in input order, so per-instance ordering
+    is preserved.
+
+    Example::
+
+        def set_webhook(client, instance_name):
+            return client._post(f"/webhook/set/{instance_name}", json={...})
+
+        with ProcessPool(partial(EvolutionAPI, url, api_key), processes=4) as pool:
+            for result in pool.map(set_webhook, instance_names):
+                ...
+
+    Functions, items, results and the client factory are sent between
+    processes, so they must be picklable: use module-level functions and
+    `functools.partial` rather than lambdas or closures.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        processes: Optional[int] = None,
+        threads: int = 4,
+        queue_size: Optional[int] = None,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+    ) -> None:
+        """
+        Initialize the pool. Workers are started by `map`.
+
+        Args:
+            client_factory: Picklable callable building the client of a
+                worker, e.g. ``partial(EvolutionAPI, url, api_key)``
+            processes: Number of worker processes. Defaults to the number
+                of CPUs
+            threads: Maximum number of concurrent calls in each worker
+            queue_size: Maximum number of items queued for a worker.
+                Defaults to four times ``threads``
+            mp_context: Multiprocessing context. Defaults to "spawn", which
+                is safe whatever threads the parent process runs
+        """
+        if threads < 1:
+            raise ValueError("threads must be at least 1")
+        self.client_factory = client_factory
+        self.processes = processes or os.cpu_count() or 1
+        self.threads = threads
+        self.queue_size = queue_size or 4 * threads
+        self._context = mp_context or multiprocessing.get_context("spawn")
+        self._cancelled = threading.Event()
+        self._stopping = None
+
+    @classmethod
+    def from_client(cls, client, **kwargs) -> "ProcessPool":
+        """
+        Create a pool whose workers use the settings of ``client``.
+
+        The base URL, API key, pool configuration, retry policy and codec
+        are copied, as well as the nodes, strategy, owners and ejection
+        settings of a `MultiNodeEvolutionAPI`. Other settings (cache, rate
+        limiter, instruments...) are per process and are not.
+
+        Args:
+            client: `EvolutionAPI` or `MultiNodeEvolutionAPI` client using
+                the default transport
+            **kwargs: Other `ProcessPool` arguments
+
+        Returns:
+            The pool.
+
+        Raises:
+            TypeError: For other clients or transports, whose settings cannot
+                be copied. Pass a ``client_factory`` to `ProcessPool` instead
+        """
+        transports = [node.transport for node in getattr(client, "nodes", [])]
+        if not all(
+            type(transport) is RequestsTransport
+            for transport in transports or [client.transport]
+        ):
+            raise TypeError(
+                "from_client only copies clients using the default transport, "
+                "pass a client_factory building the transport instead"
+            )
+
+        settings = dict(
+            pool_config=client.pool_config,
+            retry_policy=client.retry_policy,
+            codec=client.codec,
+        )
+        if type(client) is MultiNodeEvolutionAPI:
+            factory = partial(
+                MultiNodeEvolutionAPI,
+                client.base_urls,
+                client.api_key,
+                strategy=client.strategy,
+                owners=client.owners,
+                eject_after=client.eject_after,
+                eject_for=client.eject_for,
+                **settings,
+            )
+        elif type(client) is EvolutionAPI:
+            factory = partial(EvolutionAPI, client.base_url, client.api_key, **settings)
+        else:
+            raise TypeError(
+                f"from_client cannot copy a {type(client).__name__}, "
+                "pass a client_factory instead"
+            )
+        return cls(factory, **kwargs)
+
+    def shard_of(self, key: str) -> int:
+        """Return the index of the worker processing the items of ``key``."""
+        return zlib.crc32(key.encode()) % self.processes
+
+    def cancel(self) -> None:
+        """
+        Stop the running `map` gracefully.
+
+        No new item is started; calls in flight complete and their results
+        are still yielded. Items that were not started are dropped.
+        """
+        self._cancelled.set()
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def __enter__(self) -> "ProcessPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cancel()
+
+    def map(
+        self,
+        func: Callable[[Any, Any], Any],
+        items: Iterable[Any],
+        key: Callable[[Any], str] = instance_key,
+    ) -> Iterator[BulkResult]:
+        """
+        Call ``func(client, item)`` for every item in the worker processes.
+
+        Items are consumed lazily and queued to their worker, so a busy
+        worker slows down reading of the input instead of buffering it.
+
+        Args:
+            func: Picklable function taking a client and an item
+            items: Items to process
+            key: Returns the instance name of an item, used for sharding.
+                Runs in the calling process
+
+        Yields:
+            A `BulkResult` per item, in completion order. Failed calls carry
+            the raised exception in ``error`` (`RemoteError` when it could
+            not be pickled). When a worker dies or its client cannot be
+            built, each item sent to it carries a `ShardError`.
+        """
+        self._cancelled.clear()
+        self._stopping = self._context.Event()
+        run = _Run(self, func, items, key)
+        try:
+            yield from run
+        finally:
+            self.cancel()
+            run.shutdown()
+
+
+class _Run:
+    """One `ProcessPool.map` call: workers, feeder thread and bookkeeping."""
+
+    def __init__(self, pool: ProcessPool, func, items, key) -> None:
+        self.pool = pool
+        self.items = items
+        self.key = key
+        context = pool._context
+        self.results = context.Queue()
+        self.inboxes = [context.Queue(pool.queue_size) for _ in range(pool.processes)]
+        self.workers = [
+            context.Process(
+                target=_work,
+                args=(
+                    shard,
+                    pool.client_factory,
+                    func,
+                    pool.threads,
+                    self.inboxes[shard],
+                    self.results,
+                    pool._stopping,
+                ),
+                daemon=True,
+            )
+            for shard in range(pool.processes)
+        ]
+        self.lock = threading.Lock()
+        self.outstanding: Dict[int, Dict[int, Any]] = {
+            shard: {} for shard in range(pool.processes)
+        }
+        self.failed: Dict[int, ShardError] = {}
+        self.finished: Set[int] = set()
+        self.exited: Set[int] = set()
+        self.feeder = threading.Thread(target=self._feed, daemon=True)
+        self.feed_error: Optional[BaseException] = None
+
+    def __iter__(self) -> Iterator[BulkResult]:
+        for worker in self.workers:
+            worker.start()
+        self.feeder.start()
+
+        while True:
+            yield from self._flush_failed()
+            if self._complete():
+                break
+            try:
+                message = self.results.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            kind, shard = message[0], message[1]
+            if kind == _RESULT:
+                index, result, error = pickle.loads(message[2])
+                with self.lock:
+                    item = self.outstanding[shard].pop(index)
+                yield BulkResult(index=index, item=item, result=result, error=error)
+            elif kind == _DONE:
+                self.finished.add(shard)
+            elif kind == _FAILED:
+                self._fail(shard, message[2], message[3])
+
+        if self.feed_error is not None:
+            raise self.feed_error
+
+    def _complete(self) -> bool:
+        if self.feeder.is_alive():
+            return False
+        # Once cancelled, items not started are dropped: only the calls in
+        # flight are waited for.
+        cancelled = self.pool._cancelled.is_set()
+        with self.lock:
+            return all(
+                (shard in self.finished or shard in self.failed)
+                and (cancelled or not self.outstanding[shard])
+                for shard in range(len(self.workers))
+            )
+
+    def _feed(self) -> None:
+        try:
+            for index, item in enumerate(self.items):
+                if self.pool._cancelled.is_set():
+                    break
+                key = self.key(item)
+                shard = self.pool.shard_of(key)
+                with self.lock:
+                    self.outstanding[shard][index] = item
+                self._put(shard, (index, key, item))
+        except BaseException as exc:
+            self.feed_error = exc
+            self.pool.cancel()
+        finally:
+            for shard in range(len(self.workers)):
+                self._put(shard, None)
+
+    def _put(self, shard: int, message: Any) -> None:
+        while shard not in self.failed:
+            try:
+                self.inboxes[shard].put(message, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                if self.pool._cancelled.is_set():
+                    return
+
+    def _check_workers(self) -> None:
+        for shard, worker in enumerate(self.workers):
+            if shard in self.finished or shard in self.failed:
+                continue
+            if worker.exitcode is None:
+                continue
+            # Messages sent right before exiting may still be unread: only
+            # give up on the worker after another empty poll.
+            if shard in self.exited:
+                self._fail(shard, f"worker exited with code {worker.exitcode}")
+            self.exited.add(shard)
+
+    def _fail(self, shard: int, message: str, remote_traceback: str = "") -> None:
+        logger.error("Process pool shard %d failed: %s", shard, message)
+        self.failed[shard] = ShardError(shard, message, remote_traceback)
+
+    def _flush_failed(self) -> Iterator[BulkResult]:
+        for shard, error in self.failed.items():
+            with self.lock:
+                items, self.outstanding[shard] = self.outstanding[shard], {}
+            for index, item in sorted(items.items()):
+                yield BulkResult(index=index, item=item, error=error)
+
+    def shutdown(self) -> None:
+        for inbox in self.inboxes:
+            inbox.cancel_join_thread()
+        for worker in self.workers:
+            if worker.pid is None:
+                continue
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self.feeder.join(timeout=1)
+        for inbox in self.inboxes:
+            inbox.close()
+        self.results.close()
+
+
+def _work(shard, client_factory, func, threads, inbox, results, stopping) -> None:
+    # The parent handles Ctrl+C and cancels the workers gracefully.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        client = client_factory()
+
+        def messages():
+            while not stopping.is_set():
+                try:
+                    message = inbox.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if message is None:
+                    return
+                yield message
+
+        for outcome in run_partitioned(
+            partial(_call, func, client),
+            messages(),
+            partition=lambda message: message[1],
+            max_concurrency=threads,
+            max_pending=threads,
+        ):
+            results.put((_RESULT, shard, _dumps(outcome)))
+        results.put((_DONE, shard))
+    except BaseException as exc:
+        results.put(
+            (_FAILED, shard, f"{type(exc).__name__}: {exc}", traceback.format_exc())
+        )
+
+
+def _call(func, client, message) -> Any:
+    return func(client, message[2])
+
+
+def _dumps(outcome: BulkResult) -> bytes:
+    index = outcome.item[0]
+    error = outcome.error
+    try:
+        return pickle.dumps((index, outcome.result, error))
+    except Exception as exc:
+        if error is None:
+            error = exc
+        remote = RemoteError(
+            f"{type(error).__name__}: {error}",
+            "".join(traceback.format_exception(error)),
+        )
+        return pickle.dumps((index, None, remote))
@@ -0,0 +1,173 @@
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    Connection pool and timeout settings for the HTTP transport.
+
+    Attributes:
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Maximum number of connections kept per host
+        pool_block: Wait for a free connection when the pool is exhausted
+            instead of opening an extra connection that is discarded afterwards
+        keep_alive: Whether connections are kept open between requests
+        connect_timeout: Seconds to wait for a connection to be established
+        read_timeout: Seconds to wait for the server to send a response
+    """
+
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keep_alive: bool = True
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+
+    @property
+    def timeout(self) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """Timeout tuple in the format expected by requests, if any is set."""
+        if self.connect_timeout is None and self.read_timeout is None:
+            return None
+        return (self.connect_timeout, self.read_timeout)
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """
+    Snapshot of connection pool usage.
+
+    Attributes:
+        created: Connections opened, including reconnects of dropped connections
+        reused: Requests served by an already open pooled connection
+        discarded: Connections closed because the pool was full
+    """
+
+    created: int = 0
+    reused: int = 0
+    discarded: int = 0
+
+
+@dataclass
+class ConnectionInfo:
+    """
+    Details about the connection used by the last request on this thread.
+
+    Attributes:
+        reused: Whether an open pooled connection was used
+        connect: Seconds spent opening the connection (DNS, TCP and TLS), or
+            None when no connection was opened
+    """
+
+    reused: Optional[bool] = None
+    connect: Optional[float] = None
+
+
+_local = threading.local()
+
+
+def reset_connection_info() -> None:
+    """Clear the connection details recorded for the current thread."""
+    _local.info = ConnectionInfo()
+
+
+def connection_info() -> ConnectionInfo:
+    """Return the connection details of the last request on this thread."""
+    info = getattr(_local, "info", None)
+    if info is None:
+        info = _local.info = ConnectionInfo()
+    return info
+
+
+class _TimedConnectionMixin:
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        connection_info().connect = time.perf_counter() - started
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _PoolCounters:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def add(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(self.created, self.reused, self.discarded)
+
+
+class _CountingPoolMixin:
+    def __init__(self, *args, counters: _PoolCounters, **kwargs) -> None:
+        self._counters = counters
+        super().__init__(*args, **kwargs)
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        reused = conn.is_connected
+        self._counters.add("reused" if reused else "created")
+        connection_info().reused = reused
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        if conn is not None and self.pool is not None and self.pool.full():
+            self._counters.add("discarded")
+        super()._put_conn(conn)
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTP adapter configured from a `PoolConfig` that tracks pool statistics."""
+
+    def __init__(self, config: PoolConfig) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            config: Pool settings to apply
+        """
+        self.config = config
+        self._counters = _PoolCounters()
+        super().__init__(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+        )
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": partial(_CountingHTTPConnectionPool, counters=self._counters),
+            "https": partial(_CountingHTTPSConnectionPool, counters=self._counters),
+        }
+
+    def stats(self) -> PoolStats:
+        """Return a snapshot of the connection pool statistics."""
+        return self._counters.snapshot()
@@ -0,0 +1,245 @@
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from evolutionapi.exceptions import RateLimitError
+
+
+@dataclass(frozen=True)
+class Rate:
+    """
+    Token bucket rate.
+
+    Attributes:
+        requests: Number of requests allowed per period
+        period: Period length in seconds
+        burst: Bucket capacity, i.e. requests allowed back to back. Defaults to
+            ``requests``. Must be at least 1: write one request every two
+            seconds as ``Rate(1, period=2)`` rather than ``Rate(0.5)``
+    """
+
+    requests: float
+    period: float = 1.0
+    burst: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.requests <= 0 or self.period <= 0:
+            raise ValueError("requests and period must be positive")
+        if self.capacity < 1:
+            # A bucket that never holds a whole token would never let a
+            # request through.
+            raise ValueError(
+                "burst (or requests when burst is not set) must be at least 1; "
+                "use Rate(1, period=2) for one request every 2 seconds"
+            )
+
+    @property
+    def per_second(self) -> float:
+        """Refill rate in tokens per second."""
+        return self.requests / self.period
+
+    @property
+    def capacity(self) -> float:
+        """Maximum number of tokens in the bucket."""
+        return self.burst if self.burst is not None else self.requests
+
+
+Bucket = Tuple[str, Rate]
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for token buckets.
+
+    Implement this interface on top of shared storage (e.g. a Redis script) to
+    enforce limits across processes.
+    """
+
+    @abstractmethod
+    def acquire(self, buckets: Sequence[Bucket], tokens: float = 1) -> float:
+        """
+        Atomically take ``tokens`` from every bucket.
+
+        Tokens are only taken when all buckets have enough of them.
+
+        Args:
+            buckets: Pairs of bucket key and rate
+            tokens: Tokens to take from each bucket
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds to wait until
+            every bucket would have enough tokens.
+
+        Raises:
+            ValueError: If ``tokens`` exceeds the capacity of a bucket, since
+                they could never be taken
+        """
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Thread-safe token buckets kept in process memory."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            clock: Monotonic clock, mainly useful for testing
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (tokens, updated_at)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def acquire(self, buckets: Sequence[Bucket], tokens: float = 1) -> float:
+        for key, rate in buckets:
+            if tokens > rate.capacity:
+                raise ValueError(
+                    f"Cannot take {tokens} tokens from bucket {key!r} "
+                    f"of capacity {rate.capacity}"
+                )
+        with self._lock:
+            now = self._clock()
+            levels: List[float] = []
+            wait = 0.0
+            for key, rate in buckets:
+                level, updated_at = self._buckets.get(key, (rate.capacity, now))
+                level = min(rate.capacity, level + (now - updated_at) * rate.per_second)
+                levels.append(level)
+                if level < tokens:
+                    wait = max(wait, (tokens - level) / rate.per_second)
+
+            if wait > 0:
+                return wait
+
+            for (key, _), level in zip(buckets, levels):
+                self._buckets[key] = (level - tokens, now)
+            return 0.0
+
+
+class RateLimiter:
+    """
+    Client-side token bucket rate limiter.
+
+    A request must get a token from the global bucket, from the bucket of the
+    longest matching path prefix and from the bucket of its instance. Buckets
+    are scoped per API key.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[Rate] = None,
+        paths: Optional[Dict[str, Rate]] = None,
+        per_instance: Optional[Rate] = None,
+        instances: Optional[Dict[str, Rate]] = None,
+        backend: Optional[RateLimitBackend] = None,
+        blocking: bool = True,
+        max_wait: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Limit shared by every request
+            paths: Limits per path prefix, e.g. ``{"/instance/*": Rate(5)}``
+            per_instance: Limit applied to each instance separately
+            instances: Limits for specific instance names, overriding
+                ``per_instance``
+            backend: Bucket storage. Defaults to `InMemoryBackend`
+            blocking: Wait for tokens instead of raising `RateLimitError`
+            max_wait: In blocking mode, raise `RateLimitError` instead of
+                waiting longer than this many seconds
+        """
+        self.rate = rate
+        self.paths = {prefix.rstrip("*"): r for prefix, r in (paths or {}).items()}
+        self.per_instance = per_instance
+        self.instances = dict(instances or {})
+        self.backend = backend or InMemoryBackend()
+        self.blocking = blocking
+        self.max_wait = max_wait
+
+    def buckets_for(
+        self, path: str, instance_name: Optional[str] = None, scope: str = ""
+    ) -> List[Bucket]:
+        """
+        Return the buckets a request has to take a token from.
+
+        Args:
+            path: Request path relative to the base URL
+            instance_name: Instance targeted by the request
+            scope: Namespace for the bucket keys, e.g. derived from the API key
+        """
+        buckets: List[Bucket] = []
+        if self.rate is not None:
+            buckets.append((f"{scope}:global", self.rate))
+
+        prefixes = [prefix for prefix in self.paths if path.startswith(prefix)]
+        if prefixes:
+            prefix = max(prefixes, key=len)
+            buckets.append((f"{scope}:path:{prefix}", self.paths[prefix]))
+
+        if instance_name is not None:
+            rate = self.instances.get(instance_name, self.per_instance)
+            if rate is not None:
+                buckets.append((f"{scope}:instance:{instance_name}", rate))
+        return buckets
+
+    def try_acquire(
+        self, path: str, instance_name: Optional[str] = None, scope: str = ""
+    ) -> bool:
+        """
+        Take a token without waiting.
+
+        Returns:
+            Whether the request is allowed now.
+        """
+        buckets = self.buckets_for(path, instance_name, scope)
+        return not buckets or self.backend.acquire(buckets) == 0
+
+    def acquire(
+        self,
+        path: str,
+        instance_name: Optional[str] = None,
+        scope: str = "",
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> float:
+        """
+        Take a token, waiting for it in blocking mode.
+
+        Args:
+            path: Request path relative to the base URL
+            instance_name: Instance targeted by the request
+            scope: Namespace for the bucket keys
+            sleep: Function used to wait
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            RateLimitError: In non-blocking mode when no token is available, or
+                when waiting would exceed ``max_wait``
+        """
+        buckets = self.buckets_for(path, instance_name, scope)
+        if not buckets:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            wait = self.backend.acquire(buckets)
+            if wait == 0:
+                return waited
+            if not self.blocking or (
+                self.max_wait is not None and waited + wait > self.max_wait
+            ):
+                target = path if instance_name is None else f"{path} ({instance_name})"
+                raise RateLimitError(retry_after=wait, key=target)
+            sleep(wait)
+            waited += wait
+
+
+def api_key_scope(api_key: str) -> str:
+    """Derive a bucket scope from an API key without exposing the key."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
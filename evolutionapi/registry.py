@@ -0,0 +1,423 @@
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.schemas import InstanceRecord
+from evolutionapi.webhooks import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+# Connection states reported by Evolution API
+OPEN = "open"
+CONNECTING = "connecting"
+CLOSE = "close"
+
+# Events the registry applies
+TRACKED_EVENTS = (
+    "CONNECTION_UPDATE",
+    "QRCODE_UPDATED",
+    "LOGOUT_INSTANCE",
+    "REMOVE_INSTANCE",
+)
+
+
+@dataclass(frozen=True)
+class InstanceTransition:
+    """
+    A change of an instance's connection state.
+
+    Attributes:
+        instance_name: Name of the instance
+        previous: State before the change, None if the instance is new
+        current: State after the change, None if the instance was removed
+        record: The instance after the change, None if it was removed
+    """
+
+    instance_name: str
+    previous: Optional[str]
+    current: Optional[str]
+    record: Optional[InstanceRecord]
+
+
+class InstanceRegistry:
+    """
+    In-process view of the connection state of every instance.
+
+    The registry is loaded with one ``fetchInstances`` snapshot, then kept
+    current by applying webhook or websocket events (`attach`, `apply_event`)
+    and/or by adaptive polling (`start`). Instances are indexed by name,
+    state, owner JID and phone number, so lookups never call the server.
+    Subscribers are notified of every state transition.
+
+    Polling only refreshes the instances waiting for a QR code scan
+    individually, since those are the ones expected to change, and takes a
+    full snapshot at least every ``max_poll_interval`` seconds. The interval
+    halves after a poll that found changes and doubles after one that did
+    not, and stays at its maximum while events keep the registry current.
+    """
+
+    def __init__(
+        self,
+        client,
+        min_poll_interval: float = 5.0,
+        max_poll_interval: float = 300.0,
+        incremental_limit: int = 50,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the registry. Call `refresh` or `start` to load it.
+
+        Args:
+            client: `EvolutionAPI` client
+            min_poll_interval: Shortest delay between two polls, in seconds
+            max_poll_interval: Longest delay between two polls, and maximum
+                age of the last full snapshot
+            incremental_limit: Maximum number of instances refreshed
+                individually by a poll. Beyond it, a full snapshot is taken
+            clock: Monotonic time source
+        """
+        self.client = client
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.incremental_limit = incremental_limit
+        self.poll_interval = min_poll_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._records: Dict[str, InstanceRecord] = {}
+        self._by_status: Dict[Optional[str], Set[str]] = {}
+        self._by_owner: Dict[str, Set[str]] = {}
+        self._by_number: Dict[str, Set[str]] = {}
+        self._subscribers: List[tuple] = []
+        # Names updated by events during each fetch in progress
+        self._fetches: List[Set[str]] = []
+        self._last_snapshot: Optional[float] = None
+        self._events_since_poll = 0
+        self._stopping = threading.Event()
+        self._poller: Optional[threading.Thread] = None
+
+    # Lookups
+
+    def get(self, instance_name: str) -> Optional[InstanceRecord]:
+        """Return the record of an instance, or None if it is unknown."""
+        return self._records.get(instance_name)
+
+    def status(self, instance_name: str) -> Optional[str]:
+        """Return the connection state of an instance, or None if it is unknown."""
+        record = self._records.get(instance_name)
+        return record.status if record is not None else None
+
+    def with_status(self, status: str) -> Set[str]:
+        """Return the names of the instances in a connection state."""
+        with self._lock:
+            return set(self._by_status.get(status, ()))
+
+    def by_owner(self, owner: str) -> List[InstanceRecord]:
+        """Return the instances connected with a WhatsApp JID."""
+        with self._lock:
+            return [self._records[name] for name in self._by_owner.get(owner, ())]
+
+    def by_number(self, number: str) -> List[InstanceRecord]:
+        """Return the instances connected with a phone number, e.g. ``5511999999999``."""
+        with self._lock:
+            return [self._records[name] for name in self._by_number.get(number, ())]
+
+    def counts(self) -> Dict[Optional[str], int]:
+        """Return the number of instances per connection state."""
+        with self._lock:
+            return {status: len(names) for status, names in self._by_status.items()}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, instance_name: object) -> bool:
+        return instance_name in self._records
+
+    def __iter__(self) -> Iterator[InstanceRecord]:
+        with self._lock:
+            return iter(list(self._records.values()))
+
+    # Notifications
+
+    def subscribe(
+        self,
+        callback: Optional[Callable[[InstanceTransition], Any]] = None,
+        status: Optional[str] = None,
+    ):
+        """
+        Register a callback called with every `InstanceTransition`.
+
+        Can be used as a decorator: ``@registry.subscribe(status="close")``.
+        Callbacks run on the thread that applied the change; exceptions are
+        logged and do not stop other callbacks.
+
+        Args:
+            callback: Function taking an `InstanceTransition`
+            status: Only notify transitions into this state
+        """
+        if callback is None:
+            return lambda func: self.subscribe(func, status)
+        self._subscribers.append((callback, status))
+        return callback
+
+    def _notify(self, transitions: List[InstanceTransition]) -> None:
+        for transition in transitions:
+            for callback, status in self._subscribers:
+                if status is not None and transition.current != status:
+                    continue
+                try:
+                    callback(transition)
+                except Exception:
+                    logger.exception("Instance registry subscriber failed")
+
+    # Updates
+
+    def refresh(self) -> int:
+        """
+        Replace the registry with a full ``fetchInstances`` snapshot.
+
+        Records are built as the response streams in, so the decoded
+        payloads are never all held in memory at once. Instances updated by
+        events while the snapshot was fetched keep their newer state.
+
+        Returns:
+            The number of transitions, including added and removed instances.
+        """
+        with self._fetching() as updated:
+            snapshot = {
+                record.instance_name: record
+                for record in InstanceRecord.from_payloads(
+                    self.client.instances.iter_all()
+                )
+                if record.instance_name
+            }
+            with self._lock:
+                transitions = [
+                    self._remove(name)
+                    for name in list(self._records)
+                    if name not in snapshot and name not in updated
+                ]
+                transitions.extend(
+                    self._put(record)
+                    for name, record in snapshot.items()
+                    if name not in updated
+                )
+                self._last_snapshot = self._clock()
+        return self._changed(transitions)
+
+    def refresh_instance(self, instance_name: str) -> bool:
+        """
+        Refresh one instance with ``fetchInstances``.
+
+        The response is ignored if an event updated the instance meanwhile.
+
+        Returns:
+            Whether the state of the instance changed.
+        """
+        with self._fetching() as updated:
+            try:
+                response = self.client.instances.fetch(instance_name)
+            except EvolutionAPIError as exc:
+                if exc.status_code != 404:
+                    raise
+                response = []
+            items = [response] if isinstance(response, Mapping) else response
+            records = [InstanceRecord.from_payload(item) for item in items]
+            record = next(
+                (r for r in records if r.instance_name == instance_name), None
+            )
+            with self._lock:
+                if instance_name in updated:
+                    return False
+                transition = (
+                    self._put(record)
+                    if record is not None
+                    else self._remove(instance_name)
+                )
+        return bool(self._changed([transition]))
+
+    def apply_event(self, event: WebhookEvent) -> bool:
+        """
+        Update the registry from a webhook or websocket event.
+
+        Handles ``CONNECTION_UPDATE``, ``QRCODE_UPDATED`` (waiting for a scan),
+        ``LOGOUT_INSTANCE`` and ``REMOVE_INSTANCE``; other events are ignored.
+
+        Args:
+            event: The event
+
+        Returns:
+            Whether the state of an instance changed.
+        """
+        data = event.data if isinstance(event.data, dict) else {}
+        name = event.instance or data.get("instance")
+        if not name or event.event not in TRACKED_EVENTS:
+            return False
+
+        changes: Dict[str, Any] = {}
+        if event.event == "CONNECTION_UPDATE":
+            changes["status"] = data.get("state")
+            for key in ("wuid", "owner"):
+                if data.get(key):
+                    changes["owner"] = data[key]
+            for key in ("profileName", "profilePictureUrl"):
+                if data.get(key):
+                    changes[key] = data[key]
+        elif event.event == "QRCODE_UPDATED":
+            changes["status"] = CONNECTING
+        elif event.event == "LOGOUT_INSTANCE":
+            changes["status"] = CLOSE
+
+        with self._lock:
+            self._events_since_poll += 1
+            for updated in self._fetches:
+                updated.add(name)
+            if event.event == "REMOVE_INSTANCE":
+                transition = self._remove(name)
+            elif changes.get("status"):
+                current = self._records.get(name)
+                payload = current.to_dict() if current is not None else {}
+                payload.update(changes, instanceName=name)
+                transition = self._put(InstanceRecord.from_payload(payload))
+            else:
+                return False
+        return bool(self._changed([transition]))
+
+    def attach(self, source) -> None:
+        """
+        Apply the events of a `WebhookDispatcher` or `EventStream`.
+
+        Args:
+            source: Any object with an ``on(event, handler)`` method
+        """
+        for event in TRACKED_EVENTS:
+            source.on(event, self.apply_event)
+
+    @contextmanager
+    def _fetching(self) -> Iterator[Set[str]]:
+        # Collects the names updated by events until the block exits, so that
+        # the fetched (older) state does not overwrite them.
+        updated: Set[str] = set()
+        with self._lock:
+            self._fetches.append(updated)
+        try:
+            yield updated
+        finally:
+            with self._lock:
+                self._fetches = [s for s in self._fetches if s is not updated]
+
+    def _changed(self, transitions: List[Optional[InstanceTransition]]) -> int:
+        changed = [t for t in transitions if t is not None]
+        self._notify(changed)
+        return len(changed)
+
+    def _put(self, record: InstanceRecord) -> Optional[InstanceTransition]:
+        name = record.instance_name
+        previous = self._records.get(name)
+        if previous is not None:
+            self._unindex(previous)
+        self._records[name] = record
+        self._index(record)
+        if previous is not None and previous.status == record.status:
+            return None
+        return InstanceTransition(
+            name, previous.status if previous else None, record.status, record
+        )
+
+    def _remove(self, instance_name: str) -> Optional[InstanceTransition]:
+        previous = self._records.pop(instance_name, None)
+        if previous is None:
+            return None
+        self._unindex(previous)
+        return InstanceTransition(instance_name, previous.status, None, None)
+
+    def _index(self, record: InstanceRecord) -> None:
+        name = record.instance_name
+        self._by_status.setdefault(record.status, set()).add(name)
+        if record.owner:
+            self._by_owner.setdefault(record.owner, set()).add(name)
+            self._by_number.setdefault(_number(record.owner), set()).add(name)
+
+    def _unindex(self, record: InstanceRecord) -> None:
+        name = record.instance_name
+        _discard(self._by_status, record.status, name)
+        if record.owner:
+            _discard(self._by_owner, record.owner, name)
+            _discard(self._by_number, _number(record.owner), name)
+
+    # Polling
+
+    def poll(self) -> int:
+        """
+        Run one polling step and adapt the polling interval.
+
+        Returns:
+            The number of transitions found.
+        """
+        now = self._clock()
+        connecting = self.with_status(CONNECTING)
+        if (
+            self._last_snapshot is None
+            or now - self._last_snapshot >= self.max_poll_interval
+            or len(connecting) > self.incremental_limit
+        ):
+            changed = self.refresh()
+        else:
+            changed = sum(self.refresh_instance(name) for name in connecting)
+
+        with self._lock:
+            events, self._events_since_poll = self._events_since_poll, 0
+        if events:
+            # Events keep the registry current; polling is only a safety net.
+            self.poll_interval = self.max_poll_interval
+        elif changed:
+            self.poll_interval = max(self.min_poll_interval, self.poll_interval / 2)
+        else:
+            self.poll_interval = min(self.max_poll_interval, self.poll_interval * 2)
+        return changed
+
+    def start(self) -> None:
+        """Load the registry and keep polling it in a background thread."""
+        if self._poller is not None:
+            return
+        self.refresh()
+        self._stopping.clear()
+        self._poller = threading.Thread(target=self._poll_forever, daemon=True)
+        self._poller.start()
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stopping.set()
+        if self._poller is not None:
+            self._poller.join()
+            self._poller = None
+
+    def __enter__(self) -> "InstanceRegistry":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _poll_forever(self) -> None:
+        while not self._stopping.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Instance registry poll failed")
+
+
+def _number(owner: str) -> str:
+    return owner.split("@", 1)[0].split(":", 1)[0]
+
+
+def _discard(index: Dict[Any, Set[str]], key: Any, name: str) -> None:
+    names = index.get(key)
+    if names is not None:
+        names.discard(name)
+        if not names:
+            del index[key]
@@ -0,0 +1,36 @@
+import importlib
+from typing import Any, Optional
+
+
+class LazyResource:
+    """
+    Client attribute creating a resource on first access.
+
+    The resource module is only imported when the attribute is first read,
+    so adding resources does not slow down ``import evolutionapi`` or client
+    construction. The resource is then cached on the client instance.
+    """
+
+    def __init__(self, module: str, name: str) -> None:
+        """
+        Initialize the descriptor.
+
+        Args:
+            module: Module defining the resource class
+            name: Name of the resource class, instantiated with the client
+        """
+        self.module = module
+        self.name = name
+        self.attribute: Optional[str] = None
+
+    def __set_name__(self, owner: type, attribute: str) -> None:
+        self.attribute = attribute
+
+    def __get__(self, client: Any, owner: Optional[type] = None) -> Any:
+        if client is None:
+            return self
+        resource_class = getattr(importlib.import_module(self.module), self.name)
+        resource = resource_class(client)
+        # Shadows the descriptor, so later reads are plain attribute lookups.
+        client.__dict__[self.attribute] = resource
+        return resource
@@ -1,6 +1,18 @@
-from typing import Any, Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
 
-from evolutionapi.schemas import ProxySettings
+from evolutionapi.bulk import BulkResult, arun_concurrently, run_concurrently
+
+if TYPE_CHECKING:
+    from evolutionapi.schemas import ProxySettings
 
 
 class Instance:
@@ -44,7 +56,7 @@ class Instance:
         typebot_delay_message: Optional[int] = None,
         typebot_unknown_message: Optional[str] = None,
         typebot_listening_from_me: bool = False,
-        proxy: Optional[ProxySettings] = None,
+        proxy: Optional["ProxySettings"] = None,
         chatwoot_account_id: Optional[int] = None,
         chatwoot_token: Optional[str] = None,
         chatwoot_url: Optional[str] = None,
@@ -142,6 +154,66 @@ class Instance:
 
         return self.client._post("/instance/create", json=clean_data)
 
+    def create_many(
+        self,
+        specs: Iterable[Dict[str, Any]],
+        max_concurrency: int = 10,
+        template: Optional["InstanceTemplate"] = None,
+    ) -> Iterator[BulkResult]:
+        """
+        Create many instances in parallel over the client's connection pool.
+
+        Specs are consumed lazily and results are yielded as soon as each call
+        finishes, so very large batches never hold every response in memory.
+        Raise ``PoolConfig.pool_maxsize`` to at least ``max_concurrency`` to
+        avoid opening throwaway connections.
+
+        Args:
+            specs: Keyword arguments for `create`, one mapping per instance.
+                With a template, keyword arguments for `create_from_template`
+                (``instance_name``, ``token`` and ``number``)
+            max_concurrency: Maximum number of requests in flight
+            template: Shared settings applied to every instance
+
+        Yields:
+            A `BulkResult` per spec, in completion order. Failed calls carry the
+            raised exception (usually `EvolutionAPIError`) in ``error``.
+        """
+        return run_concurrently(
+            self._creator(template), specs, max_concurrency=max_concurrency
+        )
+
+    def _creator(self, template: Optional["InstanceTemplate"]):
+        if template is None:
+            return lambda spec: self.create(**spec)
+        return lambda spec: self.create_from_template(template, **spec)
+
+    def create_from_template(
+        self,
+        template: "InstanceTemplate",
+        instance_name: str,
+        token: Optional[str] = None,
+        number: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a new WhatsApp instance from a template.
+
+        Args:
+            template: Shared settings of the instance
+            instance_name: The name of the instance to create
+            token: Authentication token for the instance
+            number: Phone number associated with the instance
+
+        Returns:
+            Dictionary containing instance information.
+
+        Raises:
+            EvolutionAPIError: If the API returns an error
+        """
+        return self.client._post(
+            "/instance/create", json=template.build(instance_name, token, number)
+        )
+
     def fetch(self, instance_name: str) -> Dict[str, Any]:
         """
         Fetch instance information by ID.
@@ -158,3 +230,127 @@ class Instance:
         return self.client._get(
             "/instance/fetchInstances", params={"instanceName": instance_name}
         )
+
+    def iter_all(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every instance of the server.
+
+        ``/instance/fetchInstances`` is not paginated, so the response is
+        parsed incrementally and each instance is yielded as soon as it is
+        received. Memory use does not grow with the number of instances.
+
+        Yields:
+            Dictionaries containing instance information.
+
+        Raises:
+            EvolutionAPIError: If the API returns an error
+        """
+        return self.client._stream_json_array("/instance/fetchInstances")
+
+
+class AsyncInstance(Instance):
+    """
+    Resource for managing WhatsApp instances with the asynchronous client.
+
+    Every method has the same signature as in `Instance`, but returns an
+    awaitable, e.g. ``await client.instances.create(instance_name="name")``,
+    or an async iterator for methods that stream results.
+    """
+
+    def create_many(
+        self,
+        specs: Iterable[Dict[str, Any]],
+        max_concurrency: int = 10,
+        template: Optional["InstanceTemplate"] = None,
+    ) -> AsyncIterator[BulkResult]:
+        """
+        Create many instances concurrently on the running event loop.
+
+        Args:
+            specs: Keyword arguments for `create`, or for `create_from_template`
+                when a template is given, one mapping per instance
+            max_concurrency: Maximum number of requests in flight
+            template: Shared settings applied to every instance
+
+        Yields:
+            A `BulkResult` per spec, in completion order.
+        """
+        return arun_concurrently(
+            self._creator(template), specs, max_concurrency=max_concurrency
+        )
+
+
+class _PayloadRecorder:
+    """Stand-in client returning the body `Instance.create` would send."""
+
+    def _post(self, path: str, json: Dict[str, Any]) -> Dict[str, Any]:
+        return json
+
+
+class InstanceTemplate:
+    """
+    Precomputed settings shared by many instances.
+
+    The settings are converted to the API format and the proxy is validated
+    and serialized once, when the template is built. Each payload is then a
+    shallow copy of that base with the instance name, token and number set,
+    so payloads share their nested values and must not be mutated.
+    """
+
+    PER_INSTANCE = frozenset({"instance_name", "token", "number"})
+
+    def __init__(self, **settings: Any) -> None:
+        """
+        Initialize the template.
+
+        Args:
+            **settings: Any keyword argument of `Instance.create` except
+                ``instance_name``, ``token`` and ``number``. ``proxy`` may be
+                a `ProxySettings` or a dictionary of its fields
+
+        Raises:
+            TypeError: If a per-instance or unknown setting is given
+            pydantic.ValidationError: If the proxy settings are invalid
+        """
+        per_instance = self.PER_INSTANCE.intersection(settings)
+        if per_instance:
+            raise TypeError(
+                f"Per-instance settings cannot be templated: {sorted(per_instance)}"
+            )
+
+        proxy = settings.get("proxy")
+        if isinstance(proxy, dict):
+            from evolutionapi.schemas import ProxySettings
+
+            proxy = ProxySettings(**proxy)
+
+        self.settings = settings
+        base = Instance(_PayloadRecorder()).create(instance_name="", **settings)
+        del base["instanceName"]
+        if proxy is not None:
+            base["proxy"] = proxy.model_dump(mode="json", exclude_none=True)
+        self._base = base
+
+    def build(
+        self,
+        instance_name: str,
+        token: Optional[str] = None,
+        number: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the request body of an instance.
+
+        Args:
+            instance_name: The name of the instance
+            token: Authentication token for the instance
+            number: Phone number associated with the instance
+
+        Returns:
+            The body for ``/instance/create``.
+        """
+        payload = {"instanceName": instance_name, **self._base}
+        if token is not None:
+            payload["token"] = token
+        if number is not None:
+            payload["number"] = number
+        return payload
@@ -0,0 +1,341 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from evolutionapi.bulk import BulkResult, run_partitioned
+from evolutionapi.media import (
+    MEDIA_PLACEHOLDER,
+    Base64JSONBody,
+    MediaSource,
+    is_streamable,
+)
+from evolutionapi.ratelimit import InMemoryBackend, Rate
+
+# (instance name, recipient number, message) items of `Message.send_many`
+SendItem = Tuple[str, str, Dict[str, Any]]
+
+
+class Message:
+    """Resource for sending messages."""
+
+    # Message types accepted by `send_many` and the method sending them
+    SENDERS = {
+        "text": "send_text",
+        "media": "send_media",
+        "audio": "send_audio",
+        "location": "send_location",
+        "reaction": "send_reaction",
+    }
+
+    def __init__(self, client) -> None:
+        """
+        Initialize the message resource.
+
+        Args:
+            client: Evolution API client
+        """
+        self.client = client
+
+    def send_text(
+        self,
+        instance_name: str,
+        number: str,
+        text: str,
+        delay: Optional[int] = None,
+        presence: Optional[str] = None,
+        link_preview: Optional[bool] = None,
+        quoted: Optional[Dict[str, Any]] = None,
+        mentions_everyone: Optional[bool] = None,
+        mentioned: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a text message, for more information check the API documentation:
+
+        https://doc.evolution-api.com/v1/api-reference/message-controller/send-text
+
+        Args:
+            instance_name: The instance sending the message
+            number: Recipient phone number or JID
+            text: The message text
+            delay: Delay in milliseconds before sending, showing the presence
+            presence: Presence shown during the delay, e.g. "composing"
+            link_preview: Whether to generate a preview for links in the text
+            quoted: Message to reply to, with its ``key`` and ``message``
+            mentions_everyone: Whether to mention every group participant
+            mentioned: Numbers to mention
+
+        Returns:
+            Dictionary containing the sent message.
+
+        Raises:
+            EvolutionAPIError: If the API returns an error
+        """
+        data = {
+            "number": number,
+            "options": _options(
+                delay, presence, link_preview, quoted, mentions_everyone, mentioned
+            ),
+            "textMessage": {"text": text},
+        }
+        return self.client._post(f"/message/sendText/{instance_name}", json=data)
+
+    def send_media(
+        self,
+        instance_name: str,
+        number: str,
+        media: Any,
+        mediatype: str,
+        file_name: Optional[str] = None,
+        caption: Optional[str] = None,
+        delay: Optional[int] = None,
+        presence: Optional[str] = None,
+        quoted: Optional[Dict[str, Any]] = None,
+        mentions_everyone: Optional[bool] = None,
+        mentioned: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send an image, video or document, for more information check the API documentation:
+
+        https://doc.evolution-api.com/v1/api-reference/message-controller/send-media
+
+        Local files are streamed: they are read and base64-encoded chunk by
+        chunk while the request is sent, instead of being loaded in memory.
+
+        Args:
+            instance_name: The instance sending the message
+            number: Recipient phone number or JID
+            media: A URL or base64 string, or a local file to upload: a
+                `pathlib.Path`, a binary file object or a bytes-like buffer
+            mediatype: "image", "video" or "document"
+            file_name: File name shown to the recipient
+            caption: Caption of the media
+            delay: Delay in milliseconds before sending, showing the presence
+            presence: Presence shown during the delay, e.g. "composing"
+            quoted: Message to reply to, with its ``key`` and ``message``
+            mentions_everyone: Whether to mention every group participant
+            mentioned: Numbers to mention
+
+        Returns:
+            Dictionary containing the sent message.
+
+        Raises:
+            EvolutionAPIError: If the API returns an error
+        """
+        media_message = {
+            "mediatype": mediatype,
+            "fileName": file_name,
+            "caption": caption,
+            "media": media,
+        }
+        data = {
+            "number": number,
+            "options": _options(
+                delay, presence, None, quoted, mentions_everyone, mentioned
+            ),
+            "mediaMessage": {k: v for k, v in media_message.items() if v is not None},
+        }
+        return self._send_with_media(
+            f"/message/sendMedia/{instance_name}", data, data["mediaMessage"], "media"
+        )
+
+    def send_audio(
+        self,
+        instance_name: str,
+        number: str,
+        audio: Any,
+        delay: Optional[int] = None,
+        presence: Optional[str] = None,
+        encoding: bool = True,
+        quoted: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a voice note, for more information check the API documentation:
+
+        https://doc.evolution-api.com/v1/api-reference/message-controller/send-audio
+
+        Args:
+            instance_name: The instance sending the message
+            number: Recipient phone number or JID
+            audio: A URL or base64 string, or a local file to upload (see
+                `send_media`)
+            delay: Delay in milliseconds before sending, showing the presence
+            presence: Presence shown during the delay, e.g. "recording"
+            encoding: Whether the server converts the audio to a voice note
+            quoted: Message to reply to, with its ``key`` and ``message``
+
+        Returns:
+            Dictionary containing the sent message.
+
+        Raises:
+            EvolutionAPIError: If the API returns an error
+        """
+        options = _options(delay, presence, None, quoted, None, None)
+        options["encoding"] = encoding
+        data = {
+            "number": number,
+            "options": options,
+            "audioMessage": {"audio": audio},
+        }
+        return self._send_with_media(
+            f"/message/sendWhatsAppAudio/{instance_name}",
+            data,
+            data["audioMessage"],
+            "audio",
+        )
+
+    def send_location(
+        self,
+        instance_name: str,
+        number: str,
+        latitude: float,
+        longitude: float,
+        name: Optional[str] = None,
+        address: Optional[str] = None,
+        delay: Optional[int] = None,
+        presence: Optional[str] = None,
+        quoted: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a location, for more information check the API documentation:
+
+        https://doc.evolution-api.com/v1/api-reference/message-controller/send-location
+
+        Args:
+            instance_name: The instance sending the message
+            number: Recipient phone number or JID
+            latitude: Latitude of the location
+            longitude: Longitude of the location
+            name: Name of the place
+            address: Address of the place
+            delay: Delay in milliseconds before sending, showing the presence
+            presence: Presence shown during the delay, e.g. "composing"
+            quoted: Message to reply to, with its ``key`` and ``message``
+
+        Returns:
+            Dictionary containing the sent message.
+
+        Raises:
+            EvolutionAPIError: If the API returns an error
+        """
+        location = {
+            "name": name,
+            "address": address,
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+        data = {
+            "number": number,
+            "options": _options(delay, presence, None, quoted, None, None),
+            "locationMessage": {k: v for k, v in location.items() if v is not None},
+        }
+        return self.client._post(f"/message/sendLocation/{instance_name}", json=data)
+
+    def send_reaction(
+        self, instance_name: str, key: Dict[str, Any], reaction: str
+    ) -> Dict[str, Any]:
+        """
+        React to a message, for more information check the API documentation:
+
+        https://doc.evolution-api.com/v1/api-reference/message-controller/send-reaction
+
+        Args:
+            instance_name: The instance sending the reaction
+            key: Key of the message, with ``remoteJid``, ``fromMe`` and ``id``
+            reaction: The emoji, or an empty string to remove the reaction
+
+        Returns:
+            Dictionary containing the sent reaction.
+
+        Raises:
+            EvolutionAPIError: If the API returns an error
+        """
+        data = {"reactionMessage": {"key": key, "reaction": reaction}}
+        return self.client._post(f"/message/sendReaction/{instance_name}", json=data)
+
+    def send_many(
+        self,
+        items: Iterable[SendItem],
+        max_concurrency: int = 10,
+        per_instance: Optional[Rate] = None,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[BulkResult]:
+        """
+        Send many messages concurrently.
+
+        Messages to the same recipient of an instance are sent one after the
+        other, in input order; everything else is sent in parallel over the
+        client's connection pool. Items are consumed lazily and results are
+        yielded as soon as each message is sent, so arbitrarily large inputs
+        run in bounded memory.
+
+        Args:
+            items: ``(instance_name, number, message)`` tuples. ``message``
+                holds the keyword arguments of a send method, plus ``type``
+                selecting it: "text" (default), "media", "audio", "location"
+                or "reaction", e.g. ``{"text": "Hi"}`` or
+                ``{"type": "media", "media": Path("a.jpg"), "mediatype": "image"}``
+            max_concurrency: Maximum number of requests in flight
+            per_instance: Sending rate of each instance. A paced instance
+                does not hold back the others
+            max_pending: Maximum number of items read ahead of sending
+
+        Yields:
+            A `BulkResult` per item, in completion order, with the input
+            position in ``index``. Failed sends carry the raised exception
+            (usually `EvolutionAPIError`) in ``error``.
+        """
+        throttle = None
+        if per_instance is not None:
+            backend = InMemoryBackend()
+
+            def throttle(item: SendItem) -> float:
+                return backend.acquire([(f"instance:{item[0]}", per_instance)])
+
+        return run_partitioned(
+            self._send_item,
+            items,
+            partition=lambda item: (item[0], item[1]),
+            max_concurrency=max_concurrency,
+            max_pending=max_pending,
+            throttle=throttle,
+        )
+
+    def _send_item(self, item: SendItem) -> Dict[str, Any]:
+        instance_name, number, message = item
+        message = dict(message)
+        kind = message.pop("type", "text")
+        if kind not in self.SENDERS:
+            raise ValueError(f"Unknown message type: {kind!r}")
+        if kind == "reaction":
+            return self.send_reaction(instance_name, **message)
+        return getattr(self, self.SENDERS[kind])(instance_name, number, **message)
+
+    def _send_with_media(
+        self, path: str, data: Dict[str, Any], container: Dict[str, Any], field: str
+    ) -> Dict[str, Any]:
+        source: MediaSource = container[field]
+        if not is_streamable(source):
+            return self.client._post(path, json=data)
+        container[field] = MEDIA_PLACEHOLDER
+        return self.client._post(path, data=Base64JSONBody(data, source))
+
+
+def _options(
+    delay: Optional[int],
+    presence: Optional[str],
+    link_preview: Optional[bool],
+    quoted: Optional[Dict[str, Any]],
+    mentions_everyone: Optional[bool],
+    mentioned: Optional[List[str]],
+) -> Dict[str, Any]:
+    options = {
+        "delay": delay,
+        "presence": presence,
+        "linkPreview": link_preview,
+        "quoted": quoted,
+    }
+    if mentions_everyone is not None or mentioned:
+        options["mentions"] = {
+            k: v
+            for k, v in (("everyOne", mentions_everyone), ("mentioned", mentioned))
+            if v is not None
+        }
+    return {k: v for k, v in options.items() if v is not None}
@@ -0,0 +1,163 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry settings for transient failures.
+
+    Attributes:
+        max_attempts: Total attempts per request, including the first one
+        backoff_factor: Base delay in seconds, doubled on every attempt
+        max_backoff: Upper bound for a single delay. A ``Retry-After``
+            asking for a longer wait ends the retries instead
+        jitter: Randomize delays between 0 and the computed backoff
+        retry_statuses: Status codes considered transient
+        retry_methods: Idempotent methods that are always retried
+        retry_post_paths: POST paths opted in to retries, e.g.
+            ``frozenset({"/instance/create"})``
+        respect_retry_after: Wait as long as the server's ``Retry-After``,
+            up to ``max_backoff``
+        deadline: Overall time budget in seconds for a request and its
+            retries. No retry is attempted if it would exceed the budget
+    """
+
+    max_attempts: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: bool = True
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    retry_methods: FrozenSet[str] = frozenset(
+        {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+    )
+    retry_post_paths: FrozenSet[str] = frozenset()
+    respect_retry_after: bool = True
+    deadline: Optional[float] = None
+
+    def is_retryable(self, method: str, path: str) -> bool:
+        """Whether a request may be sent more than once."""
+        method = method.upper()
+        if method in self.retry_methods:
+            return True
+        return method == "POST" and path in self.retry_post_paths
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Compute the delay before the next attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+        """
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def next_delay(
+        self,
+        method: str,
+        path: str,
+        attempt: int,
+        elapsed: float,
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        """
+        Decide whether to retry a failed attempt.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to the base URL
+            attempt: Number of the attempt that just failed, starting at 1
+            elapsed: Seconds spent on the request so far
+            retry_after: ``Retry-After`` header of the failed response
+
+        Returns:
+            Seconds to wait before retrying, or None to give up.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(method, path):
+            return None
+
+        delay = self.backoff(attempt)
+        if self.respect_retry_after:
+            server_delay = parse_retry_after(retry_after)
+            if server_delay is not None:
+                # Retrying before the server asked would only be rejected
+                # again, so a longer wait than allowed ends the retries.
+                if server_delay > self.max_backoff:
+                    return None
+                delay = server_delay
+
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        return delay
+
+
+@dataclass(frozen=True)
+class RetryStats:
+    """
+    Snapshot of retry activity.
+
+    Attributes:
+        retries: Attempts sent after a failure
+        retried_requests: Requests that needed at least one retry
+        exhausted: Requests that failed after giving up on retries
+        backoff_seconds: Total time spent sleeping between attempts
+    """
+
+    retries: int = 0
+    retried_requests: int = 0
+    exhausted: int = 0
+    backoff_seconds: float = 0.0
+
+
+class RetryCounters:
+    """Thread-safe accumulator behind `RetryStats`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = RetryStats()
+
+    def record(self, retries: int, backoff_seconds: float, exhausted: bool) -> None:
+        """Record the outcome of one request that was retried."""
+        if not retries and not exhausted:
+            return
+        with self._lock:
+            stats = self._stats
+            self._stats = RetryStats(
+                retries=stats.retries + retries,
+                retried_requests=stats.retried_requests + bool(retries),
+                exhausted=stats.exhausted + exhausted,
+                backoff_seconds=stats.backoff_seconds + backoff_seconds,
+            )
+
+    def snapshot(self) -> RetryStats:
+        """Return the current totals."""
+        return self._stats
@@ -1,5 +1,6 @@
+import sys
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -30,3 +31,178 @@ class ProxySettings(BaseModel):
 
     class Config:
         use_enum_values = True
+
+
+class InstanceIntegration(BaseModel):
+    """Pydantic model for the integration settings of an instance."""
+
+    integration: Optional[str] = Field(None, description="Integration type")
+    token: Optional[str] = Field(None, description="Integration token")
+    webhook_wa_business: Optional[str] = Field(
+        None, description="WhatsApp Business webhook URL"
+    )
+
+    class Config:
+        extra = "allow"
+
+
+class InstanceInfo(BaseModel):
+    """Pydantic model for an instance returned by ``fetchInstances``."""
+
+    instance_name: str = Field(alias="instanceName", description="Instance name")
+    instance_id: Optional[str] = Field(
+        None, alias="instanceId", description="Instance identifier"
+    )
+    owner: Optional[str] = Field(None, description="WhatsApp JID of the owner")
+    profile_name: Optional[str] = Field(
+        None, alias="profileName", description="WhatsApp profile name"
+    )
+    profile_picture_url: Optional[str] = Field(
+        None, alias="profilePictureUrl", description="Profile picture URL"
+    )
+    profile_status: Optional[str] = Field(
+        None, alias="profileStatus", description="WhatsApp profile status"
+    )
+    status: Optional[str] = Field(None, description="Connection status")
+    server_url: Optional[str] = Field(
+        None, alias="serverUrl", description="URL of the Evolution API server"
+    )
+    apikey: Optional[str] = Field(None, description="Instance API key")
+    integration: Optional[InstanceIntegration] = Field(
+        None, description="Integration settings"
+    )
+
+    class Config:
+        extra = "allow"
+        populate_by_name = True
+
+
+# (attribute, payload key) pairs of `InstanceRecord`
+_INSTANCE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("instance_name", "instanceName"),
+    ("instance_id", "instanceId"),
+    ("owner", "owner"),
+    ("profile_name", "profileName"),
+    ("profile_picture_url", "profilePictureUrl"),
+    ("profile_status", "profileStatus"),
+    ("status", "status"),
+    ("server_url", "serverUrl"),
+    ("apikey", "apikey"),
+    ("integration", "integration"),
+)
+_INSTANCE_KEYS = frozenset(key for _, key in _INSTANCE_FIELDS)
+
+
+class InstanceRecord:
+    """
+    Compact read-only view of an instance returned by ``fetchInstances``.
+
+    Records keep references to the values of the decoded payload instead of
+    copying them, and use slots instead of dictionaries, so the payload can be
+    dropped once records are built. Frequently repeated values (status and
+    server URL) are interned and shared between records. Nothing is validated
+    at construction; call `validate` to check a record against `InstanceInfo`.
+    """
+
+    __slots__ = tuple(name for name, _ in _INSTANCE_FIELDS) + ("extra",)
+
+    instance_name: Optional[str]
+    instance_id: Optional[str]
+    owner: Optional[str]
+    profile_name: Optional[str]
+    profile_picture_url: Optional[str]
+    profile_status: Optional[str]
+    status: Optional[str]
+    server_url: Optional[str]
+    apikey: Optional[str]
+    integration: Optional[Dict[str, Any]]
+    extra: Optional[Dict[str, Any]]
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "InstanceRecord":
+        """
+        Build a record from a ``fetchInstances`` item.
+
+        Args:
+            payload: An item of the response, either ``{"instance": {...}}``
+                or the inner instance mapping
+
+        Returns:
+            The record, sharing its values with the payload.
+        """
+        data = payload.get("instance", payload)
+        record = cls.__new__(cls)
+        record.instance_name = data.get("instanceName")
+        record.instance_id = data.get("instanceId")
+        record.owner = data.get("owner")
+        record.profile_name = data.get("profileName")
+        record.profile_picture_url = data.get("profilePictureUrl")
+        record.profile_status = data.get("profileStatus")
+        record.status = _intern(data.get("status"))
+        record.server_url = _intern(data.get("serverUrl"))
+        record.apikey = data.get("apikey")
+        record.integration = data.get("integration")
+        record.extra = None
+        if not _INSTANCE_KEYS.issuperset(data):
+            record.extra = {
+                key: value for key, value in data.items() if key not in _INSTANCE_KEYS
+            } or None
+        return record
+
+    @classmethod
+    def from_payloads(
+        cls, payloads: Iterable[Dict[str, Any]]
+    ) -> Iterator["InstanceRecord"]:
+        """
+        Build records from ``fetchInstances`` items.
+
+        Combined with `Instance.iter_all`, records are built as the response
+        streams in and no decoded payload outlives its record.
+
+        Args:
+            payloads: Items of the response
+
+        Yields:
+            A record per item.
+        """
+        return map(cls.from_payload, payloads)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the instance in the payload format, without ``None`` values."""
+        data = {
+            key: getattr(self, name)
+            for name, key in _INSTANCE_FIELDS
+            if getattr(self, name) is not None
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def validate(self) -> InstanceInfo:
+        """
+        Validate the record.
+
+        Returns:
+            The equivalent pydantic model.
+
+        Raises:
+            pydantic.ValidationError: If the record does not match `InstanceInfo`
+        """
+        return InstanceInfo.model_validate(self.to_dict())
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, InstanceRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"InstanceRecord(instance_name={self.instance_name!r}, "
+            f"status={self.status!r})"
+        )
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
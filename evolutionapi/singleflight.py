@@ -0,0 +1,130 @@
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, Optional
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Result of an async call whose leader was cancelled
+_ABANDONED = object()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent identical calls across threads.
+
+    While a call for a key is in flight, other callers with the same key wait
+    for it and receive its result (or its exception) instead of issuing their
+    own call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._coalesced = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Number of calls that were served by another caller's request."""
+        return self._coalesced
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run ``func`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Identifies equivalent calls
+            func: Callable performing the call
+
+        Returns:
+            The result of the shared call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Deduplicate concurrent identical calls on an event loop."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future"] = {}
+        self._coalesced = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Number of calls that were served by another caller's request."""
+        return self._coalesced
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await ``func()`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Identifies equivalent calls
+            func: Coroutine function performing the call
+
+        Returns:
+            The result of the shared call.
+        """
+        # Imported here so that the sync client does not load asyncio.
+        import asyncio
+
+        waited = False
+        while key in self._calls:
+            if not waited:
+                self._coalesced += 1
+                waited = True
+            result = await asyncio.shield(self._calls[key])
+            if result is not _ABANDONED:
+                return result
+            # The caller running the call was cancelled; the first waiter to
+            # wake up runs it again.
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            # Only the leader was cancelled, not the callers waiting for it.
+            future.set_result(_ABANDONED)
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
@@ -0,0 +1,137 @@
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, List
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayParser:
+    """
+    Incremental parser yielding the items of a JSON array as bytes arrive.
+
+    Only the unparsed tail of the stream is buffered, so memory stays bounded
+    by the size of the largest item rather than by the size of the array. A
+    body that is not an array is buffered whole and returned as a single item
+    when the stream ends.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._is_array = True
+        self._done = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Add bytes to the stream.
+
+        Args:
+            chunk: Next piece of the response body
+
+        Returns:
+            The items completed by this chunk.
+        """
+        self._buffer += self._text.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Signal the end of the stream.
+
+        Returns:
+            The remaining items.
+
+        Raises:
+            ValueError: If the body is truncated or not valid JSON
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        items = self._parse(final=True)
+        if self._is_array and not self._done:
+            raise ValueError("Truncated JSON array")
+        return items
+
+    def _parse(self, final: bool) -> List[Any]:
+        if not self._started:
+            start = _skip_whitespace(self._buffer, 0)
+            if start == len(self._buffer):
+                return []
+            self._started = True
+            self._is_array = self._buffer[start] == "["
+            self._buffer = self._buffer[start + 1 if self._is_array else start :]
+
+        if not self._is_array:
+            if not final:
+                return []
+            return [json.loads(self._buffer)]
+
+        items = []
+        buffer = self._buffer
+        position = 0
+        while not self._done:
+            position = _skip_whitespace(buffer, position)
+            if position < len(buffer) and buffer[position] in ",]":
+                self._done = buffer[position] == "]"
+                position += 1
+                continue
+            if position == len(buffer):
+                break
+            try:
+                item, end = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError("Invalid JSON array") from None
+                break
+            # An item must be followed by "," or "]": a number such as "1.5e"
+            # would otherwise be cut short at a chunk boundary.
+            after = _skip_whitespace(buffer, end)
+            if after == len(buffer) or buffer[after] not in ",]":
+                if final:
+                    raise ValueError("Invalid JSON array")
+                break
+            items.append(item)
+            position = end
+
+        self._buffer = buffer[position:]
+        return items
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yield the items of a JSON array from a stream of byte chunks.
+
+    Args:
+        chunks: The response body, e.g. ``response.iter_content(65536)``
+
+    Yields:
+        Each item of the array, as soon as it is complete.
+    """
+    parser = JSONArrayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """
+    Yield the items of a JSON array from an async stream of byte chunks.
+
+    Args:
+        chunks: The response body, e.g. ``response.aiter_bytes()``
+
+    Yields:
+        Each item of the array, as soon as it is complete.
+    """
+    parser = JSONArrayParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    while position < len(text) and text[position] in _WHITESPACE:
+        position += 1
+    return position
@@ -0,0 +1,452 @@
+import json
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from evolutionapi.pool import PoolConfig, PooledHTTPAdapter, PoolStats
+
+
+class Transport(ABC):
+    """
+    Sends the HTTP requests of `EvolutionAPI`.
+
+    ``request`` takes the arguments the client passes to
+    `requests.Session.request` (``params``, ``json``, ``data``, ``headers``,
+    ``timeout`` and ``stream``) and returns a response exposing the
+    `requests.Response` attributes the client uses: ``status_code``,
+    ``headers``, ``content``, ``json()``, ``elapsed``, ``request.body``,
+    ``iter_content()`` and ``close()``. Network failures must be raised as
+    `requests.ConnectionError` or `requests.Timeout`, so that retries, the
+    circuit breaker and node ejection work with any transport.
+    """
+
+    @abstractmethod
+    def update_headers(self, headers: Mapping[str, str]) -> None:
+        """Add headers sent with every request (the client's API key...)."""
+
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Send a request.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: `requests.Session.request` arguments
+
+        Returns:
+            The response.
+        """
+
+    def stats(self) -> PoolStats:
+        """Return connection statistics."""
+        return PoolStats()
+
+    def close(self) -> None:
+        """Close the open connections."""
+
+
+class RequestsTransport(Transport):
+    """Default transport: a `requests.Session` with a `PooledHTTPAdapter`."""
+
+    def __init__(self, pool_config: Optional[PoolConfig] = None) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            pool_config: Connection pool, keep-alive and timeout settings
+        """
+        self.pool_config = pool_config or PoolConfig()
+        self.session = requests.Session()
+        self.adapter = PooledHTTPAdapter(self.pool_config)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+    def update_headers(self, headers: Mapping[str, str]) -> None:
+        self.session.headers.update(headers)
+        if not self.pool_config.keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session.request(method, url, **kwargs)
+
+    def stats(self) -> PoolStats:
+        return self.adapter.stats()
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HTTP2Transport(Transport):
+    """
+    Transport multiplexing concurrent requests over HTTP/2 connections.
+
+    With `RequestsTransport`, every request in flight holds a connection of
+    its own, so N concurrent requests need N connections. HTTP/2 runs many
+    requests as streams of a single connection; another connection is only
+    opened once the server's limit of concurrent streams is reached. This
+    keeps the connection count, and the handshakes and server-side sockets
+    that come with it, low for heavily concurrent clients (threads, `Batch`,
+    `ProcessPool` workers).
+
+    Requires httpx with HTTP/2 support (``pip install
+    python_evolution_api[http2]``). HTTP/2 is negotiated during the TLS
+    handshake, falling back to HTTP/1.1 when the server does not offer it.
+    Pass ``http1=False`` for cleartext servers speaking HTTP/2 directly
+    (h2c, "prior knowledge").
+
+    Example::
+
+        client = EvolutionAPI(url, api_key, transport=HTTP2Transport())
+    """
+
+    def __init__(
+        self,
+        pool_config: Optional[PoolConfig] = None,
+        max_connections: int = 10,
+        http1: bool = True,
+        verify: Union[bool, str] = True,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            pool_config: Keep-alive and default timeout settings. The pool
+                sizes are replaced by ``max_connections``
+            max_connections: Maximum number of connections per host
+            http1: Allow HTTP/1.1. False requires HTTP/2, also over cleartext
+            verify: Verify TLS certificates, or path to a CA bundle
+
+        Raises:
+            ImportError: If httpx or h2 is not installed
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "HTTP2Transport requires httpx. "
+                "Install it with: pip install python_evolution_api[http2]"
+            ) from None
+
+        self._httpx = httpx
+        self.pool_config = pool_config or PoolConfig()
+        self._lock = threading.Lock()
+        self._opening: Dict[Tuple[bytes, bytes, Optional[int]], threading.Lock] = {}
+        self._requests = 0
+        self._created = 0
+        self.client = httpx.Client(
+            http1=http1,
+            http2=True,
+            verify=verify,
+            timeout=_httpx_timeout(httpx, self.pool_config.timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=(
+                    max_connections if self.pool_config.keep_alive else 0
+                ),
+            ),
+        )
+
+    def update_headers(self, headers: Mapping[str, str]) -> None:
+        self.client.headers.update(headers)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Any = None,
+        json: Any = None,
+        data: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Any = None,
+        stream: bool = False,
+    ) -> "HTTPXResponse":
+        httpx = self._httpx
+        headers = dict(headers or {})
+        form = content = None
+        if isinstance(data, Mapping):
+            form = data
+        elif isinstance(data, (bytes, str)):
+            content = data
+        elif data is not None:
+            content = _bytes_chunks(data)
+            try:
+                headers.setdefault("Content-Length", str(len(data)))
+            except TypeError:
+                pass
+
+        request = self.client.build_request(
+            method,
+            url,
+            params=params,
+            json=json,
+            data=form,
+            content=content,
+            headers=headers,
+            timeout=(
+                httpx.USE_CLIENT_DEFAULT
+                if timeout is None
+                else _httpx_timeout(httpx, timeout)
+            ),
+        )
+        opening = _OpeningStream(self, request.url)
+        request.extensions["trace"] = opening
+        with self._lock:
+            self._requests += 1
+        with opening, _requests_errors():
+            response = self.client.send(request, stream=stream)
+        return HTTPXResponse(response, data if data is not None else request.content)
+
+    def _trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            with self._lock:
+                self._created += 1
+
+    def _opening_lock(self, url) -> threading.Lock:
+        origin = (url.raw_scheme, url.raw_host, url.port)
+        with self._lock:
+            lock = self._opening.get(origin)
+            if lock is None:
+                lock = self._opening[origin] = threading.Lock()
+            return lock
+
+    def stats(self) -> PoolStats:
+        """
+        Return connection statistics.
+
+        ``created`` counts the connections opened and ``reused`` the
+        requests sent over an already open connection. Connections are never
+        discarded for being over the pool size.
+        """
+        with self._lock:
+            return PoolStats(
+                created=self._created, reused=self._requests - self._created
+            )
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class _OpeningStream:
+    # httpcore does not serialize opening HTTP/2 streams: concurrent threads
+    # can be given the same stream ID or interleave their HPACK encoding, and
+    # the server then drops the connection with every stream on it. The ID is
+    # picked before any trace event, so requests hold a lock of their origin
+    # (the scope of a connection) from send() until their headers are sent.
+    # Other hosts are not held up by a slow connect, and bodies and responses
+    # still flow concurrently.
+
+    _SENT = frozenset(
+        {
+            "http2.send_request_headers.complete",
+            "http2.send_request_headers.failed",
+            "http11.send_request_headers.started",
+        }
+    )
+
+    def __init__(self, transport: HTTP2Transport, url) -> None:
+        self.transport = transport
+        self.lock = transport._opening_lock(url)
+        self.held = False
+
+    def __enter__(self) -> None:
+        self.lock.acquire()
+        self.held = True
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def __call__(self, event: str, info: Dict[str, Any]) -> None:
+        self.transport._trace(event, info)
+        if event in self._SENT:
+            self.release()
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self.lock.release()
+
+
+class _SentRequest:
+    def __init__(self, body: Any) -> None:
+        self.body = body
+
+
+class HTTPXResponse:
+    """`requests.Response`-compatible view of an `httpx.Response`."""
+
+    def __init__(self, response, body: Any = None) -> None:
+        """
+        Initialize the view.
+
+        Args:
+            response: The httpx response
+            body: Body of the request, for ``request.body``
+        """
+        self.raw = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.request = _SentRequest(body)
+
+    @property
+    def content(self) -> bytes:
+        with _requests_errors():
+            return self.raw.read()
+
+    @property
+    def text(self) -> str:
+        with _requests_errors():
+            self.raw.read()
+        return self.raw.text
+
+    @property
+    def elapsed(self) -> timedelta:
+        return self.raw.elapsed
+
+    def json(self, **kwargs) -> Any:
+        return json.loads(self.content, **kwargs)
+
+    def iter_content(self, chunk_size: Optional[int] = 1) -> Iterator[bytes]:
+        with _requests_errors():
+            yield from self.raw.iter_bytes(chunk_size)
+
+    def close(self) -> None:
+        self.raw.close()
+
+    def __enter__(self) -> "HTTPXResponse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class InMemoryTransport(Transport):
+    """
+    Transport answering requests with a function instead of a server.
+
+    Useful to test code using the client without mocking requests::
+
+        def handler(request):
+            if request.path_url == "/instance/fetchInstances?instanceName=a":
+                return 200, [{"instance": {"instanceName": "a"}}]
+            return 404, {"error": "Not Found"}
+
+        transport = InMemoryTransport(handler)
+        client = EvolutionAPI("http://test", "key", transport=transport)
+        client.instances.fetch("a")
+
+    The handler receives each request as a `requests.PreparedRequest` and
+    may raise `requests.ConnectionError` or `requests.Timeout` to simulate
+    network failures. Streamed bodies (uploads) are passed as iterables.
+    """
+
+    def __init__(self, handler: Callable[[requests.PreparedRequest], Any]) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            handler: Returns a `requests.Response`, or a ``(status, body)`` or
+                ``(status, body, headers)`` tuple. Bodies other than bytes
+                are sent as JSON
+        """
+        self.handler = handler
+        self.headers: Dict[str, str] = {}
+        self.requests: List[requests.PreparedRequest] = []
+        self._lock = threading.Lock()
+
+    def update_headers(self, headers: Mapping[str, str]) -> None:
+        self.headers.update(headers)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Any = None,
+        json: Any = None,
+        data: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        prepared = requests.Request(
+            method,
+            url,
+            params=params,
+            json=json,
+            data=data,
+            headers={**self.headers, **(headers or {})},
+        ).prepare()
+        with self._lock:
+            self.requests.append(prepared)
+
+        result = self.handler(prepared)
+        if isinstance(result, requests.Response):
+            return result
+        return _response(prepared, *result)
+
+
+def _response(
+    request: requests.PreparedRequest,
+    status: int,
+    body: Any = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    if isinstance(body, bytes):
+        response._content = body
+    else:
+        response._content = json.dumps(body).encode()
+        response.headers.setdefault("Content-Type", "application/json")
+    response._content_consumed = True
+    response.encoding = "utf-8"
+    response.request = request
+    response.url = request.url
+    response.elapsed = timedelta(0)
+    return response
+
+
+@contextmanager
+def _requests_errors() -> Iterator[None]:
+    # Raise httpx network errors as the requests exceptions the client
+    # retries on. Streamed bodies can fail long after request() returned.
+    import httpx
+
+    try:
+        yield
+    except httpx.TimeoutException as exc:
+        raise requests.Timeout(str(exc)) from exc
+    except httpx.TransportError as exc:
+        raise requests.ConnectionError(str(exc)) from exc
+
+
+def _bytes_chunks(data) -> Iterator[bytes]:
+    # httpx only sends bytes; buffers such as memoryview slices are copied
+    # one chunk at a time.
+    for chunk in data:
+        yield chunk if isinstance(chunk, bytes) else bytes(chunk)
+
+
+def _httpx_timeout(httpx, timeout: Any):
+    if timeout is None:
+        return None
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=connect)
+    return httpx.Timeout(timeout)
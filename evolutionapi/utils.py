@@ -0,0 +1,68 @@
+from typing import Any, Hashable, Mapping, Optional, Tuple
+
+
+def request_key(
+    method: str, path: str, params: Optional[Mapping[str, Any]] = None
+) -> Tuple[Hashable, ...]:
+    """
+    Build a hashable key identifying a request.
+
+    Args:
+        method: HTTP method
+        path: Request path relative to the base URL
+        params: Query string parameters
+
+    Returns:
+        A tuple usable as a dictionary key.
+    """
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return (method.upper(), path, items)
+
+
+def instance_name_from_request(
+    path: str,
+    params: Optional[Mapping[str, Any]] = None,
+    json: Optional[Any] = None,
+) -> Optional[str]:
+    """
+    Find the instance a request targets.
+
+    Evolution API identifies the instance either with an ``instanceName``
+    field (e.g. ``/instance/create``, ``/instance/fetchInstances``) or as the
+    last segment of ``/{controller}/{action}/{instance}`` paths.
+
+    Args:
+        path: Request path relative to the base URL
+        params: Query string parameters
+        json: JSON request body
+
+    Returns:
+        The instance name, or None if the request is not instance specific.
+    """
+    for source in (params, json):
+        if isinstance(source, Mapping) and source.get("instanceName"):
+            return str(source["instanceName"])
+
+    segments = path.strip("/").split("/")
+    if len(segments) >= 3 and segments[2]:
+        return segments[2]
+    return None
+
+
+def path_template(path: str) -> str:
+    """
+    Replace the instance segment of a path with a placeholder.
+
+    Used to group metrics by endpoint instead of by instance, e.g.
+    ``/instance/connect/my-instance`` becomes ``/instance/connect/{instance}``.
+
+    Args:
+        path: Request path relative to the base URL
+
+    Returns:
+        The path template.
+    """
+    segments = path.split("/")
+    if len(segments) >= 4 and segments[3]:
+        segments[3] = "{instance}"
+    return "/".join(segments)
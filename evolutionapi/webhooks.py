@@ -0,0 +1,807 @@
+import asyncio
+import contextlib
+import inspect
+import json
+import logging
+import queue
+import socket
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from socketserver import ThreadingMixIn
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+from wsgiref.simple_server import make_server as _make_wsgi_server
+
+from evolutionapi.exceptions import WebhookPayloadError
+
+logger = logging.getLogger(__name__)
+
+ALL_EVENTS = "*"
+
+
+def normalize_event(name: str) -> str:
+    """
+    Normalize an event name to the format used when configuring instances.
+
+    ``messages.upsert`` (webhook body), ``messages-upsert`` (path suffix with
+    ``webhook_by_events``) and ``MESSAGES_UPSERT`` all become
+    ``MESSAGES_UPSERT``.
+    """
+    return name.strip("/").replace(".", "_").replace("-", "_").upper()
+
+
+@dataclass(frozen=True)
+class WebhookEvent:
+    """
+    An event posted by Evolution API.
+
+    Attributes:
+        event: Normalized event name, e.g. ``MESSAGES_UPSERT``
+        instance: Name of the instance that emitted the event
+        data: Event data
+        payload: The whole decoded body
+    """
+
+    event: str
+    instance: Optional[str]
+    data: Any
+    payload: Mapping[str, Any]
+
+    @property
+    def message_id(self) -> Optional[str]:
+        """ID of the message the event is about, if any."""
+        if not isinstance(self.data, Mapping):
+            return None
+        key = self.data.get("key")
+        if isinstance(key, Mapping) and key.get("id"):
+            return key["id"]
+        return self.data.get("keyId")
+
+    @property
+    def dedup_key(self) -> Optional[Hashable]:
+        """Key identifying redeliveries of this event, None if it has no message ID."""
+        message_id = self.message_id
+        if message_id is None:
+            return None
+        return (self.event, self.instance, message_id, self.data.get("status"))
+
+
+def parse_event(
+    body: Union[bytes, str, Mapping[str, Any]], path_suffix: str = ""
+) -> WebhookEvent:
+    """
+    Parse a webhook request body.
+
+    Args:
+        body: Raw or decoded JSON body
+        path_suffix: Path after the webhook URL. With ``webhook_by_events``
+            Evolution API appends the event name to it, e.g. ``/messages-upsert``
+
+    Returns:
+        The parsed event.
+
+    Raises:
+        WebhookPayloadError: If the body is not a valid event
+    """
+    if isinstance(body, (bytes, str)):
+        try:
+            body = json.loads(body)
+        except ValueError as exc:
+            raise WebhookPayloadError(f"Invalid JSON body: {exc}") from None
+    if not isinstance(body, Mapping):
+        raise WebhookPayloadError("Webhook body must be a JSON object")
+
+    name = body.get("event") or path_suffix.strip("/")
+    if not isinstance(name, str) or not name:
+        raise WebhookPayloadError("Webhook body has no event name")
+
+    instance = body.get("instance")
+    if isinstance(instance, Mapping):
+        instance = instance.get("instanceName")
+    return WebhookEvent(
+        event=normalize_event(name),
+        instance=instance,
+        data=body.get("data"),
+        payload=body,
+    )
+
+
+class DedupWindow:
+    """Remember keys for ``ttl`` seconds to drop redelivered events."""
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        maxsize: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the window.
+
+        Args:
+            ttl: Seconds a key is remembered
+            maxsize: Maximum number of keys remembered; the oldest are
+                forgotten first
+            clock: Monotonic clock, mainly useful for testing
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._expiries: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def seen(self, key: Hashable) -> bool:
+        """
+        Check a key and remember it.
+
+        Returns:
+            Whether the key was already seen within the window.
+        """
+        with self._lock:
+            now = self._clock()
+            while self._expiries:
+                oldest, expiry = next(iter(self._expiries.items()))
+                if expiry > now:
+                    break
+                del self._expiries[oldest]
+
+            if key in self._expiries:
+                return True
+            self._expiries[key] = now + self.ttl
+            if len(self._expiries) > self.maxsize:
+                self._expiries.popitem(last=False)
+            return False
+
+    def forget(self, key: Hashable) -> None:
+        """Forget a key, so that its next delivery is not a duplicate."""
+        with self._lock:
+            self._expiries.pop(key, None)
+
+
+@dataclass(frozen=True)
+class DispatcherStats:
+    """
+    Snapshot of dispatcher activity.
+
+    Attributes:
+        received: Events submitted
+        duplicates: Events dropped by the dedup window
+        rejected: Events refused because the queue was full
+        handled: Handler calls completed, counting a batch once
+        errors: Handler calls that raised
+    """
+
+    received: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    handled: int = 0
+    errors: int = 0
+
+
+class _Batch:
+    __slots__ = ("handler", "max_size", "max_wait", "events", "started")
+
+    def __init__(self, handler: Callable, max_size: int, max_wait: float) -> None:
+        self.handler = handler
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.events: List[WebhookEvent] = []
+        self.started = 0.0
+
+    def add(self, event: WebhookEvent, now: float) -> Optional[List[WebhookEvent]]:
+        if not self.events:
+            self.started = now
+        self.events.append(event)
+        if len(self.events) >= self.max_size:
+            return self.take()
+        return None
+
+    def take_if_due(self, now: float) -> Optional[List[WebhookEvent]]:
+        if self.events and now - self.started >= self.max_wait:
+            return self.take()
+        return None
+
+    def take(self) -> List[WebhookEvent]:
+        events, self.events = self.events, []
+        return events
+
+
+class _BaseDispatcher:
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        dedup: Optional[DedupWindow],
+        on_error: Optional[Callable[[Any, BaseException], None]],
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.dedup = dedup
+        self.on_error = on_error
+        self._handlers: Dict[str, List[Callable]] = {}
+        self._batches: Dict[str, List[_Batch]] = {}
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(DispatcherStats.__dataclass_fields__, 0)
+        self._running = False
+
+    def on(self, event: str = ALL_EVENTS, handler: Optional[Callable] = None):
+        """
+        Register a handler called with each `WebhookEvent` of a type.
+
+        Can be used as a decorator: ``@dispatcher.on("MESSAGES_UPSERT")``.
+
+        Args:
+            event: Event name in any format, or ``"*"`` for every event
+            handler: Function taking a `WebhookEvent`
+        """
+        if handler is None:
+            return lambda func: self.on(event, func)
+        self._handlers.setdefault(_key(event), []).append(handler)
+        return handler
+
+    def on_batch(
+        self,
+        event: str = ALL_EVENTS,
+        handler: Optional[Callable] = None,
+        max_size: int = 100,
+        max_wait: float = 1.0,
+    ):
+        """
+        Register a handler called with lists of events of a type.
+
+        A batch is handed over once it holds ``max_size`` events or its oldest
+        event waited ``max_wait`` seconds. Can be used as a decorator.
+
+        Args:
+            event: Event name in any format, or ``"*"`` for every event
+            handler: Function taking a list of `WebhookEvent`
+            max_size: Maximum number of events per batch
+            max_wait: Maximum seconds an event waits for its batch to fill
+        """
+        if handler is None:
+            return lambda func: self.on_batch(event, func, max_size, max_wait)
+        batch = _Batch(handler, max_size, max_wait)
+        self._batches.setdefault(_key(event), []).append(batch)
+        return handler
+
+    def stats(self) -> DispatcherStats:
+        """Return a snapshot of the dispatcher counters."""
+        with self._lock:
+            return DispatcherStats(**self._counts)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def _is_duplicate(self, event: WebhookEvent) -> bool:
+        self._count("received")
+        if self.dedup is None:
+            return False
+        key = event.dedup_key
+        if key is not None and self.dedup.seen(key):
+            self._count("duplicates")
+            return True
+        return False
+
+    def _reject(self, event: WebhookEvent) -> None:
+        # The event was not queued: its redelivery must be handled.
+        self._count("rejected")
+        if self.dedup is not None and event.dedup_key is not None:
+            self.dedup.forget(event.dedup_key)
+
+    def _shard(self, event: WebhookEvent) -> int:
+        return zlib.crc32((event.instance or "").encode()) % self.workers
+
+    def _calls_for(self, event: WebhookEvent) -> List[Tuple[Callable, Any]]:
+        calls = [
+            (handler, event)
+            for key in (event.event, ALL_EVENTS)
+            for handler in self._handlers.get(key, ())
+        ]
+        now = time.monotonic()
+        with self._lock:
+            for key in (event.event, ALL_EVENTS):
+                for batch in self._batches.get(key, ()):
+                    events = batch.add(event, now)
+                    if events:
+                        calls.append((batch.handler, events))
+        return calls
+
+    def _due_batches(self, force: bool = False) -> List[Tuple[Callable, Any]]:
+        now = time.monotonic()
+        calls = []
+        with self._lock:
+            for batches in self._batches.values():
+                for batch in batches:
+                    events = batch.take() if force else batch.take_if_due(now)
+                    if events:
+                        calls.append((batch.handler, events))
+        return calls
+
+    def _flush_interval(self) -> float:
+        waits = [b.max_wait for bs in self._batches.values() for b in bs]
+        return max(min(waits) / 2, 0.01) if waits else 0.5
+
+    def _failed(self, argument: Any, exc: BaseException) -> None:
+        self._count("errors")
+        if self.on_error is not None:
+            self.on_error(argument, exc)
+        else:
+            logger.exception("Webhook handler failed", exc_info=exc)
+
+
+class WebhookDispatcher(_BaseDispatcher):
+    """
+    Dispatch webhook events to handlers on a pool of worker threads.
+
+    Events are sharded over the workers by instance name, so the events of an
+    instance are handled in the order they were received. Each worker has a
+    bounded queue: once it is full, `submit` waits up to ``put_timeout``
+    seconds and then refuses the event, and the web apps answer 503 so that
+    the sender slows down. Batch handlers may be called from several threads.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        queue_size: int = 1000,
+        dedup: Optional[DedupWindow] = None,
+        put_timeout: float = 0.0,
+        on_error: Optional[Callable[[Any, BaseException], None]] = None,
+    ) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            workers: Number of worker threads
+            queue_size: Maximum number of events queued per worker
+            dedup: Drop events whose message was already seen in this window
+            put_timeout: Seconds to wait for queue space before refusing an event
+            on_error: Called with the event (or batch) and the exception when a
+                handler raises. Errors are logged by default
+        """
+        super().__init__(workers, queue_size, dedup, on_error)
+        self.put_timeout = put_timeout
+        self._queues: List[queue.Queue] = []
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        """Start the worker threads. Called automatically by `submit`."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._stopping.clear()
+            self._queues = [queue.Queue(self.queue_size) for _ in range(self.workers)]
+            self._threads = [
+                threading.Thread(target=self._work, args=(q,), daemon=True)
+                for q in self._queues
+            ]
+            self._threads.append(threading.Thread(target=self._flush, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Handle the queued events, flush pending batches and stop the workers."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        for q in self._queues:
+            q.put(None)
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join()
+        self._run(self._due_batches(force=True))
+
+    def __enter__(self) -> "WebhookDispatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def submit(self, event: WebhookEvent) -> bool:
+        """
+        Queue an event for its handlers.
+
+        Returns:
+            False if the event was refused because the queue is full, True
+            otherwise (including dropped duplicates).
+        """
+        if not self._running:
+            self.start()
+        if self._is_duplicate(event):
+            return True
+        try:
+            self._queues[self._shard(event)].put(
+                event, block=self.put_timeout > 0, timeout=self.put_timeout or None
+            )
+        except queue.Full:
+            self._reject(event)
+            return False
+        return True
+
+    def _work(self, events: queue.Queue) -> None:
+        while True:
+            event = events.get()
+            if event is None:
+                return
+            self._run(self._calls_for(event))
+
+    def _flush(self) -> None:
+        while not self._stopping.wait(self._flush_interval()):
+            self._run(self._due_batches())
+
+    def _run(self, calls: List[Tuple[Callable, Any]]) -> None:
+        for handler, argument in calls:
+            try:
+                handler(argument)
+            except Exception as exc:
+                self._failed(argument, exc)
+            else:
+                self._count("handled")
+
+
+class AsyncWebhookDispatcher(_BaseDispatcher):
+    """
+    Dispatch webhook events to handlers on asyncio worker tasks.
+
+    Handlers may be coroutine functions or plain functions. Events of an
+    instance are handled in order, and each worker has a bounded queue: once
+    it is full, `submit` waits up to ``put_timeout`` seconds and then refuses
+    the event.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        queue_size: int = 1000,
+        dedup: Optional[DedupWindow] = None,
+        put_timeout: float = 0.0,
+        on_error: Optional[Callable[[Any, BaseException], None]] = None,
+    ) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            workers: Number of worker tasks
+            queue_size: Maximum number of events queued per worker
+            dedup: Drop events whose message was already seen in this window
+            put_timeout: Seconds to wait for queue space before refusing an event
+            on_error: Called with the event (or batch) and the exception when a
+                handler raises. Errors are logged by default
+        """
+        super().__init__(workers, queue_size, dedup, on_error)
+        self.put_timeout = put_timeout
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the worker tasks on the running loop. Called by `submit`."""
+        if self._running:
+            return
+        self._running = True
+        self._queues = [asyncio.Queue(self.queue_size) for _ in range(self.workers)]
+        self._tasks = [asyncio.create_task(self._work(q)) for q in self._queues]
+        self._flusher = asyncio.create_task(self._flush())
+
+    async def stop(self) -> None:
+        """Handle the queued events, flush pending batches and stop the workers."""
+        if not self._running:
+            return
+        self._running = False
+        for q in self._queues:
+            await q.put(None)
+        await asyncio.gather(*self._tasks)
+        self._flusher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._flusher
+        await self._run(self._due_batches(force=True))
+
+    async def __aenter__(self) -> "AsyncWebhookDispatcher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def submit(self, event: WebhookEvent) -> bool:
+        """
+        Queue an event for its handlers.
+
+        Returns:
+            False if the event was refused because the queue is full, True
+            otherwise (including dropped duplicates).
+        """
+        if not self._running:
+            await self.start()
+        if self._is_duplicate(event):
+            return True
+        events = self._queues[self._shard(event)]
+        try:
+            if self.put_timeout > 0:
+                await asyncio.wait_for(events.put(event), self.put_timeout)
+            else:
+                events.put_nowait(event)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            self._reject(event)
+            return False
+        return True
+
+    async def _work(self, events: asyncio.Queue) -> None:
+        while True:
+            event = await events.get()
+            if event is None:
+                return
+            await self._run(self._calls_for(event))
+
+    async def _flush(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval())
+            await self._run(self._due_batches())
+
+    async def _run(self, calls: List[Tuple[Callable, Any]]) -> None:
+        for handler, argument in calls:
+            try:
+                result = handler(argument)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as exc:
+                self._failed(argument, exc)
+            else:
+                self._count("handled")
+
+
+Verifier = Callable[[WebhookEvent], bool]
+
+
+def _accept_status(
+    body: bytes, path_suffix: str, verify: Optional[Verifier]
+) -> Tuple[Optional[WebhookEvent], int, Dict[str, str]]:
+    try:
+        event = parse_event(body, path_suffix)
+    except WebhookPayloadError as exc:
+        return None, 400, {"error": str(exc)}
+    if verify is not None and not verify(event):
+        return None, 401, {"error": "Unauthorized"}
+    return event, 200, {"status": "accepted"}
+
+
+def _reply(
+    status: int, body: Dict[str, str]
+) -> Tuple[str, List[Tuple[str, str]], bytes]:
+    reasons = {
+        200: "OK",
+        400: "Bad Request",
+        401: "Unauthorized",
+        404: "Not Found",
+        405: "Method Not Allowed",
+        413: "Payload Too Large",
+        503: "Service Unavailable",
+    }
+    content = json.dumps(body).encode()
+    headers = [
+        ("Content-Type", "application/json"),
+        ("Content-Length", str(len(content))),
+    ]
+    if status == 503:
+        headers.append(("Retry-After", "1"))
+    return f"{status} {reasons[status]}", headers, content
+
+
+class _AppBase:
+    def __init__(
+        self, path: str, verify: Optional[Verifier], max_body_size: int
+    ) -> None:
+        self.path = "/" + path.strip("/")
+        self.verify = verify
+        self.max_body_size = max_body_size
+
+    def _route(self, method: str, path: str) -> Tuple[Optional[str], int]:
+        if path.rstrip("/") != self.path.rstrip("/") and not path.startswith(
+            self.path.rstrip("/") + "/"
+        ):
+            return None, 404
+        if method != "POST":
+            return None, 405
+        return path[len(self.path.rstrip("/")) :], 200
+
+
+class WebhookApp(_AppBase):
+    """WSGI application receiving Evolution API webhooks."""
+
+    def __init__(
+        self,
+        dispatcher: WebhookDispatcher,
+        path: str = "/webhook",
+        verify: Optional[Verifier] = None,
+        max_body_size: int = 10 * 1024 * 1024,
+    ) -> None:
+        """
+        Initialize the application.
+
+        Args:
+            dispatcher: Dispatcher receiving the parsed events
+            path: Path of the webhook URL. Sub-paths are accepted, as
+                ``webhook_by_events`` appends the event name to the URL
+            verify: Called with each event; returning False answers 401, e.g.
+                to check the ``apikey`` field of the payload
+            max_body_size: Larger bodies are refused with 413
+        """
+        super().__init__(path, verify, max_body_size)
+        self.dispatcher = dispatcher
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable):
+        suffix, status = self._route(
+            environ["REQUEST_METHOD"], environ.get("PATH_INFO", "")
+        )
+        body: Dict[str, str] = {
+            "error": "Not Found" if status == 404 else "Method Not Allowed"
+        }
+        if suffix is not None:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            if length > self.max_body_size:
+                status, body = 413, {"error": "Payload Too Large"}
+            else:
+                data = environ["wsgi.input"].read(length)
+                event, status, body = _accept_status(data, suffix, self.verify)
+                if event is not None and not self.dispatcher.submit(event):
+                    status, body = 503, {"error": "Queue full"}
+
+        status_line, headers, content = _reply(status, body)
+        start_response(status_line, headers)
+        return [content]
+
+
+class AsgiWebhookApp(_AppBase):
+    """
+    ASGI application receiving Evolution API webhooks.
+
+    Starts and stops the dispatcher on the ASGI lifespan events, or on the
+    first request when the server does not send them.
+    """
+
+    def __init__(
+        self,
+        dispatcher: AsyncWebhookDispatcher,
+        path: str = "/webhook",
+        verify: Optional[Verifier] = None,
+        max_body_size: int = 10 * 1024 * 1024,
+    ) -> None:
+        """
+        Initialize the application.
+
+        Args:
+            dispatcher: Dispatcher receiving the parsed events
+            path: Path of the webhook URL. Sub-paths are accepted, as
+                ``webhook_by_events`` appends the event name to the URL
+            verify: Called with each event; returning False answers 401
+            max_body_size: Larger bodies are refused with 413
+        """
+        super().__init__(path, verify, max_body_size)
+        self.dispatcher = dispatcher
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        suffix, status = self._route(scope["method"], scope["path"])
+        body: Dict[str, str] = {
+            "error": "Not Found" if status == 404 else "Method Not Allowed"
+        }
+        if suffix is not None:
+            data = await self._read_body(receive)
+            if data is None:
+                status, body = 413, {"error": "Payload Too Large"}
+            else:
+                event, status, body = _accept_status(data, suffix, self.verify)
+                if event is not None and not await self.dispatcher.submit(event):
+                    status, body = 503, {"error": "Queue full"}
+
+        status_line, headers, content = _reply(status, body)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": int(status_line.split()[0]),
+                "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
+
+    async def _read_body(self, receive) -> Optional[bytes]:
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.dispatcher.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.dispatcher.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    # wsgiref closes the connection after each request, so Evolution API
+    # opens a new one per event; a short listen backlog would reset them.
+    request_queue_size = 1024
+
+    def get_request(self):
+        connection, address = super().get_request()
+        # Headers and body are written separately; without this, Nagle's
+        # algorithm holds the body until the client acknowledges the headers.
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection, address
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def make_server(
+    dispatcher: WebhookDispatcher,
+    host: str = "0.0.0.0",
+    port: int = 8080,
+    path: str = "/webhook",
+    verify: Optional[Verifier] = None,
+) -> WSGIServer:
+    """
+    Create a standalone threaded webhook server.
+
+    Call ``serve_forever()`` on the result to run it, and ``shutdown()`` then
+    ``dispatcher.stop()`` to stop it.
+
+    Args:
+        dispatcher: Dispatcher receiving the parsed events
+        host: Interface to bind
+        port: Port to bind, 0 picks a free one
+        path: Path of the webhook URL
+        verify: Called with each event; returning False answers 401
+
+    Returns:
+        The server, already bound.
+    """
+    return _make_wsgi_server(
+        host,
+        port,
+        WebhookApp(dispatcher, path=path, verify=verify),
+        server_class=_ThreadingWSGIServer,
+        handler_class=_QuietHandler,
+    )
+
+
+def _key(event: str) -> str:
+    return event if event == ALL_EVENTS else normalize_event(event)
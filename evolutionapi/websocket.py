@@ -0,0 +1,343 @@
+import asyncio
+import contextlib
+import inspect
+import json
+import logging
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+try:
+    import websockets
+    from websockets.asyncio.client import connect as _ws_connect
+except ImportError:  # pragma: no cover - optional dependency
+    websockets = None
+    _ws_connect = None
+
+from evolutionapi.retry import RetryPolicy
+from evolutionapi.webhooks import ALL_EVENTS, WebhookEvent, normalize_event, parse_event
+
+logger = logging.getLogger(__name__)
+
+# Engine.IO / Socket.IO v4 packet types
+_EIO_OPEN, _EIO_CLOSE, _EIO_PING, _EIO_PONG, _EIO_MESSAGE = "0", "1", "2", "3", "4"
+_SIO_CONNECT, _SIO_DISCONNECT, _SIO_EVENT, _SIO_CONNECT_ERROR = "0", "1", "2", "4"
+
+_CLOSED = object()
+
+_CONNECTION_ERRORS: Tuple[type, ...] = (OSError, asyncio.TimeoutError)
+if websockets is not None:
+    _CONNECTION_ERRORS += (websockets.ConnectionClosed, websockets.InvalidHandshake)
+
+
+class StreamConnectError(Exception):
+    """Error raised when the server refuses to open the event stream."""
+
+
+@dataclass(frozen=True)
+class StreamStats:
+    """
+    Snapshot of an event stream.
+
+    Attributes:
+        connects: Successful connections, including reconnects
+        received: Events received from the server
+        dropped: Events dropped because the buffer was full
+        recovered: Reconnects where the server replayed the missed events
+    """
+
+    connects: int = 0
+    received: int = 0
+    dropped: int = 0
+    recovered: int = 0
+
+
+class EventStream:
+    """
+    Consume the Socket.IO event stream of Evolution API.
+
+    Events are read by a background task into a bounded buffer and exposed as
+    an async iterator of `WebhookEvent`, or dispatched to callbacks with
+    `run`. When the buffer is full, the reader either waits, which stops
+    reading from the socket and pushes back on the server, or drops the
+    oldest event (``overflow="drop_oldest"``). A consumer blocked for longer
+    than the server's ping timeout gets disconnected and reconnected.
+
+    Lost connections are reopened with exponential backoff. If the server
+    has Socket.IO connection state recovery enabled, missed events are
+    replayed after a reconnect; otherwise events emitted while disconnected
+    are lost.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        instance_name: Optional[str] = None,
+        api_key: Optional[str] = None,
+        events: Optional[Iterable[str]] = None,
+        queue_size: int = 1000,
+        overflow: str = "block",
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        max_reconnects: Optional[int] = None,
+        connect: Optional[Callable] = None,
+    ) -> None:
+        """
+        Initialize the stream.
+
+        Args:
+            base_url: Base URL of the Evolution API server
+            instance_name: Instance whose events to receive. None connects to
+                the global namespace, used when the server emits every event
+                globally
+            api_key: API key sent as the ``apikey`` query parameter
+            events: Event names to keep, in any format. Defaults to all
+            queue_size: Maximum number of buffered events
+            overflow: ``"block"`` to stop reading while the buffer is full, or
+                ``"drop_oldest"`` to make room by dropping the oldest event
+            reconnect_delay: Base delay before reconnecting, doubled after
+                every failed attempt
+            max_reconnect_delay: Upper bound of the reconnect delay
+            max_reconnects: Consecutive failed attempts before giving up and
+                raising from the iterator. Retries forever by default
+            connect: Websocket connect function, mainly useful for testing
+
+        Raises:
+            ImportError: If websockets is not installed
+        """
+        if connect is None and _ws_connect is None:
+            raise ImportError(
+                "EventStream requires websockets. "
+                "Install it with: pip install python_evolution_api[websocket]"
+            )
+        if overflow not in ("block", "drop_oldest"):
+            raise ValueError("overflow must be 'block' or 'drop_oldest'")
+
+        self.base_url = base_url.rstrip("/")
+        self.namespace = f"/{instance_name}" if instance_name else "/"
+        self.api_key = api_key
+        self.events: Optional[Set[str]] = (
+            {normalize_event(event) for event in events} if events else None
+        )
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.max_reconnects = max_reconnects
+        self._backoff = RetryPolicy(
+            backoff_factor=reconnect_delay, max_backoff=max_reconnect_delay
+        )
+        # Events carrying base64 media exceed the 1 MiB default frame limit.
+        self._connect = connect or partial(_ws_connect, max_size=64 * 1024 * 1024)
+        self._handlers: Dict[str, List[Callable]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._closed = False
+        self._pid: Optional[str] = None
+        self._offset: Optional[str] = None
+        self._counts = dict.fromkeys(StreamStats.__dataclass_fields__, 0)
+
+    @property
+    def url(self) -> str:
+        """Websocket URL of the Socket.IO endpoint."""
+        scheme, netloc, path, _, _ = urlsplit(self.base_url)
+        scheme = {"http": "ws", "https": "wss"}.get(scheme, scheme)
+        query = {"EIO": "4", "transport": "websocket"}
+        if self.api_key:
+            query["apikey"] = self.api_key
+        return urlunsplit((scheme, netloc, f"{path}/socket.io/", urlencode(query), ""))
+
+    def stats(self) -> StreamStats:
+        """Return a snapshot of the stream counters."""
+        return StreamStats(**self._counts)
+
+    def on(self, event: str = ALL_EVENTS, handler: Optional[Callable] = None):
+        """
+        Register a callback for `run`.
+
+        Can be used as a decorator: ``@stream.on("CONNECTION_UPDATE")``.
+
+        Args:
+            event: Event name in any format, or ``"*"`` for every event
+            handler: Function or coroutine function taking a `WebhookEvent`
+        """
+        if handler is None:
+            return lambda func: self.on(event, func)
+        key = event if event == ALL_EVENTS else normalize_event(event)
+        self._handlers.setdefault(key, []).append(handler)
+        return handler
+
+    async def start(self) -> None:
+        """Start reading events. Called automatically on first iteration."""
+        if self._reader is None:
+            self._queue = asyncio.Queue(self.queue_size)
+            self._reader = asyncio.create_task(self._read_forever())
+
+    async def close(self) -> None:
+        """Disconnect and stop the iteration."""
+        self._closed = True
+        if self._reader is not None:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+
+    async def run(self) -> None:
+        """Dispatch events to the registered callbacks until the stream closes."""
+        async for event in self:
+            for key in (event.event, ALL_EVENTS):
+                for handler in self._handlers.get(key, ()):
+                    result = handler(event)
+                    if inspect.isawaitable(result):
+                        await result
+
+    async def __aenter__(self) -> "EventStream":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def __aiter__(self) -> "EventStream":
+        return self
+
+    async def __anext__(self) -> WebhookEvent:
+        if self._closed and (self._queue is None or self._queue.empty()):
+            raise StopAsyncIteration
+        await self.start()
+        item = await self._queue.get()
+        if item is _CLOSED:
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    async def _read_forever(self) -> None:
+        failures = 0
+        try:
+            while not self._closed:
+                try:
+                    async with self._connect(self.url) as socket:
+                        ping_timeout = await self._handshake(socket)
+                        failures = 0
+                        await self._read(socket, ping_timeout)
+                except StreamConnectError as exc:
+                    error: BaseException = exc
+                    failures += 1
+                except _CONNECTION_ERRORS as exc:
+                    error = exc
+                    failures += 1
+                else:
+                    error = ConnectionError("Event stream closed by the server")
+
+                if self.max_reconnects is not None and failures > self.max_reconnects:
+                    await self._queue.put(error)
+                    self._closed = True
+                    return
+                logger.debug("Event stream disconnected: %s", error)
+                await asyncio.sleep(self._backoff.backoff(max(failures, 1)))
+        finally:
+            with contextlib.suppress(asyncio.QueueFull):
+                self._queue.put_nowait(_CLOSED)
+
+    async def _handshake(self, socket) -> Optional[float]:
+        kind, data = _decode_engine(await socket.recv())
+        if kind != _EIO_OPEN:
+            raise StreamConnectError(f"Unexpected Engine.IO packet: {kind!r}")
+        handshake = json.loads(data)
+        ping_timeout = None
+        if "pingInterval" in handshake:
+            ping_timeout = (
+                handshake["pingInterval"] + handshake.get("pingTimeout", 20000)
+            ) / 1000
+
+        auth = {}
+        if self._pid is not None:
+            auth = {"pid": self._pid, "offset": self._offset}
+        await socket.send(_encode_connect(self.namespace, auth))
+
+        while True:
+            kind, data = _decode_engine(
+                await asyncio.wait_for(socket.recv(), ping_timeout)
+            )
+            if kind == _EIO_PING:
+                await socket.send(_EIO_PONG)
+                continue
+            if kind != _EIO_MESSAGE:
+                continue
+            packet, namespace, payload = _decode_socketio(data)
+            if namespace != self.namespace:
+                continue
+            if packet == _SIO_CONNECT_ERROR:
+                raise StreamConnectError(_error_message(payload))
+            if packet == _SIO_CONNECT:
+                self._counts["connects"] += 1
+                pid = payload.get("pid") if isinstance(payload, dict) else None
+                if pid is not None and pid == self._pid:
+                    self._counts["recovered"] += 1
+                elif pid is None:
+                    self._offset = None
+                self._pid = pid
+                return ping_timeout
+
+    async def _read(self, socket, ping_timeout: Optional[float]) -> None:
+        while not self._closed:
+            kind, data = _decode_engine(
+                await asyncio.wait_for(socket.recv(), ping_timeout)
+            )
+            if kind == _EIO_PING:
+                await socket.send(_EIO_PONG)
+            elif kind == _EIO_CLOSE:
+                return
+            elif kind == _EIO_MESSAGE:
+                packet, namespace, payload = _decode_socketio(data)
+                if namespace != self.namespace:
+                    continue
+                if packet == _SIO_DISCONNECT:
+                    return
+                if packet == _SIO_EVENT and isinstance(payload, list) and payload:
+                    await self._received(payload)
+
+    async def _received(self, args: List[Any]) -> None:
+        # With connection state recovery, the server appends the offset.
+        if self._pid is not None and len(args) > 2:
+            self._offset = args[-1]
+            args = args[:-1]
+        self._counts["received"] += 1
+
+        name, body = args[0], args[1] if len(args) > 1 else None
+        event = parse_event(body if isinstance(body, dict) else {"data": body}, name)
+        if self.events is not None and event.event not in self.events:
+            return
+
+        if self.overflow == "drop_oldest" and self._queue.full():
+            self._queue.get_nowait()
+            self._counts["dropped"] += 1
+        await self._queue.put(event)
+
+
+def _decode_engine(message: Any) -> Tuple[str, str]:
+    if isinstance(message, bytes):
+        message = message.decode()
+    return message[:1], message[1:]
+
+
+def _decode_socketio(data: str) -> Tuple[str, str, Any]:
+    packet, rest = data[:1], data[1:]
+    namespace = "/"
+    if rest.startswith("/"):
+        namespace, _, rest = rest.partition(",")
+    rest = rest.lstrip("0123456789")  # acknowledgement id
+    payload = json.loads(rest) if rest else None
+    return packet, namespace, payload
+
+
+def _encode_connect(namespace: str, auth: Dict[str, Any]) -> str:
+    prefix = f"{_EIO_MESSAGE}{_SIO_CONNECT}"
+    if namespace != "/":
+        prefix += f"{namespace},"
+    return prefix + (json.dumps(auth) if auth else "")
+
+
+def _error_message(payload: Any) -> str:
+    if isinstance(payload, dict):
+        return str(payload.get("message", payload))
+    return str(payload)
@@ -1,3 +1,5 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock
 
 import pytest
@@ -43,3 +45,58 @@ def instance_error_response() -> dict:
             "message": ['This name "instance-example-name" is already in use.']
         },
     }
+
+
+class FakeClock:
+    """Manually advanced clock, also usable as the ``sleep`` function."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """A `FakeClock` starting at zero."""
+    return FakeClock()
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    """Answers every GET with ``{"status": "ok"}``."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        body = b'{"status": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def handler():
+    """Request handler of the `base_url` server, overridden by test modules."""
+    return JSONHandler
+
+
+@pytest.fixture
+def base_url(handler):
+    """URL of a local HTTP/1.1 server answering requests with ``handler``."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    ).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
@@ -1,7 +1,7 @@
 import pytest
 
 from evolutionapi.exceptions import EvolutionAPIError
-from evolutionapi.resources.instances import Instance
+from evolutionapi.resources.instances import Instance, InstanceTemplate
 from evolutionapi.schemas import ProxySettings
 
 
@@ -240,3 +240,115 @@ class TestFetchInstance:
 
         assert "Network error" in str(excinfo.value)
         mock_client._get.assert_called_once()
+
+
+class TestCreateManyInstances:
+    def test_create_many(self, mock_client, instance_success_response) -> None:
+        def post(path, json):
+            if json["instanceName"] == "taken":
+                raise EvolutionAPIError(status_code=403, error_message="Forbidden")
+            return instance_success_response
+
+        mock_client._post.side_effect = post
+        instance = Instance(mock_client)
+        specs = [
+            {"instance_name": "first"},
+            {"instance_name": "taken"},
+            {"instance_name": "second", "webhook": "https://webhook.example.com"},
+        ]
+
+        results = sorted(
+            instance.create_many(specs, max_concurrency=2), key=lambda r: r.index
+        )
+
+        assert mock_client._post.call_count == 3
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[0].result == instance_success_response
+        assert results[1].error.status_code == 403
+        assert results[2].item == specs[2]
+
+
+class TestIterAllInstances:
+    def test_iter_all(self, mock_client, instance_success_response) -> None:
+        mock_client._stream_json_array.return_value = iter(
+            [instance_success_response, instance_success_response]
+        )
+        instance = Instance(mock_client)
+
+        result = list(instance.iter_all())
+
+        mock_client._stream_json_array.assert_called_once_with(
+            "/instance/fetchInstances"
+        )
+        assert result == [instance_success_response, instance_success_response]
+
+
+class TestInstanceTemplate:
+    def test_matches_create_payload(self, mock_client) -> None:
+        """Test that templated payloads match the ones built by create."""
+        settings = {
+            "webhook": "https://webhook.example.com",
+            "events": ["MESSAGES_UPSERT"],
+            "chatwoot_account_id": 1,
+            "typebot_url": "https://typebot.example.com",
+        }
+        instance = Instance(mock_client)
+
+        instance.create(instance_name="teste-docs", number="5511999999999", **settings)
+        expected = mock_client._post.call_args.kwargs["json"]
+
+        template = InstanceTemplate(**settings)
+        assert template.build("teste-docs", number="5511999999999") == expected
+
+    def test_serializes_proxy_once(self) -> None:
+        template = InstanceTemplate(
+            proxy={"host": "proxy.example.com", "port": "3128", "protocol": "socks5"}
+        )
+
+        payload = template.build("teste-docs")
+
+        assert payload["proxy"] == {
+            "host": "proxy.example.com",
+            "port": "3128",
+            "protocol": "socks5",
+        }
+        assert payload["proxy"] is template.build("other")["proxy"]
+
+    def test_rejects_per_instance_settings(self) -> None:
+        with pytest.raises(TypeError, match="instance_name"):
+            InstanceTemplate(instance_name="teste-docs")
+
+    def test_rejects_unknown_settings(self) -> None:
+        with pytest.raises(TypeError):
+            InstanceTemplate(unknown=True)
+
+    def test_create_from_template(self, mock_client, instance_success_response):
+        mock_client._post.return_value = instance_success_response
+        template = InstanceTemplate(webhook="https://webhook.example.com")
+        instance = Instance(mock_client)
+
+        result = instance.create_from_template(template, "teste-docs", token="abc")
+
+        payload = mock_client._post.call_args.kwargs["json"]
+        assert result == instance_success_response
+        assert payload["instanceName"] == "teste-docs"
+        assert payload["token"] == "abc"
+        assert payload["webhook"] == "https://webhook.example.com"
+
+    def test_create_many_with_template(self, mock_client) -> None:
+        mock_client._post.side_effect = lambda path, json: json
+        template = InstanceTemplate(webhook="https://webhook.example.com")
+        instance = Instance(mock_client)
+
+        results = list(
+            instance.create_many(
+                [{"instance_name": "first"}, {"instance_name": "second"}],
+                template=template,
+            )
+        )
+
+        names = sorted(result.result["instanceName"] for result in results)
+        assert names == ["first", "second"]
+        assert all(
+            r.result["webhook"] == "https://webhook.example.com" for r in results
+        )
@@ -0,0 +1,215 @@
+import base64
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.ratelimit import Rate
+from evolutionapi.resources.messages import Message
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Replies with the decoded JSON body and the request headers."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers["Content-Length"])
+        received = json.loads(self.rfile.read(length))
+        body = json.dumps({"path": self.path, "received": received}).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def handler():
+    return EchoHandler
+
+
+class TestSendMessages:
+    def test_send_text(self, mock_client):
+        messages = Message(mock_client)
+
+        messages.send_text(
+            "teste-docs", "5511999999999", "Hello", delay=1200, presence="composing"
+        )
+
+        mock_client._post.assert_called_once_with(
+            "/message/sendText/teste-docs",
+            json={
+                "number": "5511999999999",
+                "options": {"delay": 1200, "presence": "composing"},
+                "textMessage": {"text": "Hello"},
+            },
+        )
+
+    def test_send_text_with_mentions(self, mock_client):
+        Message(mock_client).send_text(
+            "teste-docs", "123@g.us", "Hi all", mentions_everyone=True
+        )
+
+        data = mock_client._post.call_args.kwargs["json"]
+        assert data["options"] == {"mentions": {"everyOne": True}}
+
+    def test_send_media_url(self, mock_client):
+        Message(mock_client).send_media(
+            "teste-docs",
+            "5511999999999",
+            "https://example.com/a.jpg",
+            "image",
+            caption="Look",
+        )
+
+        mock_client._post.assert_called_once_with(
+            "/message/sendMedia/teste-docs",
+            json={
+                "number": "5511999999999",
+                "options": {},
+                "mediaMessage": {
+                    "mediatype": "image",
+                    "caption": "Look",
+                    "media": "https://example.com/a.jpg",
+                },
+            },
+        )
+
+    def test_send_location_and_reaction(self, mock_client):
+        messages = Message(mock_client)
+        key = {"remoteJid": "5511999999999@s.whatsapp.net", "fromMe": True, "id": "X"}
+
+        messages.send_location("teste-docs", "5511999999999", -23.5, -46.6, name="SP")
+        messages.send_reaction("teste-docs", key, "🚀")
+
+        location, reaction = mock_client._post.call_args_list
+        assert location.args[0] == "/message/sendLocation/teste-docs"
+        assert location.kwargs["json"]["locationMessage"] == {
+            "name": "SP",
+            "latitude": -23.5,
+            "longitude": -46.6,
+        }
+        assert reaction.kwargs["json"] == {
+            "reactionMessage": {"key": key, "reaction": "🚀"}
+        }
+
+    def test_registered_on_client(self):
+        client = EvolutionAPI("http://localhost", "key")
+        assert isinstance(client.messages, Message)
+
+
+class TestStreamedMedia:
+    def test_file_is_streamed_as_base64(self, base_url, tmp_path):
+        """A local file is embedded in the JSON body without loading it first."""
+        content = bytes(range(256)) * 1000 + b"end"
+        path = tmp_path / "video.mp4"
+        path.write_bytes(content)
+        client = EvolutionAPI(base_url, "key")
+
+        response = client.messages.send_media(
+            "teste-docs", "5511999999999", path, "video", file_name="video.mp4"
+        )
+
+        assert response["path"] == "/message/sendMedia/teste-docs"
+        media = response["received"]["mediaMessage"]
+        assert media["fileName"] == "video.mp4"
+        assert base64.b64decode(media["media"]) == content
+
+    def test_audio_from_file_object(self, base_url):
+        client = EvolutionAPI(base_url, "key")
+        audio = io.BytesIO(b"\x00\x01ogg-data" * 100)
+
+        response = client.messages.send_audio("teste-docs", "5511999999999", audio)
+
+        received = response["received"]
+        assert received["options"] == {"encoding": True}
+        assert base64.b64decode(received["audioMessage"]["audio"]) == audio.getvalue()
+
+
+class TestSendMany:
+    def test_per_recipient_order(self, mock_client):
+        sent = []
+        lock = threading.Lock()
+
+        def post(path, json):
+            time.sleep(0.001)
+            with lock:
+                sent.append((path, json["number"], json["textMessage"]["text"]))
+            return {"key": {"id": json["textMessage"]["text"]}}
+
+        mock_client._post.side_effect = post
+        items = [
+            (instance, number, {"text": f"{number}-{n}"})
+            for n in range(5)
+            for instance in ("i1", "i2")
+            for number in ("111", "222")
+        ]
+
+        results = list(Message(mock_client).send_many(items, max_concurrency=4))
+
+        assert len(results) == 20
+        assert all(result.ok for result in results)
+        for instance in ("i1", "i2"):
+            for number in ("111", "222"):
+                texts = [
+                    text
+                    for path, num, text in sent
+                    if path.endswith(instance) and num == number
+                ]
+                assert texts == [f"{number}-{n}" for n in range(5)]
+
+    def test_message_types_and_errors(self, mock_client):
+        mock_client._post.side_effect = [
+            {"ok": 1},
+            EvolutionAPIError(400, "Bad Request"),
+        ]
+        items = [
+            ("i1", "111", {"type": "location", "latitude": 1.0, "longitude": 2.0}),
+            ("i1", "111", {"text": "hi"}),
+            ("i1", "111", {"type": "sticker"}),
+        ]
+
+        results = sorted(
+            Message(mock_client).send_many(items, max_concurrency=1),
+            key=lambda result: result.index,
+        )
+
+        assert results[0].ok
+        assert isinstance(results[1].error, EvolutionAPIError)
+        assert isinstance(results[2].error, ValueError)
+        assert mock_client._post.call_args_list[0].args[0] == (
+            "/message/sendLocation/i1"
+        )
+
+    def test_per_instance_pacing(self, mock_client):
+        """Each instance is paced separately, so paced instances overlap."""
+        times = {"i1": [], "i2": []}
+
+        def post(path, json):
+            times[path.rsplit("/", 1)[1]].append(time.monotonic())
+            return {}
+
+        mock_client._post.side_effect = post
+        items = [(name, str(n), {"text": "x"}) for name in times for n in range(4)]
+
+        started = time.monotonic()
+        list(
+            Message(mock_client).send_many(
+                items, max_concurrency=4, per_instance=Rate(20, burst=1)
+            )
+        )
+        elapsed = time.monotonic() - started
+
+        for sent in times.values():
+            assert len(sent) == 4
+            assert sent[-1] - sent[0] >= 0.12
+        assert elapsed < 0.28
@@ -0,0 +1,165 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from evolutionapi.async_client import AsyncEvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.resources.instances import AsyncInstance
+
+
+def make_client(handler) -> AsyncEvolutionAPI:
+    return AsyncEvolutionAPI(
+        "https://api.example.com/",
+        "test-api-key",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+class TestAsyncEvolutionAPI:
+    def test_initialization(self):
+        """Test if the client is initialized correctly."""
+        client = make_client(lambda request: httpx.Response(200, json={}))
+
+        assert client.base_url == "https://api.example.com"
+        assert client.api_key == "test-api-key"
+        assert client.session.headers["apikey"] == "test-api-key"
+        assert client.session.headers["Content-Type"] == "application/json"
+        assert isinstance(client.instances, AsyncInstance)
+
+    def test_get_request(self):
+        """Test GET request method."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"data": "test_data"})
+
+        async def run():
+            async with make_client(handler) as client:
+                return await client._get("/test-path", params={"key": "value"})
+
+        result = asyncio.run(run())
+
+        assert result == {"data": "test_data"}
+        assert requests[0].method == "GET"
+        assert str(requests[0].url) == "https://api.example.com/test-path?key=value"
+        assert requests[0].headers["apikey"] == "test-api-key"
+
+    @pytest.mark.parametrize("method", ["POST", "PUT", "DELETE"])
+    def test_write_requests(self, method):
+        """Test POST, PUT and DELETE request methods."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"data": method})
+
+        async def run():
+            async with make_client(handler) as client:
+                send = getattr(client, f"_{method.lower()}")
+                if method == "DELETE":
+                    return await send("/test-path")
+                return await send("/test-path", json={"name": "test"})
+
+        result = asyncio.run(run())
+
+        assert result == {"data": method}
+        assert requests[0].method == method
+        if method != "DELETE":
+            assert json.loads(requests[0].content) == {"name": "test"}
+
+    def test_error_handling(self):
+        """Test error handling in requests."""
+
+        def handler(request):
+            return httpx.Response(400, json={"error": "Bad request"})
+
+        async def run():
+            async with make_client(handler) as client:
+                await client._get("/test-path")
+
+        with pytest.raises(EvolutionAPIError) as excinfo:
+            asyncio.run(run())
+
+        assert excinfo.value.status_code == 400
+        assert excinfo.value.error_message == "Bad request"
+        assert excinfo.value.response == {"error": "Bad request"}
+
+    def test_error_handling_parse_error(self):
+        """Test error handling when response cannot be parsed as JSON."""
+
+        def handler(request):
+            return httpx.Response(500, content=b"Internal Server Error")
+
+        async def run():
+            async with make_client(handler) as client:
+                await client._get("/test-path")
+
+        with pytest.raises(EvolutionAPIError) as excinfo:
+            asyncio.run(run())
+
+        assert excinfo.value.status_code == 500
+        assert excinfo.value.error_message == "Failed to parse error response"
+        assert excinfo.value.response is None
+
+    def test_instances_create_and_fetch(self, instance_success_response):
+        """Test the async instance resource end to end."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=instance_success_response)
+
+        async def run():
+            async with make_client(handler) as client:
+                created = await client.instances.create(instance_name="teste-docs")
+                fetched = await client.instances.fetch(instance_name="teste-docs")
+                return created, fetched
+
+        created, fetched = asyncio.run(run())
+
+        assert created == instance_success_response
+        assert fetched == instance_success_response
+        assert requests[0].url.path == "/instance/create"
+        assert json.loads(requests[0].content)["instanceName"] == "teste-docs"
+        assert requests[1].url.path == "/instance/fetchInstances"
+        assert requests[1].url.params["instanceName"] == "teste-docs"
+
+    def test_concurrent_requests(self):
+        """Test that many requests can run concurrently on one event loop."""
+
+        def handler(request):
+            return httpx.Response(200, json={"name": request.url.params["name"]})
+
+        async def run():
+            async with make_client(handler) as client:
+                return await asyncio.gather(
+                    *(
+                        client._get("/test-path", params={"name": str(i)})
+                        for i in range(50)
+                    )
+                )
+
+        results = asyncio.run(run())
+
+        assert [r["name"] for r in results] == [str(i) for i in range(50)]
+
+    def test_instances_create_many(self, instance_success_response):
+        """Test bulk creation streams a result per spec."""
+
+        def handler(request):
+            if json.loads(request.content)["instanceName"] == "taken":
+                return httpx.Response(403, json={"error": "Forbidden"})
+            return httpx.Response(201, json=instance_success_response)
+
+        async def run():
+            async with make_client(handler) as client:
+                specs = [{"instance_name": name} for name in ("a", "taken", "b")]
+                return [r async for r in client.instances.create_many(specs)]
+
+        results = sorted(asyncio.run(run()), key=lambda r: r.index)
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[1].error.status_code == 403
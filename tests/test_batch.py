@@ -0,0 +1,219 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import requests_mock
+
+from evolutionapi.async_client import AsyncEvolutionAPI
+from evolutionapi.batch import AsyncBatch, Batch, BatchError, DependencyError
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+
+DELAY = 0.1
+
+
+class FakeInstances:
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, instance_name, **kwargs):
+        self.client.log("create", instance_name)
+        if instance_name == "taken":
+            raise EvolutionAPIError(403, "Forbidden")
+        return {
+            "instance": {"instanceName": instance_name},
+            "hash": {"apikey": f"key-{instance_name}"},
+        }
+
+    def fetch(self, instance_name):
+        self.client.log("fetch", instance_name)
+        return [{"instance": {"instanceName": instance_name, "status": "open"}}]
+
+
+class FakeClient:
+    """Client whose calls each take `DELAY` seconds."""
+
+    def __init__(self):
+        self.instances = FakeInstances(self)
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def log(self, name, arg):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        started = time.monotonic()
+        time.sleep(DELAY)
+        with self.lock:
+            self.running -= 1
+            self.calls.append((name, arg, started, time.monotonic()))
+
+    def _post(self, path, json=None):
+        self.log("post", path)
+        return {"path": path, "json": json}
+
+
+class TestBatch:
+    def test_latency_is_the_critical_path(self):
+        client = FakeClient()
+
+        started = time.monotonic()
+        with Batch(client) as b:
+            created = b.instances.create(instance_name="shop")
+            b.after(created)._post("/webhook/set/shop", json={"enabled": True})
+            b.after(created)._post("/settings/set/shop", json={"always_online": True})
+            fetched = b.instances.fetch(created["instance"]["instanceName"])
+        elapsed = time.monotonic() - started
+
+        assert fetched.result()[0]["instance"]["status"] == "open"
+        assert len(client.calls) == 4
+        assert elapsed < 3 * DELAY  # two steps, instead of four calls
+        create = next(call for call in client.calls if call[0] == "create")
+        assert all(call[2] >= create[3] for call in client.calls if call is not create)
+
+    def test_futures_are_resolved_in_arguments(self):
+        client = FakeClient()
+
+        with Batch(client) as b:
+            created = b.instances.create(instance_name="shop")
+            webhook = b._post(
+                created.then(lambda r: f"/webhook/set/{r['instance']['instanceName']}"),
+                json={"headers": {"apikey": created["hash"]["apikey"]}, "events": []},
+            )
+
+        assert webhook.result() == {
+            "path": "/webhook/set/shop",
+            "json": {"headers": {"apikey": "key-shop"}, "events": []},
+        }
+
+    def test_independent_calls_run_concurrently(self):
+        client = FakeClient()
+
+        with Batch(client, max_concurrency=2) as b:
+            futures = [b.instances.fetch(f"instance-{i}") for i in range(5)]
+
+        assert [f.result()[0]["instance"]["instanceName"] for f in futures] == [
+            f"instance-{i}" for i in range(5)
+        ]
+        assert client.max_running == 2
+
+    def test_errors(self):
+        """A failure skips its dependents only and is raised on exit."""
+        client = FakeClient()
+
+        with pytest.raises(BatchError) as excinfo:
+            with Batch(client) as b:
+                taken = b.instances.create(instance_name="taken")
+                dependent = b.instances.fetch(taken["instance"]["instanceName"])
+                other = b.instances.create(instance_name="other")
+
+        assert other.result()["instance"]["instanceName"] == "other"
+        assert isinstance(taken.exception(), EvolutionAPIError)
+        assert isinstance(dependent.exception(), DependencyError)
+        assert dependent.exception().cause is taken.exception()
+        assert excinfo.value.errors == [taken.exception(), dependent.exception()]
+        assert excinfo.value.total == 3
+        assert [call[:2] for call in client.calls if call[0] == "fetch"] == []
+
+    def test_errors_can_be_left_to_futures(self):
+        with Batch(FakeClient(), raise_errors=False) as b:
+            taken = b.instances.create(instance_name="taken")
+
+        with pytest.raises(EvolutionAPIError):
+            taken.result()
+
+    def test_exception_in_block_cancels_pending_calls(self):
+        client = FakeClient()
+
+        with pytest.raises(RuntimeError):
+            with Batch(client, max_concurrency=1) as b:
+                first = b.instances.fetch("a")
+                second = b.instances.fetch("b")
+                raise RuntimeError("abort")
+
+        assert first.done() and second.cancelled()
+        assert [call[1] for call in client.calls] == ["a"]
+
+    def test_call_any_function(self):
+        with Batch(FakeClient()) as b:
+            created = b.instances.create(instance_name="shop")
+            status = b.call(lambda record: record["instance"], created)
+
+        assert status.result() == {"instanceName": "shop"}
+
+    def test_client_batch(self):
+        client = EvolutionAPI("http://test", "key")
+
+        with requests_mock.Mocker() as m:
+            m.post(
+                "http://test/instance/create",
+                json={"instance": {"instanceName": "shop", "status": "created"}},
+            )
+            m.get(
+                "http://test/instance/fetchInstances",
+                json=[{"instance": {"instanceName": "shop", "status": "open"}}],
+            )
+            with client.batch() as b:
+                created = b.instances.create(instance_name="shop", qrcode=True)
+                fetched = b.instances.fetch(created["instance"]["instanceName"])
+
+        assert fetched.result()[0]["instance"]["status"] == "open"
+        assert m.request_history[1].qs == {"instancename": ["shop"]}
+
+
+class TestAsyncBatch:
+    def make_client(self, log):
+        async def handler(request):
+            log.append((request.url.path, time.monotonic()))
+            await asyncio.sleep(DELAY)
+            if request.url.path == "/instance/create":
+                return httpx.Response(
+                    201,
+                    json={"instance": {"instanceName": "shop", "status": "created"}},
+                )
+            if request.url.path == "/webhook/set/fail":
+                return httpx.Response(400, json={"error": "Bad Request"})
+            return httpx.Response(200, json={"path": request.url.path})
+
+        return AsyncEvolutionAPI(
+            "http://test", "key", transport=httpx.MockTransport(handler)
+        )
+
+    def test_critical_path(self):
+        log = []
+
+        async def run():
+            async with self.make_client(log) as client:
+                async with client.batch() as b:
+                    created = b.instances.create(instance_name="shop")
+                    webhook = b.after(created)._post("/webhook/set/shop", json={})
+                    fetched = b.instances.fetch(created["instance"]["instanceName"])
+                    assert isinstance(b, AsyncBatch)
+                return webhook.result(), fetched.result()
+
+        started = time.monotonic()
+        webhook, fetched = asyncio.run(run())
+        elapsed = time.monotonic() - started
+
+        assert webhook == {"path": "/webhook/set/shop"}
+        assert fetched == {"path": "/instance/fetchInstances"}
+        assert [path for path, _ in log][0] == "/instance/create"
+        assert elapsed < 3 * DELAY
+
+    def test_errors(self):
+        async def run():
+            async with self.make_client([]) as client:
+                async with client.batch() as b:
+                    failed = b._post("/webhook/set/fail", json={})
+                    b.after(failed)._post("/settings/set/fail", json={})
+
+        with pytest.raises(BatchError) as excinfo:
+            asyncio.run(run())
+
+        first, second = excinfo.value.errors
+        assert isinstance(first, EvolutionAPIError)
+        assert isinstance(second, DependencyError)
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from evolutionapi.bulk import (
+    BulkResult,
+    arun_concurrently,
+    run_concurrently,
+    run_partitioned,
+)
+from evolutionapi.exceptions import EvolutionAPIError
+
+
+def fail_on_odd(item: int) -> int:
+    if item % 2:
+        raise EvolutionAPIError(status_code=403, error_message="Forbidden")
+    return item * 10
+
+
+class TestRunConcurrently:
+    def test_results_per_item(self):
+        """Test that every item gets a result and failures don't abort."""
+        results = sorted(run_concurrently(fail_on_odd, range(6)), key=lambda r: r.index)
+
+        assert [r.ok for r in results] == [True, False] * 3
+        assert [r.result for r in results if r.ok] == [0, 20, 40]
+        assert all(isinstance(r.error, EvolutionAPIError) for r in results if not r.ok)
+        assert [r.item for r in results] == list(range(6))
+
+    def test_bounded_concurrency(self):
+        """Test that no more than max_concurrency calls run at once."""
+        lock = threading.Lock()
+        running = peak = 0
+
+        def work(item):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return item
+
+        results = list(run_concurrently(work, range(20), max_concurrency=3))
+
+        assert len(results) == 20
+        assert peak <= 3
+
+    def test_items_consumed_lazily(self):
+        """Test that the input is not drained ahead of the results."""
+        consumed = []
+
+        def items():
+            for i in range(1000):
+                consumed.append(i)
+                yield i
+
+        stream = run_concurrently(lambda item: item, items(), max_concurrency=2)
+        next(stream)
+        stream.close()
+
+        assert len(consumed) < 10
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            list(run_concurrently(fail_on_odd, [1], max_concurrency=0))
+
+
+class TestRunPartitioned:
+    def test_order_within_partition(self):
+        """Items of a partition run one at a time, in input order."""
+        lock = threading.Lock()
+        started = []
+        running = set()
+        overlaps = []
+
+        def work(item):
+            key, _ = item
+            with lock:
+                if key in running:
+                    overlaps.append(key)
+                running.add(key)
+                started.append(item)
+            time.sleep(0.002)
+            with lock:
+                running.discard(key)
+            return item
+
+        items = [(key, n) for n in range(10) for key in "abcd"]
+        results = list(run_partitioned(work, items, lambda item: item[0], 4))
+
+        assert len(results) == 40
+        assert overlaps == []
+        for key in "abcd":
+            assert [n for k, n in started if k == key] == list(range(10))
+
+    def test_partitions_run_concurrently(self):
+        """A slow partition does not hold back the others."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def work(item):
+            if item[1] == 0:
+                barrier.wait()
+            return item
+
+        items = [("a", 0), ("a", 1), ("b", 0)]
+        results = list(run_partitioned(work, items, lambda item: item[0], 2))
+        assert all(r.ok for r in results)
+
+    def test_bounded_read_ahead(self):
+        """At most max_pending items are read ahead of those running."""
+        consumed = []
+
+        def items():
+            for n in range(100):
+                consumed.append(n)
+                yield ("same", n)
+
+        results = run_partitioned(
+            lambda item: item, items(), lambda item: item[0], 2, max_pending=5
+        )
+        next(results)
+        assert len(consumed) <= 7
+        results.close()
+
+    def test_throttle_defers_partition(self):
+        """A throttled item waits without blocking other partitions."""
+        calls = {"slow": 0}
+
+        def throttle(item):
+            if item[0] == "slow" and calls["slow"] == 0:
+                calls["slow"] += 1
+                return 0.05
+            return 0
+
+        order = [
+            r.item[0]
+            for r in run_partitioned(
+                lambda item: item,
+                [("slow", 0), ("fast", 0), ("fast", 1)],
+                lambda item: item[0],
+                1,
+                throttle=throttle,
+            )
+        ]
+        assert order == ["fast", "fast", "slow"]
+
+    def test_failures_are_results(self):
+        results = list(run_partitioned(fail_on_odd, range(4), lambda item: item % 2, 2))
+        assert sorted(r.ok for r in results) == [False, False, True, True]
+
+
+class TestArunConcurrently:
+    def test_results_per_item(self):
+        """Test the async runner returns one result per item."""
+
+        async def work(item):
+            await asyncio.sleep(0)
+            return fail_on_odd(item)
+
+        async def run():
+            return [r async for r in arun_concurrently(work, range(6), 2)]
+
+        results = sorted(asyncio.run(run()), key=lambda r: r.index)
+
+        assert all(isinstance(r, BulkResult) for r in results)
+        assert [r.result for r in results] == [0, None, 20, None, 40, None]
+        assert [r.ok for r in results] == [True, False] * 3
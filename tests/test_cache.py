@@ -0,0 +1,126 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from evolutionapi.cache import CacheStats, ResponseCache
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+
+
+class TestResponseCache:
+    def test_hit_and_miss(self, clock):
+        """Test that stored values are returned until they expire."""
+        cache = ResponseCache(ttl=5, clock=clock)
+
+        assert cache.get("key", None) is None
+        cache.set("key", {"data": 1}, "/path")
+        assert cache.get("key") == {"data": 1}
+
+        clock.now = 6
+        assert cache.get("key", None) is None
+        assert cache.stats() == CacheStats(hits=1, misses=2, size=0)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ResponseCache(maxsize=2)
+        cache.set("a", 1, "/path")
+        cache.set("b", 2, "/path")
+        cache.get("a")
+        cache.set("c", 3, "/path")
+
+        assert cache.get("b", None) is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats().evictions == 1
+
+    def test_per_endpoint_ttl(self):
+        """Test exact and prefix TTL overrides."""
+        cache = ResponseCache(
+            ttl=5, ttls={"/instance/": 1, "/instance/fetchInstances": 2, "/chat/": 0}
+        )
+
+        assert cache.ttl_for("/instance/fetchInstances") == 2
+        assert cache.ttl_for("/instance/connectionState/x") == 1
+        assert cache.ttl_for("/group/fetchAllGroups/x") == 5
+
+        cache.set("chat", 1, "/chat/findChats/x")
+        assert cache.get("chat", None) is None
+
+    def test_invalidate_instance(self):
+        """Test that writes drop the instance's entries and listings only."""
+        cache = ResponseCache()
+        cache.set("a", 1, "/path", instance_name="a")
+        cache.set("b", 2, "/path", instance_name="b")
+        cache.set("all", 3, "/path")
+
+        cache.invalidate("a")
+
+        assert cache.get("a", None) is None
+        assert cache.get("all", None) is None
+        assert cache.get("b") == 2
+        assert cache.stats().invalidations == 2
+
+    def test_stale_set_is_ignored(self):
+        """Test that a response fetched before an invalidation is not stored."""
+        cache = ResponseCache()
+        generation = cache.generation
+        cache.invalidate("a")
+        cache.set("a", 1, "/path", instance_name="a", generation=generation)
+
+        assert cache.get("a", None) is None
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            ResponseCache(maxsize=0)
+
+
+class TestClientCache:
+    @pytest.fixture
+    def mock_session(self):
+        with patch("evolutionapi.client.requests.Session") as mock_session:
+            session_instance = Mock()
+            response = Mock(status_code=200)
+            response.json.return_value = [{"instance": {"instanceName": "a"}}]
+            session_instance.request.return_value = response
+            mock_session.return_value = session_instance
+            yield session_instance
+
+    @pytest.fixture
+    def api_client(self, mock_session):
+        return EvolutionAPI(
+            "https://api.example.com", "test-api-key", cache=ResponseCache()
+        )
+
+    def test_fetch_is_cached(self, api_client, mock_session):
+        """Test that repeated fetches of the same instance hit the cache."""
+        first = api_client.instances.fetch("a")
+        second = api_client.instances.fetch("a")
+        api_client.instances.fetch("b")
+
+        assert first == second
+        assert mock_session.request.call_count == 2
+        assert api_client.cache.stats().hits == 1
+
+    def test_create_invalidates_instance(self, api_client, mock_session):
+        """Test that creating an instance invalidates its cached reads."""
+        api_client.instances.fetch("a")
+        api_client.instances.fetch("b")
+        api_client.instances.create(instance_name="a")
+        api_client.instances.fetch("a")
+        api_client.instances.fetch("b")
+
+        # fetch a, fetch b, create a, fetch a again; b is still cached
+        assert mock_session.request.call_count == 4
+
+    def test_errors_are_not_cached(self, api_client, mock_session):
+        """Test that failed reads are not stored."""
+        error = Mock(status_code=404)
+        error.json.return_value = {"error": "Not Found"}
+        mock_session.request.return_value = error
+
+        for _ in range(2):
+            with pytest.raises(EvolutionAPIError):
+                api_client.instances.fetch("missing")
+
+        assert mock_session.request.call_count == 2
+        assert api_client.cache.stats().size == 0
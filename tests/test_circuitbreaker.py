@@ -0,0 +1,172 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from evolutionapi.circuitbreaker import CircuitBreaker, CircuitState
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import CircuitOpenError, EvolutionAPIError
+
+
+def make_breaker(clock, **kwargs):
+    kwargs.setdefault("minimum_calls", 4)
+    kwargs.setdefault("window_size", 4)
+    kwargs.setdefault("cooldown", 10)
+    return CircuitBreaker(clock=clock, **kwargs)
+
+
+class TestCircuitBreaker:
+    def test_opens_on_failure_rate(self, clock):
+        """Test that the circuit opens once the failure rate is reached."""
+        breaker = make_breaker(clock)
+
+        breaker.record_success("a")
+        breaker.record_failure("a")
+        breaker.record_success("a")
+        assert breaker.state("a") is CircuitState.CLOSED
+
+        breaker.record_failure("a")
+        assert breaker.state("a") is CircuitState.OPEN
+        with pytest.raises(CircuitOpenError) as excinfo:
+            breaker.before_call("a")
+
+        assert isinstance(excinfo.value, EvolutionAPIError)
+        assert excinfo.value.status_code == 503
+        assert excinfo.value.retry_after == 10
+        breaker.before_call("b")
+
+    def test_half_open_closes_on_success(self, clock):
+        """Test that a successful trial call closes the circuit."""
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure("a")
+
+        clock.now = 10
+        assert breaker.state("a") is CircuitState.HALF_OPEN
+        breaker.before_call("a")
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call("a")  # only one trial call at a time
+
+        breaker.record_success("a")
+        assert breaker.state("a") is CircuitState.CLOSED
+        breaker.before_call("a")
+
+    def test_half_open_reopens_on_failure(self, clock):
+        """Test that a failed trial call opens the circuit again."""
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure("a")
+
+        clock.now = 10
+        breaker.before_call("a")
+        breaker.record_failure("a")
+
+        assert breaker.state("a") is CircuitState.OPEN
+        clock.now = 15
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call("a")
+
+    def test_release_frees_the_trial_call(self, clock):
+        """Test that a released trial call lets another one through."""
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure("a")
+
+        clock.now = 10
+        breaker.before_call("a")
+        breaker.release("a")
+        breaker.before_call("a")
+
+        assert breaker.state("a") is CircuitState.HALF_OPEN
+        breaker.record_success("a")
+        assert breaker.state("a") is CircuitState.CLOSED
+
+    def test_state_change_callbacks(self, clock):
+        """Test that every transition is reported."""
+        transitions = []
+        breaker = make_breaker(
+            clock, on_state_change=lambda *args: transitions.append(args)
+        )
+        for _ in range(4):
+            breaker.record_failure("a")
+        clock.now = 10
+        breaker.before_call("a")
+        breaker.record_success("a")
+
+        assert transitions == [
+            ("a", CircuitState.CLOSED, CircuitState.OPEN),
+            ("a", CircuitState.OPEN, CircuitState.HALF_OPEN),
+            ("a", CircuitState.HALF_OPEN, CircuitState.CLOSED),
+        ]
+
+    def test_key_for(self):
+        assert CircuitBreaker().key_for("https://a", "/x") == "https://a"
+        assert CircuitBreaker(per_path=True).key_for("https://a", "/x") == "https://a/x"
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            CircuitBreaker(failure_rate_threshold=0)
+        with pytest.raises(ValueError):
+            CircuitBreaker(minimum_calls=30, window_size=20)
+
+
+class TestClientCircuitBreaker:
+    def test_fails_fast_while_open(self, clock):
+        """Test that the client stops calling the server once the circuit opens."""
+        breaker = make_breaker(clock, minimum_calls=2, window_size=2)
+        with patch("evolutionapi.client.requests.Session") as mock_session:
+            session = mock_session.return_value
+            session.request.side_effect = requests.ConnectionError("refused")
+            client = EvolutionAPI(
+                "https://api.example.com", "key", circuit_breaker=breaker
+            )
+
+            for _ in range(2):
+                with pytest.raises(requests.ConnectionError):
+                    client._get("/test-path")
+            with pytest.raises(CircuitOpenError):
+                client._get("/test-path")
+
+        assert session.request.call_count == 2
+        assert breaker.state("https://api.example.com") is CircuitState.OPEN
+
+    def test_client_errors_are_not_failures(self, clock):
+        """Test that 4xx responses do not open the circuit."""
+        breaker = make_breaker(clock, minimum_calls=2, window_size=2)
+        with patch("evolutionapi.client.requests.Session") as mock_session:
+            response = Mock(status_code=404)
+            response.json.return_value = {"error": "Not Found"}
+            mock_session.return_value.request.return_value = response
+            client = EvolutionAPI(
+                "https://api.example.com", "key", circuit_breaker=breaker
+            )
+
+            for _ in range(3):
+                with pytest.raises(EvolutionAPIError) as excinfo:
+                    client._get("/test-path")
+                assert excinfo.value.status_code == 404
+
+        assert breaker.state("https://api.example.com") is CircuitState.CLOSED
+
+    def test_unexpected_errors_release_the_trial_call(self, clock):
+        """Test that a trial call failing outside the transport is not lost."""
+        breaker = make_breaker(clock, minimum_calls=2, window_size=2)
+        with patch("evolutionapi.client.requests.Session") as mock_session:
+            session = mock_session.return_value
+            session.request.side_effect = requests.ConnectionError("refused")
+            client = EvolutionAPI(
+                "https://api.example.com", "key", circuit_breaker=breaker
+            )
+            for _ in range(2):
+                with pytest.raises(requests.ConnectionError):
+                    client._get("/test-path")
+
+            clock.now = 10
+            session.request.side_effect = RuntimeError("bug")
+            with pytest.raises(RuntimeError):
+                client._get("/test-path")
+            session.request.side_effect = None
+            session.request.return_value = Mock(status_code=200)
+            client._get("/test-path")
+
+        assert breaker.state("https://api.example.com") is CircuitState.CLOSED
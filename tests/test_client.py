@@ -5,6 +5,7 @@ import pytest
 
 from evolutionapi.client import EvolutionAPI
 from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.pool import PoolConfig, PooledHTTPAdapter
 
 
 class TestEvolutionAPI:
@@ -28,6 +29,30 @@ class TestEvolutionAPI:
             {"Content-Type": "application/json", "apikey": "test-api-key"}
         )
 
+    def test_pool_adapter_mounted(self, api_client, mock_session):
+        """Test that the pooled adapter is mounted for both schemes."""
+        assert isinstance(api_client.adapter, PooledHTTPAdapter)
+        mock_session.mount.assert_any_call("http://", api_client.adapter)
+        mock_session.mount.assert_any_call("https://", api_client.adapter)
+
+    def test_pool_config_timeout(self, mock_session):
+        """Test that configured timeouts are sent unless overridden per call."""
+        client = EvolutionAPI(
+            "https://api.example.com",
+            "test-api-key",
+            pool_config=PoolConfig(connect_timeout=2, read_timeout=10),
+        )
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {}
+        mock_session.request.return_value = mock_response
+
+        client._get("/test-path")
+        client._get("/test-path", timeout=1)
+
+        assert mock_session.request.call_args_list[0].kwargs["timeout"] == (2, 10)
+        assert mock_session.request.call_args_list[1].kwargs["timeout"] == 1
+
     def test_url_trailing_slash_removal(self):
         """Test if trailing slash is removed from base_url."""
         client = EvolutionAPI("https://api.example.com/", "test-api-key")
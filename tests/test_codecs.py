@@ -0,0 +1,133 @@
+import json
+from collections.abc import Mapping, Sequence
+
+import pytest
+import requests_mock
+
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.codecs import (
+    JSONCodec,
+    LazyArray,
+    LazyObject,
+    LazyResponse,
+    OrjsonCodec,
+    default_codec,
+)
+from evolutionapi.exceptions import EvolutionAPIError
+
+PAYLOAD = {"instanceName": "teste-docs", "text": "olá", "ids": [1, 2, 3]}
+
+codecs = [JSONCodec()]
+try:
+    codecs.append(OrjsonCodec())
+except ImportError:
+    pass
+
+
+class TestCodecs:
+    @pytest.mark.parametrize("codec", codecs, ids=lambda codec: codec.name)
+    def test_round_trip(self, codec):
+        """Test that encoded payloads decode back to the same value."""
+        data = codec.dumps(PAYLOAD)
+
+        assert isinstance(data, bytes)
+        assert codec.loads(data) == PAYLOAD
+        assert json.loads(data) == PAYLOAD
+
+    def test_default_codec(self):
+        """Test that the fastest installed codec is picked."""
+        expected = "orjson" if len(codecs) > 1 else "json"
+        assert default_codec().name == expected
+
+    def test_orjson_missing(self, monkeypatch):
+        """Test that a helpful error is raised without orjson."""
+        monkeypatch.setattr("evolutionapi.codecs.orjson", None)
+
+        with pytest.raises(ImportError, match="fast"):
+            OrjsonCodec()
+        assert default_codec().name == "json"
+
+
+class TestLazyResponse:
+    def test_decodes_on_first_access(self):
+        """Test that the body is only decoded when read."""
+        response = LazyResponse(b'{"instance": {"status": "open"}}', JSONCodec())
+
+        assert not response.decoded
+        assert response["instance"]["status"] == "open"
+        assert response.decoded
+
+    def test_behaves_like_decoded_value(self):
+        """Test the container protocol of lazy responses."""
+        response = LazyResponse(b'[{"name": "a"}, {"name": "b"}]', JSONCodec())
+
+        assert len(response) == 2
+        assert [item["name"] for item in response] == ["a", "b"]
+        assert {"name": "a"} in response
+        assert response == [{"name": "a"}, {"name": "b"}]
+
+    def test_get(self):
+        response = LazyResponse(b'{"a": 1}', JSONCodec())
+
+        assert response.get("a") == 1
+        assert response.get("b", 2) == 2
+
+    def test_mapping_and_sequence_api(self):
+        """Test that objects read like dicts and arrays like lists."""
+        obj = LazyResponse(b' {"a": 1, "b": 2}', JSONCodec())
+        array = LazyResponse(b'["x", "y", "x"]', JSONCodec())
+
+        assert isinstance(obj, LazyObject) and isinstance(obj, Mapping)
+        assert not obj.decoded
+        assert dict(obj.items()) == {"a": 1, "b": 2}
+        assert list(obj.keys()) == ["a", "b"]
+        assert list(obj.values()) == [1, 2]
+        assert dict(obj) == {"a": 1, "b": 2}
+        assert isinstance(array, LazyArray) and isinstance(array, Sequence)
+        assert not isinstance(array, Mapping)
+        assert array.index("y") == 1
+        assert array.count("x") == 2
+        assert list(reversed(array)) == ["x", "y", "x"]
+        assert array[1:] == ["y", "x"]
+
+
+class TestClientCodec:
+    def test_encodes_request_body_with_codec(self):
+        """Test that request bodies go through the configured codec."""
+        client = EvolutionAPI("http://test", "key", codec=JSONCodec())
+
+        with requests_mock.Mocker() as m:
+            m.post("http://test/instance/create", json={"status": "created"})
+            result = client._post("/instance/create", json=PAYLOAD)
+
+        assert result == {"status": "created"}
+        request = m.request_history[0]
+        assert request.body == JSONCodec().dumps(PAYLOAD)
+        assert request.headers["Content-Type"] == "application/json"
+
+    def test_lazy_responses(self):
+        """Test that responses are returned undecoded in lazy mode."""
+        client = EvolutionAPI("http://test", "key", lazy_responses=True)
+
+        with requests_mock.Mocker() as m:
+            m.get("http://test/instance/fetchInstances", json=[{"name": "a"}])
+            result = client._get("/instance/fetchInstances")
+
+        assert isinstance(result, LazyResponse)
+        assert not result.decoded
+        assert result[0]["name"] == "a"
+
+    def test_errors_are_decoded_eagerly(self):
+        """Test that error responses still raise in lazy mode."""
+        client = EvolutionAPI(
+            "http://test", "key", codec=default_codec(), lazy_responses=True
+        )
+
+        with requests_mock.Mocker() as m:
+            m.get(
+                "http://test/instance/fetchInstances",
+                status_code=400,
+                json={"error": "Bad request"},
+            )
+            with pytest.raises(EvolutionAPIError, match="Bad request"):
+                client._get("/instance/fetchInstances")
@@ -0,0 +1,88 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Generous upper bounds: measured values are well below, but CI machines are
+# noisy. The module checks below are the precise part of the budget.
+IMPORT_BUDGET = 0.05
+CLIENT_BUDGET = 0.1
+
+HEAVY_MODULES = ("requests", "httpx", "pydantic", "websockets", "asyncio")
+
+
+def run_python(code: str) -> dict:
+    """Run ``code`` in a fresh interpreter and return the JSON it prints."""
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+PROBE = """
+import json, sys, time
+{setup}
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "elapsed": elapsed,
+    "modules": [name for name in {modules!r} if name in sys.modules],
+}}))
+"""
+
+
+def probe(code: str, setup: str = "") -> dict:
+    return run_python(PROBE.format(setup=setup, code=code, modules=HEAVY_MODULES))
+
+
+class TestImportBudget:
+    def test_import_loads_no_dependencies(self):
+        """``import evolutionapi`` loads neither the HTTP stack nor pydantic."""
+        result = probe("import evolutionapi")
+        assert result["modules"] == []
+        assert result["elapsed"] < IMPORT_BUDGET
+
+    def test_client_construction(self):
+        """Constructing the sync client only needs requests."""
+        result = probe(
+            "import evolutionapi\n"
+            "client = evolutionapi.EvolutionAPI('http://localhost', 'key')",
+            # The HTTP stack itself is outside of the budget.
+            setup="import requests",
+        )
+        assert result["modules"] == ["requests"]
+        assert result["elapsed"] < CLIENT_BUDGET
+
+    def test_resources_are_loaded_on_first_access(self):
+        result = run_python(
+            "import json, sys\n"
+            "from evolutionapi import EvolutionAPI\n"
+            "client = EvolutionAPI('http://localhost', 'key')\n"
+            "before = 'evolutionapi.resources.instances' in sys.modules\n"
+            "instances = client.instances\n"
+            "after = 'evolutionapi.resources.instances' in sys.modules\n"
+            "print(json.dumps({'before': before, 'after': after,\n"
+            "    'cached': client.instances is instances,\n"
+            "    'pydantic': 'pydantic' in sys.modules}))"
+        )
+        assert result == {
+            "before": False,
+            "after": True,
+            "cached": True,
+            "pydantic": False,
+        }
+
+    def test_proxy_settings_is_lazy(self):
+        import evolutionapi
+        from evolutionapi.schemas import ProxySettings
+
+        assert evolutionapi.ProxySettings is ProxySettings
+        assert "ProxySettings" in dir(evolutionapi)
+
+    def test_unknown_attribute(self):
+        import evolutionapi
+
+        with pytest.raises(AttributeError):
+            evolutionapi.DoesNotExist
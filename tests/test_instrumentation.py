@@ -0,0 +1,191 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+import requests_mock
+
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.instrumentation import (
+    HistogramAggregator,
+    Instrument,
+    OpenTelemetryInstrument,
+    RequestMetrics,
+)
+from evolutionapi.retry import RetryPolicy
+
+
+class Recorder(Instrument):
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_request_start(self, metrics):
+        self.started.append(metrics)
+
+    def on_request_end(self, metrics):
+        self.ended.append(metrics)
+
+
+def metrics(total, method="GET", path="/instance/fetchInstances", status=200):
+    return RequestMetrics(
+        method=method, path_template=path, status_code=status, total=total
+    )
+
+
+class TestClientInstrumentation:
+    def test_records_request(self):
+        """Test that hooks receive the method, template, status and sizes."""
+        recorder = Recorder()
+        client = EvolutionAPI("http://test", "key", instruments=[recorder])
+
+        with requests_mock.Mocker() as m:
+            m.post("http://test/message/sendText/my-instance", json={"key": "abc"})
+            client._post("/message/sendText/my-instance", json={"text": "hi"})
+
+        assert len(recorder.started) == 1
+        [result] = recorder.ended
+        assert result.method == "POST"
+        assert result.path_template == "/message/sendText/{instance}"
+        assert result.status_code == 200
+        assert result.error is None
+        assert result.request_bytes == len(b'{"text": "hi"}')
+        assert result.response_bytes == len(b'{"key": "abc"}')
+        assert result.total > 0
+
+    def test_records_http_error(self):
+        """Test that error responses are reported with their exception."""
+        recorder = Recorder()
+        client = EvolutionAPI("http://test", "key", instruments=[recorder])
+
+        with requests_mock.Mocker() as m:
+            m.get("http://test/instance/fetchInstances", status_code=404, json={})
+            with pytest.raises(EvolutionAPIError):
+                client._get("/instance/fetchInstances")
+
+        [result] = recorder.ended
+        assert result.status_code == 404
+        assert isinstance(result.error, EvolutionAPIError)
+
+    def test_records_transport_error(self):
+        """Test that connection errors end the request without a status."""
+        recorder = Recorder()
+        client = EvolutionAPI("http://test", "key", instruments=[recorder])
+
+        with requests_mock.Mocker() as m:
+            m.get("http://test/instance/fetchInstances", exc=requests.ConnectionError)
+            with pytest.raises(requests.ConnectionError):
+                client._get("/instance/fetchInstances")
+
+        [result] = recorder.ended
+        assert result.status_code is None
+        assert isinstance(result.error, requests.ConnectionError)
+
+    def test_records_retries(self, monkeypatch):
+        """Test that one request is reported with the number of retries."""
+        monkeypatch.setattr("evolutionapi.client.time.sleep", lambda _: None)
+        recorder = Recorder()
+        client = EvolutionAPI(
+            "http://test",
+            "key",
+            retry_policy=RetryPolicy(jitter=False),
+            instruments=[recorder],
+        )
+
+        with requests_mock.Mocker() as m:
+            m.get(
+                "http://test/instance/fetchInstances",
+                [{"status_code": 503, "json": {}}, {"json": []}],
+            )
+            client._get("/instance/fetchInstances")
+
+        [result] = recorder.ended
+        assert result.retries == 1
+        assert result.status_code == 200
+
+    def test_connection_reuse_and_connect_time(self, base_url):
+        """Test that new and pooled connections are told apart."""
+        recorder = Recorder()
+        client = EvolutionAPI(base_url, "key", instruments=[recorder])
+
+        client._get("/instance/fetchInstances")
+        client._get("/instance/fetchInstances")
+
+        first, second = recorder.ended
+        assert first.connection_reused is False
+        assert first.connect is not None and first.connect >= 0
+        assert second.connection_reused is True
+        assert second.connect is None
+        assert second.ttfb is not None and second.ttfb >= 0
+
+
+class TestHistogramAggregator:
+    def test_percentiles_per_endpoint(self):
+        """Test that percentiles are within one bucket of the true value."""
+        aggregator = HistogramAggregator()
+        for i in range(1, 101):
+            aggregator.on_request_end(metrics(i / 1000))
+        aggregator.on_request_end(metrics(0.5, method="POST", path="/instance/create"))
+
+        fetch, create = sorted(aggregator.summary(), key=lambda s: s.method)
+        assert fetch.count == 100
+        assert 0.050 <= fetch.p50 <= 0.050 * 1.19
+        assert 0.095 <= fetch.p95 <= 0.095 * 1.19
+        assert 0.099 <= fetch.p99 <= 0.099 * 1.19
+        assert fetch.mean == pytest.approx(0.0505)
+        assert create.count == 1
+        assert create.path_template == "/instance/create"
+
+    def test_counts_errors(self):
+        """Test that failed requests are counted per endpoint."""
+        aggregator = HistogramAggregator()
+        failed = metrics(0.01, status=None)
+        failed.error = requests.ConnectionError()
+        aggregator.on_request_end(failed)
+        aggregator.on_request_end(metrics(0.01))
+
+        [summary] = aggregator.summary()
+        assert summary.count == 2
+        assert summary.errors == 1
+
+    def test_prometheus_format(self):
+        """Test the Prometheus text exposition output."""
+        aggregator = HistogramAggregator()
+        aggregator.on_request_end(metrics(0.002))
+        aggregator.on_request_end(metrics(0.002, status=500))
+
+        text = aggregator.to_prometheus()
+
+        labels = 'method="GET",path="/instance/fetchInstances"'
+        assert "# TYPE evolutionapi_request_duration_seconds histogram" in text
+        assert (
+            f'evolutionapi_request_duration_seconds_bucket{{{labels},le="0.001"}} 0'
+            in text
+        )
+        assert (
+            f'evolutionapi_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2'
+            in text
+        )
+        assert f"evolutionapi_request_duration_seconds_count{{{labels}}} 2" in text
+        assert f'evolutionapi_requests_total{{{labels},status="200"}} 1' in text
+        assert f'evolutionapi_requests_total{{{labels},status="500"}} 1' in text
+
+
+class TestOpenTelemetryInstrument:
+    def test_emits_span(self):
+        """Test that a span is built from the request metrics."""
+        tracer = MagicMock()
+        span = tracer.start_span.return_value
+        instrument = OpenTelemetryInstrument(tracer=tracer)
+        result = metrics(0.25)
+        result.started_at = 100.0
+        result.retries = 2
+
+        instrument.on_request_end(result)
+
+        tracer.start_span.assert_called_once_with(
+            "GET /instance/fetchInstances", start_time=100_000_000_000
+        )
+        span.set_attribute.assert_any_call("http.response.status_code", 200)
+        span.set_attribute.assert_any_call("http.request.resend_count", 2)
+        span.end.assert_called_once_with(end_time=100_250_000_000)
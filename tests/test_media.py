@@ -0,0 +1,338 @@
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import mmap
+import tracemalloc
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from evolutionapi.async_client import AsyncEvolutionAPI
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.media import (
+    Base64JSONBody,
+    Destination,
+    FileBody,
+    MultipartBody,
+    StreamingBody,
+    upload_body,
+)
+from evolutionapi.retry import RetryPolicy
+from evolutionapi.transports import InMemoryTransport
+
+BLOCK = bytes(range(256)) * 256  # 64 KiB
+LARGE = 16 * 1024 * 1024
+MEMORY_LIMIT = 2 * 1024 * 1024
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Digests uploaded bodies and serves generated downloads, in 64 KiB chunks."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def read_body(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if not size:
+                    self.rfile.readline()
+                    return
+                yield from self.read_exactly(size)
+                self.rfile.readline()
+        else:
+            yield from self.read_exactly(int(self.headers["Content-Length"]))
+
+    def read_exactly(self, size):
+        while size:
+            chunk = self.rfile.read(min(size, len(BLOCK)))
+            size -= len(chunk)
+            yield chunk
+
+    def reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        digest = hashlib.sha256()
+        size = 0
+        kept = []
+        for chunk in self.read_body():
+            digest.update(chunk)
+            size += len(chunk)
+            if size <= len(BLOCK):
+                kept.append(chunk)
+        self.reply(
+            201,
+            {
+                "path": self.path,
+                "contentType": self.headers["Content-Type"],
+                "chunked": self.headers.get("Transfer-Encoding") == "chunked",
+                "size": size,
+                "sha256": digest.hexdigest(),
+                "body": base64.b64encode(b"".join(kept)).decode(),
+            },
+        )
+
+    def do_GET(self) -> None:
+        if not self.path.startswith("/download/"):
+            self.reply(404, {"error": "Not Found"})
+            return
+        blocks = int(self.path.rsplit("/", 1)[1])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(blocks * len(BLOCK)))
+        self.end_headers()
+        for _ in range(blocks):
+            self.wfile.write(BLOCK)
+
+
+@pytest.fixture
+def handler():
+    return StubHandler
+
+
+@pytest.fixture
+def large_file(tmp_path):
+    path = tmp_path / "video.mp4"
+    with open(path, "wb") as file:
+        for _ in range(LARGE // len(BLOCK)):
+            file.write(BLOCK)
+    return path
+
+
+def sha256_of_blocks(count):
+    digest = hashlib.sha256()
+    for _ in range(count):
+        digest.update(BLOCK)
+    return digest.hexdigest()
+
+
+def parse_multipart(content_type: str, data: bytes):
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + data
+    )
+    return {
+        part.get_param("name", header="content-disposition"): part
+        for part in message.iter_parts()
+    }
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestBodies:
+    def test_streaming_body_is_abstract(self):
+        with pytest.raises(TypeError):
+            StreamingBody()
+
+    def test_multipart_body(self, tmp_path):
+        path = tmp_path / "photo.jpg"
+        path.write_bytes(b"\xff\xd8jpeg" * 1000)
+        body = MultipartBody(
+            fields={"number": "5511999999999", "delay": 1200},
+            files={"file": path, "thumb": ("t.png", io.BytesIO(b"png"), "image/png")},
+            chunk_size=1000,
+        )
+
+        data = b"".join(body)
+
+        assert len(body) == len(data)
+        assert b"".join(body) == data
+        parts = parse_multipart(body.content_type, data)
+        assert parts["number"].get_content() == "5511999999999"
+        assert parts["delay"].get_content() == "1200"
+        assert parts["file"].get_filename() == "photo.jpg"
+        assert parts["file"].get_content_type() == "image/jpeg"
+        assert parts["file"].get_payload(decode=True) == path.read_bytes()
+        assert parts["thumb"].get_payload(decode=True) == b"png"
+
+    def test_mmap_is_sliced_without_copying(self, large_file):
+        with open(large_file, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                body = FileBody(mapped)
+                chunks = iter(body)
+                first = next(chunks)
+                assert isinstance(first, memoryview)
+                assert first.obj is mapped
+                assert len(body) == LARGE
+                del first, chunks
+
+    def test_base64_json_body_length(self):
+        source = io.BytesIO(b"x" * 1000)
+        source.seek(10)
+        body = Base64JSONBody({"media": "\x00evolutionapi-media\x00"}, source, 100)
+
+        data = b"".join(body)
+
+        assert len(body) == len(data)
+        assert base64.b64decode(json.loads(data)["media"]) == b"x" * 990
+
+    def test_upload_body_validation(self):
+        with pytest.raises(ValueError):
+            upload_body(b"data", field=None, fields={"number": "1"})
+        with pytest.raises(TypeError):
+            upload_body(iter([b"data"]))
+
+    def test_failed_download_leaves_no_file(self, tmp_path):
+        path = tmp_path / "media.bin"
+        path.write_bytes(b"previous")
+
+        with pytest.raises(RuntimeError):
+            with Destination(path) as target:
+                target.write(b"partial")
+                raise RuntimeError("connection lost")
+
+        assert path.read_bytes() == b"previous"
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestClientTransfers:
+    def test_upload_multipart(self, base_url, tmp_path):
+        path = tmp_path / "report.pdf"
+        path.write_bytes(b"%PDF-1.4" * 100)
+        client = EvolutionAPI(base_url, "key")
+
+        response = client.upload(
+            "/message/sendMedia/teste-docs", path, fields={"number": "5511999999999"}
+        )
+
+        assert response["path"] == "/message/sendMedia/teste-docs"
+        assert response["contentType"].startswith("multipart/form-data; boundary=")
+        assert not response["chunked"]
+        parts = parse_multipart(
+            response["contentType"], base64.b64decode(response["body"])
+        )
+        assert parts["file"].get_filename() == "report.pdf"
+        assert parts["file"].get_content_type() == "application/pdf"
+        assert parts["file"].get_payload(decode=True) == path.read_bytes()
+        assert parts["number"].get_content() == "5511999999999"
+
+    def test_upload_raw_iterable_is_chunked(self, base_url):
+        client = EvolutionAPI(base_url, "key")
+
+        response = client.upload(
+            "/upload", (BLOCK for _ in range(3)), field=None, content_type="audio/ogg"
+        )
+
+        assert response["chunked"]
+        assert response["contentType"] == "audio/ogg"
+        assert response["sha256"] == sha256_of_blocks(3)
+
+    def test_upload_of_unknown_size_is_not_retried(self):
+        bodies = []
+
+        def handler(request):
+            bodies.append(b"".join(request.body))
+            return (503, {"error": "busy"}) if len(bodies) <= 2 else (200, {})
+
+        client = EvolutionAPI(
+            "http://test",
+            "key",
+            transport=InMemoryTransport(handler),
+            retry_policy=RetryPolicy(backoff_factor=0, jitter=False),
+        )
+
+        with pytest.raises(EvolutionAPIError) as excinfo:
+            client.upload(
+                "/upload", iter([b"hello ", b"world"]), field=None, method="PUT"
+            )
+        assert excinfo.value.status_code == 503
+        assert bodies == [b"hello world"]
+
+        client.upload("/upload", b"hello world", field=None, method="PUT")
+        assert bodies[1:] == [b"hello world", b"hello world"]
+
+    def test_download(self, base_url, tmp_path):
+        client = EvolutionAPI(base_url, "key")
+        path = tmp_path / "media.bin"
+
+        assert client.download("/download/3", path) == 3 * len(BLOCK)
+        assert path.read_bytes() == BLOCK * 3
+
+        with pytest.raises(EvolutionAPIError) as excinfo:
+            client.download("/missing", tmp_path / "missing.bin")
+        assert excinfo.value.status_code == 404
+        assert not (tmp_path / "missing.bin").exists()
+
+    def test_async_upload_and_download(self, base_url):
+        buffer = io.BytesIO()
+
+        async def run():
+            async with AsyncEvolutionAPI(base_url, "key") as client:
+                uploaded = await client.upload("/upload", BLOCK * 2, field=None)
+                written = await client.download("/download/2", buffer)
+                return uploaded, written
+
+        uploaded, written = asyncio.run(run())
+
+        assert not uploaded["chunked"]
+        assert uploaded["sha256"] == sha256_of_blocks(2)
+        assert written == 2 * len(BLOCK)
+        assert buffer.getvalue() == BLOCK * 2
+
+
+class TestPeakMemory:
+    """16 MiB transfers must not hold the file, or its base64 form, in memory."""
+
+    def test_multipart_upload(self, base_url, large_file):
+        client = EvolutionAPI(base_url, "key")
+
+        response, peak = peak_memory(lambda: client.upload("/upload", large_file))
+
+        assert response["size"] > LARGE
+        assert peak < MEMORY_LIMIT
+
+    def test_mmap_upload(self, base_url, large_file):
+        client = EvolutionAPI(base_url, "key")
+
+        with open(large_file, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                response, peak = peak_memory(
+                    lambda: client.upload("/upload", mapped, field=None)
+                )
+
+        assert response["sha256"] == sha256_of_blocks(LARGE // len(BLOCK))
+        assert peak < MEMORY_LIMIT
+
+    def test_base64_media_message(self, base_url, large_file):
+        client = EvolutionAPI(base_url, "key")
+
+        response, peak = peak_memory(
+            lambda: client.messages.send_media(
+                "teste-docs", "5511999999999", large_file, "video"
+            )
+        )
+
+        assert response["size"] > LARGE * 4 // 3
+        assert peak < MEMORY_LIMIT
+
+    def test_download(self, base_url, tmp_path):
+        client = EvolutionAPI(base_url, "key")
+        path = tmp_path / "media.bin"
+        blocks = LARGE // len(BLOCK)
+
+        written, peak = peak_memory(
+            lambda: client.download(f"/download/{blocks}", path)
+        )
+
+        assert written == LARGE
+        assert hashlib.sha256(path.read_bytes()).hexdigest() == sha256_of_blocks(blocks)
+        assert peak < MEMORY_LIMIT
@@ -0,0 +1,172 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.multinode import BalancingStrategy, MultiNodeEvolutionAPI
+
+NODES = ["https://node1.example.com", "https://node2.example.com/", "https://node3"]
+
+
+def ok_response():
+    response = Mock(status_code=200)
+    response.json.return_value = {}
+    return response
+
+
+@pytest.fixture
+def sessions():
+    with patch("evolutionapi.client.requests.Session") as mock_session:
+        created = []
+
+        def new_session():
+            session = Mock()
+            session.request.return_value = ok_response()
+            created.append(session)
+            return session
+
+        mock_session.side_effect = new_session
+        yield created
+
+
+class TestMultiNodeEvolutionAPI:
+    def test_one_session_per_node(self, sessions):
+        """Test that every node gets its own session and connection pool."""
+        client = MultiNodeEvolutionAPI(NODES, "key")
+
+        assert client.base_urls == [
+            "https://node1.example.com",
+            "https://node2.example.com",
+            "https://node3",
+        ]
+        assert len(sessions) == 3
+        assert len({id(node.transport) for node in client.nodes}) == 3
+        for session in sessions:
+            session.headers.update.assert_called_once_with(
+                {"Content-Type": "application/json", "apikey": "key"}
+            )
+
+    def test_requires_nodes(self):
+        with pytest.raises(ValueError):
+            MultiNodeEvolutionAPI([], "key")
+
+    def test_round_robin(self, sessions):
+        """Test that requests rotate over the nodes."""
+        client = MultiNodeEvolutionAPI(NODES, "key")
+
+        for _ in range(6):
+            client._get("/instance/fetchInstances")
+
+        assert [s.request.call_count for s in sessions] == [2, 2, 2]
+
+    def test_least_outstanding(self, sessions):
+        """Test that the node with fewer requests in flight is preferred."""
+        client = MultiNodeEvolutionAPI(
+            NODES, "key", strategy=BalancingStrategy.LEAST_OUTSTANDING
+        )
+        client.nodes[0].outstanding = 5
+        client.nodes[1].outstanding = 5
+
+        for _ in range(3):
+            assert client.node_for(None) is client.nodes[2]
+
+    def test_sticky_by_instance(self, sessions):
+        """Test that all calls for an instance go to the same node."""
+        client = MultiNodeEvolutionAPI(NODES, "key", strategy="sticky")
+
+        client.instances.create(instance_name="tenant-a")
+        client.instances.fetch("tenant-a")
+        client._post("/message/sendText/tenant-a", json={})
+
+        used = [session for session in sessions if session.request.called]
+        assert len(used) == 1
+        assert used[0].request.call_count == 3
+
+    def test_sticky_explicit_owner(self, sessions):
+        """Test that explicit owners take precedence over hashing."""
+        client = MultiNodeEvolutionAPI(
+            NODES,
+            "key",
+            strategy="sticky",
+            owners={"tenant-a": "https://node3/"},
+        )
+
+        assert client.node_for("tenant-a") is client.nodes[2]
+
+    def test_eject_and_probe_back(self, sessions, clock):
+        """Test that failing nodes are ejected and probed back in."""
+        client = MultiNodeEvolutionAPI(
+            NODES, "key", eject_after=2, eject_for=10, clock=clock
+        )
+        sessions[0].request.side_effect = requests.ConnectionError("down")
+
+        for _ in range(6):
+            try:
+                client._get("/test-path")
+            except requests.ConnectionError:
+                pass
+
+        assert sessions[0].request.call_count == 2
+        assert [stats.healthy for stats in client.node_stats()] == [False, True, True]
+
+        for _ in range(4):
+            client._get("/test-path")
+        assert sessions[0].request.call_count == 2
+
+        # after the ejection period a single probe goes through
+        sessions[0].request.side_effect = None
+        clock.now = 10
+        client._get("/test-path")
+        assert sessions[0].request.call_count == 3
+        assert client.node_stats()[0].healthy
+
+    def test_probe_without_outcome_allows_another_probe(self, sessions, clock):
+        """Test that a probe failing outside the transport is retried later."""
+        client = MultiNodeEvolutionAPI(
+            NODES[:2], "key", eject_after=1, eject_for=10, clock=clock
+        )
+        sessions[0].request.side_effect = requests.ConnectionError("down")
+        with pytest.raises(requests.ConnectionError):
+            client._get("/test-path")
+
+        clock.now = 10
+        sessions[0].request.side_effect = RuntimeError("hook failed")
+        with pytest.raises(RuntimeError):
+            client._get("/test-path")
+
+        sessions[0].request.side_effect = None
+        client._get("/test-path")
+        assert sessions[0].request.call_count == 3
+        assert client.node_stats()[0].healthy
+
+    def test_server_errors_eject(self, sessions):
+        """Test that 5xx responses count as node failures."""
+        error = Mock(status_code=502)
+        error.json.return_value = {"error": "Bad Gateway"}
+        client = MultiNodeEvolutionAPI(NODES[:1], "key", eject_after=1)
+        sessions[0].request.return_value = error
+
+        with pytest.raises(EvolutionAPIError):
+            client._get("/test-path")
+
+        assert not client.node_stats()[0].healthy
+
+    def test_probe_ejected(self, sessions):
+        """Test that active probing restores healthy nodes."""
+        client = MultiNodeEvolutionAPI(NODES, "key", eject_after=1)
+        sessions[1].request.side_effect = requests.ConnectionError("down")
+        client._get("/test-path")
+        with pytest.raises(requests.ConnectionError):
+            client._get("/test-path")
+
+        assert client.probe_ejected() == []
+        sessions[1].request.side_effect = None
+        assert client.probe_ejected() == ["https://node2.example.com"]
+        assert all(stats.healthy for stats in client.node_stats())
+
+    def test_pool_stats_sum_nodes(self, sessions):
+        client = MultiNodeEvolutionAPI(NODES, "key")
+
+        assert client.pool_stats().created == 0
+        assert [stats.pool.created for stats in client.node_stats()] == [0, 0, 0]
@@ -0,0 +1,276 @@
+import os
+import threading
+import time
+
+import pytest
+import requests
+
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.outbox import IDEMPOTENCY_HEADER, Outbox
+
+
+class RecordingClient:
+    """Client double recording delivered requests and failing on demand."""
+
+    def __init__(self, failures=None, delay=0.0):
+        self.failures = list(failures or [])
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _request(self, method, path, **kwargs):
+        time.sleep(self.delay)
+        with self.lock:
+            if self.failures:
+                raise self.failures.pop(0)
+            self.calls.append((method, path, kwargs))
+        return {"ok": True}
+
+    def _get(self, path, **kwargs):
+        return {"instances": []}
+
+
+class CrashingFile:
+    """File whose truncation fails, standing for a crash during compaction."""
+
+    def __init__(self, file):
+        self.file = file
+
+    def truncate(self, size):
+        raise OSError("crash")
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+
+def open_outbox(directory, client, **kwargs):
+    kwargs.setdefault("retry_delay", 0.001)
+    return Outbox(client, str(directory), **kwargs)
+
+
+class TestOutbox:
+    def test_delivers_enqueued_requests(self, tmp_path):
+        """Queued requests are sent with their idempotency key."""
+        client = RecordingClient()
+        with open_outbox(tmp_path, client) as outbox:
+            key = outbox.enqueue(
+                "post", "/message/sendText/inst", json={"number": "5511", "text": "hi"}
+            )
+            assert outbox.join(timeout=5)
+            stats = outbox.stats()
+
+        method, path, kwargs = client.calls[0]
+        assert (method, path) == ("POST", "/message/sendText/inst")
+        assert kwargs["json"] == {"number": "5511", "text": "hi"}
+        assert kwargs["headers"] == {IDEMPOTENCY_HEADER: key}
+        assert stats.enqueued == 1
+        assert stats.delivered == 1
+        assert stats.pending == 0
+
+    def test_per_instance_ordering(self, tmp_path):
+        """Requests of an instance are delivered in the order they were queued."""
+        client = RecordingClient()
+        with open_outbox(tmp_path, client, concurrency=3) as outbox:
+            for i in range(50):
+                for name in ("a", "b", "c"):
+                    outbox.enqueue("POST", f"/message/sendText/{name}", json={"i": i})
+            assert outbox.join(timeout=5)
+
+        for name in ("a", "b", "c"):
+            sent = [
+                kwargs["json"]["i"]
+                for _, path, kwargs in client.calls
+                if path.endswith(f"/{name}")
+            ]
+            assert sent == list(range(50))
+
+    def test_recovers_pending_requests_after_restart(self, tmp_path):
+        """Requests queued before a restart are delivered by the next outbox."""
+        outbox = open_outbox(tmp_path, RecordingClient())
+        keys = [
+            outbox.enqueue("POST", "/instance/create", json={"instanceName": f"i{n}"})
+            for n in range(3)
+        ]
+        outbox.close()
+
+        client = RecordingClient()
+        outbox = open_outbox(tmp_path, client)
+        assert outbox.stats().pending == 3
+        with outbox:
+            assert outbox.join(timeout=5)
+            new_key = outbox.enqueue("DELETE", "/instance/delete/i0")
+            assert outbox.join(timeout=5)
+
+        sent = [kwargs["headers"][IDEMPOTENCY_HEADER] for _, _, kwargs in client.calls]
+        assert sorted(sent[:3]) == sorted(keys)
+        assert sent[3] == new_key
+
+    def test_delivered_requests_are_not_sent_again(self, tmp_path):
+        """Acknowledged requests are skipped on restart."""
+        with open_outbox(tmp_path, RecordingClient()) as outbox:
+            outbox.enqueue("POST", "/instance/create", json={"instanceName": "x"})
+            assert outbox.join(timeout=5)
+
+        client = RecordingClient()
+        with open_outbox(tmp_path, client) as outbox:
+            assert outbox.stats().pending == 0
+        assert client.calls == []
+
+    def test_ignores_torn_write(self, tmp_path):
+        """A partial record left by a crash is dropped on recovery."""
+        outbox = open_outbox(tmp_path, RecordingClient())
+        outbox.enqueue("POST", "/instance/create", json={"instanceName": "x"})
+        outbox.close()
+        with open(os.path.join(tmp_path, "outbox.log"), "ab") as log:
+            log.write(b"\x02\x00\x00")
+
+        client = RecordingClient()
+        with open_outbox(tmp_path, client) as outbox:
+            assert outbox.join(timeout=5)
+            outbox.enqueue("POST", "/instance/create", json={"instanceName": "y"})
+            assert outbox.join(timeout=5)
+
+        assert [kwargs["json"]["instanceName"] for _, _, kwargs in client.calls] == [
+            "x",
+            "y",
+        ]
+
+    def test_retries_transient_errors(self, tmp_path):
+        """Connection errors, 429 and 5xx are retried with the same key."""
+        client = RecordingClient(
+            failures=[
+                requests.ConnectionError("down"),
+                EvolutionAPIError(503, "unavailable"),
+                EvolutionAPIError(429, "slow down"),
+            ]
+        )
+        with open_outbox(tmp_path, client) as outbox:
+            outbox.enqueue("POST", "/instance/create", json={"instanceName": "x"})
+            assert outbox.join(timeout=5)
+            stats = outbox.stats()
+
+        assert len(client.calls) == 1
+        assert stats.retries == 3
+        assert stats.delivered == 1
+
+    def test_dead_letters_permanent_errors(self, tmp_path):
+        """Client errors are not retried and are passed to on_dead_letter."""
+        dead = []
+        client = RecordingClient(failures=[EvolutionAPIError(400, "bad request")])
+        with open_outbox(
+            tmp_path,
+            client,
+            concurrency=1,
+            on_dead_letter=lambda record, exc: dead.append(record),
+        ) as outbox:
+            outbox.enqueue("POST", "/instance/create", json={"instanceName": "x"})
+            outbox.enqueue("POST", "/instance/create", json={"instanceName": "y"})
+            assert outbox.join(timeout=5)
+            stats = outbox.stats()
+
+        assert [record.json["instanceName"] for record in dead] == ["x"]
+        assert [kwargs["json"]["instanceName"] for _, _, kwargs in client.calls] == [
+            "y"
+        ]
+        assert stats.dead_lettered == 1
+        assert stats.delivered == 1
+
+    def test_close_keeps_undelivered_requests(self, tmp_path):
+        """Requests still failing when the outbox closes are kept for later."""
+        client = RecordingClient(failures=[requests.ConnectionError("down")] * 100)
+        outbox = open_outbox(tmp_path, client, retry_delay=10)
+        outbox.start()
+        outbox.enqueue("POST", "/instance/create", json={"instanceName": "x"})
+        assert not outbox.join(timeout=0.2)
+        outbox.close()
+
+        client = RecordingClient()
+        with open_outbox(tmp_path, client) as outbox:
+            assert outbox.join(timeout=5)
+        assert len(client.calls) == 1
+
+    def test_close_leaves_the_backlog_pending(self, tmp_path):
+        """Closing does not wait for queued requests to be delivered."""
+        client = RecordingClient(delay=0.01)
+        outbox = open_outbox(tmp_path, client, concurrency=1)
+        for n in range(300):
+            outbox.enqueue("POST", "/message/sendText/i", json={"text": str(n)})
+        outbox.start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        outbox.close()
+
+        assert time.perf_counter() - started < 1
+        assert len(client.calls) < 300
+        outbox = open_outbox(tmp_path, RecordingClient())
+        assert outbox.stats().pending == 300 - len(client.calls)
+        outbox.close()
+
+    def test_compacts_when_drained(self, tmp_path):
+        """The log files are truncated once every record was delivered."""
+        with open_outbox(tmp_path, RecordingClient(), compact_threshold=1) as outbox:
+            for n in range(10):
+                outbox.enqueue("POST", "/instance/create", json={"instanceName": n})
+            assert outbox.join(timeout=5)
+            outbox.enqueue("POST", "/instance/create", json={"instanceName": "z"})
+            assert outbox.join(timeout=5)
+
+        assert os.path.getsize(os.path.join(tmp_path, "outbox.log")) == 0
+        assert os.path.getsize(os.path.join(tmp_path, "outbox.ack")) == 0
+
+    def test_crash_during_compaction_loses_nothing(self, tmp_path):
+        """New records are not mistaken for acknowledged ones after a crash."""
+        outbox = open_outbox(tmp_path, RecordingClient(), compact_threshold=1)
+        outbox._acks = CrashingFile(outbox._acks)
+        for n in range(3):
+            outbox.enqueue("POST", "/instance/create", json={"instanceName": n})
+        outbox.start()
+        outbox.close()
+
+        down = RecordingClient(failures=[requests.ConnectionError("down")] * 100)
+        outbox = open_outbox(tmp_path, down, retry_delay=10)
+        outbox.enqueue("POST", "/instance/create", json={"instanceName": "new"})
+        outbox.close()
+
+        client = RecordingClient()
+        with open_outbox(tmp_path, client) as outbox:
+            assert outbox.join(timeout=5)
+        assert [kwargs["json"]["instanceName"] for _, _, kwargs in client.calls] == [
+            "new"
+        ]
+
+    def test_dead_letter_callback_errors_do_not_stop_the_sender(self, tmp_path):
+        client = RecordingClient(failures=[EvolutionAPIError(400, "bad request")])
+
+        def on_dead_letter(record, exc):
+            raise RuntimeError("alerting is down")
+
+        with open_outbox(
+            tmp_path, client, concurrency=1, on_dead_letter=on_dead_letter
+        ) as outbox:
+            outbox.enqueue("POST", "/instance/create", json={"instanceName": "x"})
+            outbox.enqueue("POST", "/instance/create", json={"instanceName": "y"})
+            assert outbox.join(timeout=5)
+            stats = outbox.stats()
+
+        assert len(client.calls) == 1
+        assert stats.dead_lettered == 1
+        assert stats.delivered == 1
+
+    def test_instances_resource_is_queued(self, tmp_path):
+        """Resource write calls return immediately and go through the outbox."""
+        client = RecordingClient()
+        with open_outbox(tmp_path, client) as outbox:
+            response = outbox.instances.create(instance_name="queued")
+            assert response["queued"] is True
+            assert outbox.instances.fetch("queued") == {"instances": []}
+            assert outbox.join(timeout=5)
+
+        method, path, kwargs = client.calls[0]
+        assert (method, path) == ("POST", "/instance/create")
+        assert kwargs["json"]["instanceName"] == "queued"
+        assert kwargs["headers"][IDEMPOTENCY_HEADER] == response["idempotencyKey"]
+
+    def test_invalid_concurrency(self, tmp_path):
+        with pytest.raises(ValueError):
+            Outbox(RecordingClient(), str(tmp_path), concurrency=0)
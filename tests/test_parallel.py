@@ -0,0 +1,216 @@
+import json
+import os
+import pickle
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import CircuitOpenError, EvolutionAPIError, RateLimitError
+from evolutionapi.multinode import BalancingStrategy, MultiNodeEvolutionAPI
+from evolutionapi.parallel import ProcessPool, RemoteError, ShardError, instance_key
+from evolutionapi.transports import InMemoryTransport
+
+# Worker functions must be importable by the spawned processes.
+
+
+def record(client, item):
+    instance_name, n = item
+    time.sleep(0.001 * (n % 3))
+    return {"pid": os.getpid(), "instance": instance_name, "n": n}
+
+
+def fail_some(client, item):
+    if item == "missing":
+        raise EvolutionAPIError(404, "Not Found", {"status": 404})
+    if item == "local":
+        raise ValueError(lambda: None)  # the lambda cannot be pickled
+    return item
+
+
+def crash_on(client, item):
+    if item == "crash":
+        os._exit(3)
+    return item
+
+
+def broken_factory():
+    raise RuntimeError("no credentials")
+
+
+def fetch(client, instance_name):
+    return client.instances.fetch(instance_name)
+
+
+def slow(client, item):
+    time.sleep(0.05)
+    return item
+
+
+class FetchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        body = json.dumps({"path": self.path, "apikey": self.headers["apikey"]})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+
+@pytest.fixture
+def handler():
+    return FetchHandler
+
+
+@pytest.fixture
+def pool():
+    return ProcessPool(partial(EvolutionAPI, "http://localhost", "key"), processes=2)
+
+
+class TestProcessPool:
+    def test_sticky_sharding_preserves_order(self, pool):
+        instances = [f"instance-{i}" for i in range(6)]
+        items = [(name, n) for n in range(5) for name in instances]
+
+        results = list(pool.map(record, items))
+
+        assert len(results) == len(items)
+        assert all(result.ok for result in results)
+        assert all(result.item == items[result.index] for result in results)
+        for name in instances:
+            done = [r.result for r in results if r.result["instance"] == name]
+            assert [d["n"] for d in done] == list(range(5))
+            assert len({d["pid"] for d in done}) == 1
+        assert len({r.result["pid"] for r in results}) == 2
+
+    def test_per_item_errors(self, pool):
+        results = {r.item: r for r in pool.map(fail_some, ["a", "missing", "local"])}
+
+        assert results["a"].result == "a"
+        assert isinstance(results["missing"].error, EvolutionAPIError)
+        assert results["missing"].error.status_code == 404
+        assert results["missing"].error.response == {"status": 404}
+        assert isinstance(results["local"].error, RemoteError)
+        assert "ValueError" in results["local"].error.message
+        assert "fail_some" in results["local"].error.remote_traceback
+
+    def test_crashed_worker_fails_its_shard_only(self, pool):
+        names = ["crash"] + [f"instance-{i}" for i in range(8)]
+        crashed = pool.shard_of("crash")
+
+        results = list(pool.map(crash_on, names))
+
+        assert sorted(r.index for r in results) == list(range(len(names)))
+        for result in results:
+            if result.item == "crash":
+                assert isinstance(result.error, ShardError)
+                assert result.error.shard == crashed
+            elif pool.shard_of(result.item) != crashed:
+                assert result.result == result.item
+            else:
+                # Calls running alongside the crash may have reported first.
+                assert result.ok or isinstance(result.error, ShardError)
+
+    def test_client_factory_failure(self):
+        pool = ProcessPool(broken_factory, processes=2)
+
+        results = list(pool.map(crash_on, ["a", "b", "c"]))
+
+        assert len(results) == 3
+        for result in results:
+            assert isinstance(result.error, ShardError)
+            assert "no credentials" in result.error.message
+            assert "RuntimeError" in result.error.remote_traceback
+
+    def test_cancel(self, pool):
+        items = [f"instance-{i}" for i in range(200)]
+        results = []
+
+        started = time.monotonic()
+        with pool:
+            for result in pool.map(slow, items):
+                results.append(result)
+                if len(results) == 3:
+                    pool.cancel()
+
+        assert 3 <= len(results) < len(items)
+        assert all(result.ok for result in results)
+        assert time.monotonic() - started < 5
+
+    def test_workers_use_their_own_client(self, base_url):
+        client = EvolutionAPI(base_url, "secret")
+        pool = ProcessPool.from_client(client, processes=2, threads=2)
+
+        results = sorted(pool.map(fetch, ["a", "b", "c"]), key=lambda r: r.index)
+
+        assert [r.result for r in results] == [
+            {
+                "path": f"/instance/fetchInstances?instanceName={name}",
+                "apikey": "secret",
+            }
+            for name in "abc"
+        ]
+
+    def test_from_multi_node_client(self):
+        client = MultiNodeEvolutionAPI(
+            ["http://node1", "http://node2"],
+            "secret",
+            strategy="sticky",
+            owners={"a": "http://node2"},
+            eject_after=5,
+        )
+
+        worker_client = ProcessPool.from_client(client).client_factory()
+
+        assert type(worker_client) is MultiNodeEvolutionAPI
+        assert worker_client.base_urls == ["http://node1", "http://node2"]
+        assert worker_client.api_key == "secret"
+        assert worker_client.strategy is BalancingStrategy.STICKY
+        assert worker_client.owners == {"a": "http://node2"}
+        assert worker_client.eject_after == 5
+
+    def test_from_client_refuses_what_it_cannot_copy(self):
+        class CustomClient(EvolutionAPI):
+            pass
+
+        transport = InMemoryTransport(lambda request: (200, {}))
+        with pytest.raises(TypeError):
+            ProcessPool.from_client(EvolutionAPI("http://a", "k", transport=transport))
+        with pytest.raises(TypeError):
+            ProcessPool.from_client(
+                MultiNodeEvolutionAPI(
+                    ["http://a", "http://b"], "k", transport=transport
+                )
+            )
+        with pytest.raises(TypeError):
+            ProcessPool.from_client(CustomClient("http://a", "k"))
+
+
+class TestHelpers:
+    def test_instance_key(self):
+        assert instance_key("a") == "a"
+        assert instance_key(("a", "5511999999999", {})) == "a"
+        assert instance_key({"instance_name": "a"}) == "a"
+        with pytest.raises(TypeError):
+            instance_key(1)
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            EvolutionAPIError(500, "boom", {"error": "boom"}),
+            RateLimitError(1.5, "instance:a"),
+            CircuitOpenError("http://x", 2.0),
+        ],
+    )
+    def test_client_errors_are_picklable(self, error):
+        copy = pickle.loads(pickle.dumps(error))
+        assert type(copy) is type(error)
+        assert copy.__dict__ == error.__dict__
+        assert str(copy) == str(error)
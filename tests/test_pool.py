@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.pool import PoolConfig, PooledHTTPAdapter, PoolStats
+
+
+class TestPoolConfig:
+    def test_defaults(self):
+        """Test that defaults match requests' own adapter defaults."""
+        config = PoolConfig()
+
+        assert config.pool_connections == 10
+        assert config.pool_maxsize == 10
+        assert config.pool_block is False
+        assert config.keep_alive is True
+        assert config.timeout is None
+
+    def test_timeout_tuple(self):
+        """Test that connect/read timeouts are combined for requests."""
+        assert PoolConfig(connect_timeout=1.5).timeout == (1.5, None)
+        assert PoolConfig(connect_timeout=1, read_timeout=30).timeout == (1, 30)
+
+    def test_adapter_uses_config(self):
+        """Test that the adapter applies the pool settings."""
+        adapter = PooledHTTPAdapter(
+            PoolConfig(pool_connections=4, pool_maxsize=32, pool_block=True)
+        )
+
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+        assert adapter.poolmanager.connection_pool_kw["block"] is True
+        assert adapter.stats() == PoolStats()
+
+
+class TestPoolStats:
+    def test_connections_are_reused(self, base_url):
+        """Test that sequential requests reuse a single keep-alive connection."""
+        client = EvolutionAPI(base_url, "test-api-key")
+
+        for _ in range(5):
+            assert client._get("/") == {"status": "ok"}
+
+        assert client.pool_stats() == PoolStats(created=1, reused=4, discarded=0)
+
+    def test_keep_alive_disabled(self, base_url):
+        """Test that disabling keep-alive opens a connection per request."""
+        client = EvolutionAPI(
+            base_url, "test-api-key", pool_config=PoolConfig(keep_alive=False)
+        )
+
+        for _ in range(3):
+            client._get("/")
+
+        assert client.session.headers["Connection"] == "close"
+        assert client.pool_stats().created == 3
+        assert client.pool_stats().reused == 0
+
+    def test_discarded_when_pool_is_full(self, base_url):
+        """Test that connections beyond pool_maxsize are counted as discarded."""
+        client = EvolutionAPI(
+            base_url, "test-api-key", pool_config=PoolConfig(pool_maxsize=1)
+        )
+        barrier = threading.Barrier(4)
+
+        def call(_):
+            barrier.wait()
+            return client._get("/")
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(call, range(4)))
+
+        stats = client.pool_stats()
+        assert stats.created + stats.reused == 4
+        assert stats.discarded == stats.created - 1
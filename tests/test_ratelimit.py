@@ -0,0 +1,164 @@
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError, RateLimitError
+from evolutionapi.ratelimit import InMemoryBackend, Rate, RateLimiter, api_key_scope
+
+
+class TestRate:
+    def test_defaults(self):
+        rate = Rate(10, period=2)
+
+        assert rate.per_second == 5
+        assert rate.capacity == 10
+        assert Rate(10, burst=1).capacity == 1
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            Rate(0)
+        with pytest.raises(ValueError):
+            Rate(0.5)
+        with pytest.raises(ValueError):
+            Rate(10, burst=0.5)
+        assert Rate(1, period=2).per_second == 0.5
+
+
+class TestInMemoryBackend:
+    def test_burst_then_refill(self, clock):
+        """Test that a bucket allows its burst and then refills over time."""
+        backend = InMemoryBackend(clock=clock)
+        bucket = [("key", Rate(2, burst=2))]
+
+        assert backend.acquire(bucket) == 0
+        assert backend.acquire(bucket) == 0
+        assert backend.acquire(bucket) == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert backend.acquire(bucket) == 0
+
+    def test_tokens_over_capacity(self, clock):
+        """Test that a request the bucket can never satisfy is refused."""
+        backend = InMemoryBackend(clock=clock)
+
+        with pytest.raises(ValueError):
+            backend.acquire([("key", Rate(10, burst=2))], tokens=3)
+
+    def test_all_or_nothing(self, clock):
+        """Test that no tokens are taken when one bucket is empty."""
+        backend = InMemoryBackend(clock=clock)
+        wide = ("wide", Rate(10))
+        narrow = ("narrow", Rate(1))
+
+        assert backend.acquire([wide, narrow]) == 0
+        assert backend.acquire([wide, narrow]) > 0
+        # the wide bucket was not charged for the rejected request
+        assert all(backend.acquire([wide]) == 0 for _ in range(9))
+        assert backend.acquire([wide]) > 0
+
+    def test_thread_safety(self, clock):
+        """Test that concurrent threads never take more than the capacity."""
+        backend = InMemoryBackend(clock=clock)
+        bucket = [("key", Rate(100))]
+        granted = []
+
+        def worker():
+            for _ in range(50):
+                if backend.acquire(bucket) == 0:
+                    granted.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(granted) == 100
+
+
+class TestRateLimiter:
+    def test_buckets_for(self):
+        """Test global, path prefix and per instance buckets."""
+        limiter = RateLimiter(
+            rate=Rate(50),
+            paths={"/instance/*": Rate(5), "/instance/create": Rate(1)},
+            per_instance=Rate(2),
+            instances={"vip": Rate(20)},
+        )
+
+        buckets = dict(limiter.buckets_for("/instance/create", "a", scope="s"))
+        assert buckets == {
+            "s:global": Rate(50),
+            "s:path:/instance/create": Rate(1),
+            "s:instance:a": Rate(2),
+        }
+        assert dict(limiter.buckets_for("/message/sendText/vip", "vip"))[
+            ":instance:vip"
+        ] == Rate(20)
+        assert RateLimiter().buckets_for("/path") == []
+
+    def test_blocking_waits(self, clock):
+        """Test that blocking mode sleeps until a token is available."""
+        limiter = RateLimiter(rate=Rate(1), backend=InMemoryBackend(clock=clock))
+
+        assert limiter.acquire("/path", sleep=clock.sleep) == 0
+        assert limiter.acquire("/path", sleep=clock.sleep) == pytest.approx(1)
+        assert clock.now == pytest.approx(1)
+
+    def test_non_blocking_raises(self, clock):
+        """Test that non-blocking mode raises and try_acquire returns False."""
+        limiter = RateLimiter(
+            per_instance=Rate(1), backend=InMemoryBackend(clock=clock)
+        )
+        limiter.acquire("/message/sendText/a", "a")
+
+        assert not limiter.try_acquire("/message/sendText/a", "a")
+        assert limiter.try_acquire("/message/sendText/b", "b")
+
+        limiter.blocking = False
+        with pytest.raises(RateLimitError) as excinfo:
+            limiter.acquire("/message/sendText/a", "a")
+
+        assert isinstance(excinfo.value, EvolutionAPIError)
+        assert excinfo.value.status_code == 429
+        assert excinfo.value.retry_after == pytest.approx(1)
+
+    def test_max_wait(self, clock):
+        """Test that blocking mode gives up past max_wait."""
+        limiter = RateLimiter(
+            rate=Rate(1, period=10), backend=InMemoryBackend(clock=clock), max_wait=1
+        )
+        limiter.acquire("/path", sleep=clock.sleep)
+
+        with pytest.raises(RateLimitError):
+            limiter.acquire("/path", sleep=clock.sleep)
+
+
+class TestClientRateLimit:
+    def test_requests_are_limited_per_instance(self, clock):
+        """Test that the client consults the limiter before sending."""
+        limiter = RateLimiter(
+            per_instance=Rate(1),
+            backend=InMemoryBackend(clock=clock),
+            blocking=False,
+        )
+        with patch("evolutionapi.client.requests.Session") as mock_session:
+            response = Mock(status_code=200)
+            response.json.return_value = {}
+            mock_session.return_value.request.return_value = response
+            client = EvolutionAPI(
+                "https://api.example.com", "key", rate_limiter=limiter
+            )
+
+            client.instances.create(instance_name="a")
+            client.instances.fetch("b")
+            with pytest.raises(RateLimitError):
+                client.instances.fetch("a")
+
+        assert mock_session.return_value.request.call_count == 2
+
+    def test_scope_hides_api_key(self):
+        assert "secret" not in api_key_scope("secret")
+        assert api_key_scope("a") != api_key_scope("b")
@@ -0,0 +1,220 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.registry import CLOSE, CONNECTING, OPEN, InstanceRegistry
+from evolutionapi.transports import InMemoryTransport
+from evolutionapi.webhooks import WebhookDispatcher, parse_event
+
+
+def instance(name, status=OPEN, owner=None):
+    data = {"instanceName": name, "status": status}
+    if owner:
+        data["owner"] = owner
+    return {"instance": data}
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.instances.iter_all.return_value = [
+        instance("a", OPEN, "5511999990001@s.whatsapp.net"),
+        instance("b", CONNECTING),
+        instance("c", CLOSE),
+    ]
+    return client
+
+
+@pytest.fixture
+def registry(client, clock):
+    registry = InstanceRegistry(client, clock=clock)
+    registry.refresh()
+    return registry
+
+
+def event(name, instance_name, **data):
+    return parse_event({"event": name, "instance": instance_name, "data": data})
+
+
+class TestSnapshot:
+    def test_indexes(self, registry):
+        assert len(registry) == 3
+        assert "a" in registry
+        assert registry.status("b") == CONNECTING
+        assert registry.with_status(OPEN) == {"a"}
+        assert registry.counts() == {OPEN: 1, CONNECTING: 1, CLOSE: 1}
+        assert [r.instance_name for r in registry.by_number("5511999990001")] == ["a"]
+        assert [
+            r.instance_name for r in registry.by_owner("5511999990001@s.whatsapp.net")
+        ] == ["a"]
+        assert registry.get("missing") is None
+
+    def test_refresh_reports_transitions(self, client, registry):
+        """A new snapshot notifies changed, added and removed instances only."""
+        transitions = []
+        registry.subscribe(transitions.append)
+        client.instances.iter_all.return_value = [
+            instance("a", OPEN, "5511999990001@s.whatsapp.net"),
+            instance("b", OPEN),
+            instance("d", CONNECTING),
+        ]
+
+        assert registry.refresh() == 3
+
+        changes = {(t.instance_name, t.previous, t.current) for t in transitions}
+        assert changes == {
+            ("b", CONNECTING, OPEN),
+            ("c", CLOSE, None),
+            ("d", None, CONNECTING),
+        }
+        assert registry.with_status(CLOSE) == set()
+        assert registry.with_status(OPEN) == {"a", "b"}
+
+    def test_events_during_refresh_are_kept(self, client, registry):
+        """A snapshot older than an event does not revert the event."""
+        transitions = []
+        registry.subscribe(transitions.append)
+
+        def stale_snapshot():
+            yield instance("a", OPEN, "5511999990001@s.whatsapp.net")
+            registry.apply_event(event("CONNECTION_UPDATE", "b", state="open"))
+            registry.apply_event(event("CONNECTION_UPDATE", "d", state="open"))
+            yield instance("b", CONNECTING)
+            yield instance("c", CLOSE)
+
+        client.instances.iter_all.side_effect = stale_snapshot
+
+        assert registry.refresh() == 0
+        assert registry.status("b") == OPEN
+        assert registry.status("d") == OPEN
+        assert [(t.instance_name, t.current) for t in transitions] == [
+            ("b", OPEN),
+            ("d", OPEN),
+        ]
+
+
+class TestEvents:
+    def test_connection_update(self, registry):
+        transitions = []
+        registry.subscribe(transitions.append, status=OPEN)
+
+        changed = registry.apply_event(
+            event(
+                "connection.update",
+                "b",
+                state="open",
+                wuid="5511999990002@s.whatsapp.net",
+            )
+        )
+
+        assert changed
+        assert registry.status("b") == OPEN
+        assert [r.instance_name for r in registry.by_number("5511999990002")] == ["b"]
+        assert [(t.instance_name, t.previous) for t in transitions] == [
+            ("b", CONNECTING)
+        ]
+
+    def test_same_state_is_not_a_transition(self, registry):
+        transitions = []
+        registry.subscribe(transitions.append)
+        assert not registry.apply_event(event("CONNECTION_UPDATE", "a", state="open"))
+        assert transitions == []
+
+    def test_qrcode_logout_and_remove(self, registry):
+        assert registry.apply_event(event("QRCODE_UPDATED", "c", qrcode={}))
+        assert registry.status("c") == CONNECTING
+        assert registry.apply_event(event("LOGOUT_INSTANCE", "a"))
+        assert registry.status("a") == CLOSE
+        assert registry.by_number("5511999990001")[0].status == CLOSE
+        assert registry.apply_event(event("REMOVE_INSTANCE", "a"))
+        assert "a" not in registry
+        assert registry.by_number("5511999990001") == []
+
+    def test_unknown_instance_is_added(self, registry):
+        assert registry.apply_event(event("CONNECTION_UPDATE", "new", state="open"))
+        assert registry.status("new") == OPEN
+
+    def test_other_events_are_ignored(self, registry):
+        assert not registry.apply_event(event("MESSAGES_UPSERT", "a", key={"id": "1"}))
+
+    def test_subscriber_errors_are_isolated(self, registry):
+        calls = []
+
+        @registry.subscribe
+        def failing(transition):
+            raise RuntimeError("boom")
+
+        registry.subscribe(calls.append)
+        registry.apply_event(event("CONNECTION_UPDATE", "c", state="open"))
+        assert len(calls) == 1
+
+    def test_attach_to_dispatcher(self, registry):
+        dispatcher = WebhookDispatcher(workers=1)
+        registry.attach(dispatcher)
+        with dispatcher:
+            assert dispatcher.submit(event("CONNECTION_UPDATE", "c", state="open"))
+        assert registry.status("c") == OPEN
+
+
+class TestPolling:
+    def test_poll_refreshes_connecting_instances(self, client, registry):
+        client.instances.fetch.return_value = [instance("b", OPEN)]
+
+        assert registry.poll() == 1
+
+        client.instances.fetch.assert_called_once_with("b")
+        assert registry.status("b") == OPEN
+        assert client.instances.iter_all.call_count == 1
+
+    def test_poll_takes_full_snapshot_when_stale(self, client, registry, clock):
+        clock.now = registry.max_poll_interval
+        registry.poll()
+        assert client.instances.iter_all.call_count == 2
+        client.instances.fetch.assert_not_called()
+
+    def test_events_during_instance_refresh_are_kept(self, client, registry):
+        def stale_fetch(name):
+            registry.apply_event(event("CONNECTION_UPDATE", "b", state="open"))
+            return [instance("b", CONNECTING)]
+
+        client.instances.fetch.side_effect = stale_fetch
+
+        assert not registry.refresh_instance("b")
+        assert registry.status("b") == OPEN
+
+    def test_lazy_responses(self):
+        transport = InMemoryTransport(lambda request: (200, [instance("a", OPEN)]))
+        client = EvolutionAPI(
+            "http://test", "key", transport=transport, lazy_responses=True
+        )
+        registry = InstanceRegistry(client)
+
+        assert registry.refresh_instance("a")
+        assert registry.status("a") == OPEN
+
+    def test_deleted_instance_is_removed(self, client, registry):
+        client.instances.fetch.side_effect = EvolutionAPIError(404, "Not Found")
+        assert registry.poll() == 1
+        assert "b" not in registry
+
+    def test_interval_adapts(self, client, registry):
+        client.instances.fetch.return_value = [instance("b", CONNECTING)]
+        registry.poll_interval = 20
+        registry.poll()
+        assert registry.poll_interval == 40
+
+        client.instances.fetch.return_value = [instance("b", OPEN)]
+        registry.poll()
+        assert registry.poll_interval == 20
+
+        registry.apply_event(event("CONNECTION_UPDATE", "a", state="close"))
+        registry.poll()
+        assert registry.poll_interval == registry.max_poll_interval
+
+    def test_start_and_stop(self, client):
+        registry = InstanceRegistry(client, min_poll_interval=0.01)
+        with registry:
+            assert len(registry) == 3
+        assert registry._poller is None
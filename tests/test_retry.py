@@ -0,0 +1,173 @@
+from email.utils import formatdate
+from time import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.retry import RetryPolicy, RetryStats, parse_retry_after
+
+
+def make_response(status_code, payload=None, headers=None):
+    response = Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = payload if payload is not None else {}
+    return response
+
+
+class TestRetryPolicy:
+    def test_exponential_backoff(self):
+        """Test that delays double and are capped without jitter."""
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+
+        assert [policy.backoff(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+
+    def test_jitter_bounds(self):
+        """Test that jittered delays stay between 0 and the backoff."""
+        policy = RetryPolicy(backoff_factor=1)
+
+        assert all(0 <= policy.backoff(3) <= 4 for _ in range(100))
+
+    def test_method_allowlist(self):
+        """Test that POST is only retried for opted-in paths."""
+        policy = RetryPolicy(retry_post_paths=frozenset({"/instance/create"}))
+
+        assert policy.is_retryable("GET", "/instance/fetchInstances")
+        assert policy.is_retryable("POST", "/instance/create")
+        assert not policy.is_retryable("POST", "/message/sendText/a")
+        assert not RetryPolicy().is_retryable("POST", "/instance/create")
+
+    def test_next_delay(self):
+        """Test attempt limits, Retry-After and the deadline budget."""
+        policy = RetryPolicy(max_attempts=3, jitter=False, deadline=10)
+
+        assert policy.next_delay("GET", "/path", 1, 0) == 0.5
+        assert policy.next_delay("GET", "/path", 1, 0, retry_after="3") == 3
+        assert policy.next_delay("GET", "/path", 3, 0) is None
+        assert policy.next_delay("GET", "/path", 1, 0, retry_after="20") is None
+        assert policy.next_delay("POST", "/path", 1, 0) is None
+
+    def test_retry_after_is_bounded_by_max_backoff(self):
+        """Test that a Retry-After longer than max_backoff ends the retries."""
+        policy = RetryPolicy(max_backoff=5, jitter=False)
+
+        assert policy.next_delay("GET", "/path", 1, 0, retry_after="5") == 5
+        assert policy.next_delay("GET", "/path", 1, 0, retry_after="3600") is None
+        assert (
+            RetryPolicy(max_backoff=5, respect_retry_after=False).next_delay(
+                "GET", "/path", 1, 0, retry_after="3600"
+            )
+            <= 0.5
+        )
+
+    def test_parse_retry_after(self):
+        """Test delay-seconds and HTTP-date formats."""
+        assert parse_retry_after("7") == 7
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        assert 25 <= parse_retry_after(formatdate(time() + 30, usegmt=True)) <= 30
+
+
+class TestClientRetries:
+    @pytest.fixture
+    def mock_session(self):
+        with patch("evolutionapi.client.requests.Session") as mock_session:
+            session_instance = Mock()
+            mock_session.return_value = session_instance
+            yield session_instance
+
+    @pytest.fixture
+    def mock_sleep(self):
+        with patch("evolutionapi.client.time.sleep") as mock_sleep:
+            yield mock_sleep
+
+    def make_client(self, **policy_kwargs):
+        policy_kwargs.setdefault("jitter", False)
+        return EvolutionAPI(
+            "https://api.example.com",
+            "test-api-key",
+            retry_policy=RetryPolicy(**policy_kwargs),
+        )
+
+    def test_retries_transient_status(self, mock_session, mock_sleep):
+        """Test that 503s are retried until a success."""
+        mock_session.request.side_effect = [
+            make_response(503),
+            make_response(503),
+            make_response(200, {"data": "ok"}),
+        ]
+        client = self.make_client()
+
+        assert client._get("/test-path") == {"data": "ok"}
+        assert mock_session.request.call_count == 3
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0]
+        assert client.retry_stats() == RetryStats(
+            retries=2, retried_requests=1, exhausted=0, backoff_seconds=1.5
+        )
+
+    def test_honors_retry_after(self, mock_session, mock_sleep):
+        """Test that 429 responses wait for Retry-After."""
+        mock_session.request.side_effect = [
+            make_response(429, headers={"Retry-After": "2"}),
+            make_response(200, {"data": "ok"}),
+        ]
+        client = self.make_client()
+
+        assert client._get("/test-path") == {"data": "ok"}
+        mock_sleep.assert_called_once_with(2.0)
+
+    def test_gives_up_after_max_attempts(self, mock_session, mock_sleep):
+        """Test that the last error is raised once attempts are exhausted."""
+        mock_session.request.return_value = make_response(502, {"error": "Bad Gateway"})
+        client = self.make_client(max_attempts=2)
+
+        with pytest.raises(EvolutionAPIError) as excinfo:
+            client._get("/test-path")
+
+        assert excinfo.value.status_code == 502
+        assert mock_session.request.call_count == 2
+        assert client.retry_stats().exhausted == 1
+
+    def test_retries_connection_errors(self, mock_session, mock_sleep):
+        """Test that connection resets are retried and re-raised at the end."""
+        mock_session.request.side_effect = requests.ConnectionError("reset")
+        client = self.make_client(max_attempts=3)
+
+        with pytest.raises(requests.ConnectionError):
+            client._get("/test-path")
+
+        assert mock_session.request.call_count == 3
+
+    def test_post_not_retried_by_default(self, mock_session, mock_sleep):
+        """Test that non-idempotent requests are sent only once."""
+        mock_session.request.return_value = make_response(503)
+        client = self.make_client()
+
+        with pytest.raises(EvolutionAPIError):
+            client.instances.create(instance_name="teste-docs")
+
+        assert mock_session.request.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_post_create_opt_in(self, mock_session, mock_sleep):
+        """Test that /instance/create is retried when opted in."""
+        mock_session.request.side_effect = [
+            make_response(503),
+            make_response(201, {"instance": {}}),
+        ]
+        client = self.make_client(retry_post_paths=frozenset({"/instance/create"}))
+
+        assert client.instances.create(instance_name="teste-docs") == {"instance": {}}
+        assert mock_session.request.call_count == 2
+
+    def test_client_errors_not_retried(self, mock_session, mock_sleep):
+        """Test that 4xx errors other than 429 fail immediately."""
+        mock_session.request.return_value = make_response(404, {"error": "Not Found"})
+        client = self.make_client()
+
+        with pytest.raises(EvolutionAPIError):
+            client._get("/test-path")
+
+        assert mock_session.request.call_count == 1
+        assert client.retry_stats() == RetryStats()
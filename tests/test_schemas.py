@@ -0,0 +1,80 @@
+import pytest
+from pydantic import ValidationError
+
+from evolutionapi.schemas import InstanceInfo, InstanceRecord
+
+PAYLOAD = {
+    "instance": {
+        "instanceName": "teste-docs",
+        "instanceId": "af6c5b7c-ee27-4f94-9ea8-192393746ddd",
+        "status": "close",
+        "serverUrl": "https://example.evolution-api.com",
+        "apikey": "123456",
+        "integration": {
+            "token": "123456",
+            "webhook_wa_business": "https://example.evolution-api.com/webhook",
+        },
+    }
+}
+
+
+class TestInstanceRecord:
+    def test_from_payload(self):
+        """Test that fields are read from the payload."""
+        record = InstanceRecord.from_payload(PAYLOAD)
+
+        assert record.instance_name == "teste-docs"
+        assert record.status == "close"
+        assert record.owner is None
+        assert record.extra is None
+
+    def test_shares_payload_values(self):
+        """Test that values are referenced rather than copied."""
+        record = InstanceRecord.from_payload(PAYLOAD)
+
+        assert record.integration is PAYLOAD["instance"]["integration"]
+        assert record.apikey is PAYLOAD["instance"]["apikey"]
+
+    def test_accepts_inner_mapping(self):
+        assert InstanceRecord.from_payload(PAYLOAD["instance"]) == (
+            InstanceRecord.from_payload(PAYLOAD)
+        )
+
+    def test_is_slotted(self):
+        record = InstanceRecord.from_payload(PAYLOAD)
+
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.unknown = 1
+
+    def test_keeps_unknown_fields(self):
+        """Test that fields added by newer servers are not lost."""
+        record = InstanceRecord.from_payload(
+            {"instance": {"instanceName": "a", "newField": 1}}
+        )
+
+        assert record.extra == {"newField": 1}
+        assert record.to_dict() == {"instanceName": "a", "newField": 1}
+
+    def test_round_trip(self):
+        assert InstanceRecord.from_payload(PAYLOAD).to_dict() == PAYLOAD["instance"]
+
+    def test_from_payloads(self):
+        records = list(InstanceRecord.from_payloads([PAYLOAD, PAYLOAD]))
+
+        assert [record.instance_name for record in records] == ["teste-docs"] * 2
+
+    def test_validate(self):
+        """Test that validation builds the pydantic model on request."""
+        info = InstanceRecord.from_payload(PAYLOAD).validate()
+
+        assert isinstance(info, InstanceInfo)
+        assert info.instance_name == "teste-docs"
+        assert info.integration.token == "123456"
+
+    def test_validate_invalid(self):
+        """Test that invalid records are only rejected when validated."""
+        record = InstanceRecord.from_payload({"instance": {"instanceName": 42}})
+
+        with pytest.raises(ValidationError):
+            record.validate()
@@ -0,0 +1,196 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from evolutionapi.async_client import AsyncEvolutionAPI
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_result(self):
+        """Test that concurrent callers with the same key share one call."""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def slow():
+            calls.append(1)
+            release.wait(1)
+            return {"status": "open"}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(flight.do, "key", slow) for _ in range(8)]
+            while flight.coalesced < 7:
+                time.sleep(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert len(calls) == 1
+        assert results == [{"status": "open"}] * 8
+        assert flight.coalesced == 7
+
+    def test_error_is_shared(self):
+        """Test that followers receive the leader's exception."""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def failing():
+            release.wait(1)
+            raise EvolutionAPIError(status_code=503, error_message="Unavailable")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(flight.do, "key", failing) for _ in range(2)]
+            while flight.coalesced < 1:
+                time.sleep(0.001)
+            release.set()
+            for future in futures:
+                with pytest.raises(EvolutionAPIError):
+                    future.result()
+
+    def test_sequential_calls_are_not_shared(self):
+        """Test that a finished call is not reused by later callers."""
+        flight = SingleFlight()
+        func = Mock(return_value=1)
+
+        flight.do("key", func)
+        flight.do("key", func)
+
+        assert func.call_count == 2
+        assert flight.coalesced == 0
+
+
+class TestAsyncSingleFlight:
+    def test_concurrent_calls_share_result(self):
+        """Test that concurrent tasks with the same key share one call."""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", slow) for _ in range(5)))
+
+        assert asyncio.run(run()) == ["result"] * 5
+        assert len(calls) == 1
+        assert flight.coalesced == 4
+
+    def test_error_is_shared(self):
+        """Test that waiting tasks receive the leader's exception."""
+        flight = AsyncSingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise EvolutionAPIError(status_code=503, error_message="Unavailable")
+
+        async def run():
+            return await asyncio.gather(
+                *(flight.do("key", failing) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, EvolutionAPIError) for r in results)
+
+    def test_cancelled_leader_hands_over_the_call(self):
+        """Test that cancelling the leader does not cancel the waiting tasks."""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do("key", slow))
+            await asyncio.sleep(0)
+            followers = [
+                asyncio.ensure_future(flight.do("key", slow)) for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            leader.cancel()
+            results = await asyncio.gather(*followers)
+            return leader.cancelled(), results
+
+        cancelled, results = asyncio.run(run())
+
+        assert cancelled
+        assert results == ["result"] * 3
+        assert len(calls) == 2
+
+
+class TestClientCoalescing:
+    def test_sync_client_coalesces_fetch(self):
+        """Test that concurrent identical fetches issue one HTTP request."""
+        release = threading.Event()
+        response = Mock(status_code=200)
+        response.json.return_value = [{"instance": {"instanceName": "a"}}]
+
+        def request(*args, **kwargs):
+            release.wait(1)
+            return response
+
+        with patch("evolutionapi.client.requests.Session") as mock_session:
+            mock_session.return_value.request.side_effect = request
+            client = EvolutionAPI("https://api.example.com", "key", coalesce=True)
+
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                futures = [
+                    executor.submit(client.instances.fetch, "a") for _ in range(6)
+                ]
+                while client.single_flight.coalesced < 5:
+                    time.sleep(0.001)
+                release.set()
+                results = [future.result() for future in futures]
+
+        assert mock_session.return_value.request.call_count == 1
+        assert all(result == results[0] for result in results)
+
+    def test_sync_client_does_not_coalesce_writes(self):
+        """Test that POST requests are never deduplicated."""
+        with patch("evolutionapi.client.requests.Session") as mock_session:
+            response = Mock(status_code=200)
+            response.json.return_value = {}
+            mock_session.return_value.request.return_value = response
+            client = EvolutionAPI("https://api.example.com", "key", coalesce=True)
+
+            client.instances.create(instance_name="a")
+            client.instances.create(instance_name="a")
+
+        assert mock_session.return_value.request.call_count == 2
+
+    def test_async_client_coalesces_fetch(self):
+        """Test that concurrent identical async fetches issue one request."""
+        requests = []
+
+        async def handler(request):
+            requests.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=[{"instance": {"instanceName": "a"}}])
+
+        async def run():
+            async with AsyncEvolutionAPI(
+                "https://api.example.com",
+                "key",
+                transport=httpx.MockTransport(handler),
+                coalesce=True,
+            ) as client:
+                results = await asyncio.gather(
+                    *(client.instances.fetch("a") for _ in range(10))
+                )
+                return results, client.single_flight.coalesced
+
+        results, coalesced = asyncio.run(run())
+
+        assert len(requests) == 1
+        assert coalesced == 9
+        assert len(results) == 10
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import tracemalloc
+
+import httpx
+import pytest
+import requests_mock
+
+from evolutionapi.async_client import AsyncEvolutionAPI
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.streaming import (
+    JSONArrayParser,
+    aiter_json_array,
+    iter_json_array,
+)
+
+ITEMS = [
+    {"instance": {"instanceName": "olá-1", "status": "open"}},
+    12345,
+    -1.5e3,
+    "text with ] and , inside",
+    [1, [2, 3]],
+    None,
+    True,
+]
+BODY = json.dumps(ITEMS, ensure_ascii=False).encode()
+
+
+def chunked(data: bytes, size: int):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+class TestJSONArrayParser:
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(BODY)])
+    def test_any_chunk_boundary(self, size):
+        """Test that items are parsed whatever the chunk boundaries are."""
+        assert list(iter_json_array(chunked(BODY, size))) == ITEMS
+
+    def test_yields_items_before_end_of_stream(self):
+        """Test that complete items are available before the array ends."""
+        parser = JSONArrayParser()
+
+        assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+        assert parser.feed(b": 2}, 12") == [{"b": 2}]
+        assert parser.feed(b"3]") == [123]
+        assert parser.close() == []
+
+    def test_empty_array(self):
+        assert list(iter_json_array([b" [ ", b"] "])) == []
+
+    def test_non_array_body(self):
+        """Test that other bodies are returned as a single item."""
+        assert list(iter_json_array([b'{"instance":', b" {}}"])) == [{"instance": {}}]
+
+    def test_truncated_array(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array([b'[{"a": 1}, {"b": ']))
+
+    def test_memory_stays_flat(self):
+        """Test that peak memory does not grow with the number of items."""
+        item = json.dumps(ITEMS[0]).encode()
+
+        def body(count):
+            yield b"["
+            for i in range(count):
+                yield (b"," if i else b"") + item
+            yield b"]"
+
+        def peak(count):
+            tracemalloc.start()
+            try:
+                for _ in iter_json_array(body(count)):
+                    pass
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        small, large = peak(500), peak(10_000)
+        assert large < small * 2
+
+
+class TestClientStreaming:
+    def test_iter_all(self):
+        """Test that instances are streamed from fetchInstances."""
+        client = EvolutionAPI("http://test", "key")
+
+        with requests_mock.Mocker() as m:
+            m.get("http://test/instance/fetchInstances", content=BODY)
+            result = list(client.instances.iter_all())
+
+        assert result == ITEMS
+        assert m.request_history[0].headers["apikey"] == "key"
+
+    def test_iter_all_error(self):
+        client = EvolutionAPI("http://test", "key")
+
+        with requests_mock.Mocker() as m:
+            m.get(
+                "http://test/instance/fetchInstances",
+                status_code=401,
+                json={"error": "Unauthorized"},
+            )
+            with pytest.raises(EvolutionAPIError) as excinfo:
+                list(client.instances.iter_all())
+
+        assert excinfo.value.status_code == 401
+
+    def test_async_iter_all(self):
+        """Test streaming with the async client."""
+
+        async def body():
+            for chunk in chunked(BODY, 5):
+                yield chunk
+
+        def handler(request):
+            return httpx.Response(200, content=body())
+
+        async def run():
+            async with AsyncEvolutionAPI(
+                "http://test", "key", transport=httpx.MockTransport(handler)
+            ) as client:
+                return [item async for item in client.instances.iter_all()]
+
+        assert asyncio.run(run()) == ITEMS
+
+    def test_aiter_json_array(self):
+        async def chunks():
+            for chunk in chunked(BODY, 3):
+                yield chunk
+
+        async def run():
+            return [item async for item in aiter_json_array(chunks())]
+
+        assert asyncio.run(run()) == ITEMS
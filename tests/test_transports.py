@@ -0,0 +1,247 @@
+import json
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from evolutionapi.client import EvolutionAPI
+from evolutionapi.exceptions import EvolutionAPIError
+from evolutionapi.multinode import MultiNodeEvolutionAPI
+from evolutionapi.pool import PoolConfig
+from evolutionapi.retry import RetryPolicy
+from evolutionapi.transports import (
+    HTTP2Transport,
+    InMemoryTransport,
+    RequestsTransport,
+    Transport,
+)
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/slow":
+            time.sleep(0.5)
+        if self.path == "/missing":
+            self.reply(404, {"error": "Not Found"})
+            return
+        if self.path == "/truncated":
+            self.send_response(200)
+            self.send_header("Content-Length", "100")
+            self.end_headers()
+            self.wfile.write(b"partial")
+            self.close_connection = True
+            return
+        self.reply(200, {"path": self.path, "apikey": self.headers["apikey"]})
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.reply(
+            201,
+            {
+                "path": self.path,
+                "contentType": self.headers["Content-Type"],
+                "body": body.decode(),
+            },
+        )
+
+
+@pytest.fixture
+def handler():
+    return EchoHandler
+
+
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+class TestTransport:
+    def test_is_abstract(self):
+        with pytest.raises(TypeError):
+            Transport()
+
+
+class TestRequestsTransport:
+    def test_is_the_default(self):
+        client = EvolutionAPI("http://test", "key")
+
+        assert isinstance(client.transport, RequestsTransport)
+        assert client.session is client.transport.session
+        assert client.adapter is client.transport.adapter
+        assert client.session.headers["apikey"] == "key"
+
+
+class TestInMemoryTransport:
+    def test_handler_answers_requests(self):
+        def handler(request):
+            if request.path_url == "/instance/fetchInstances?instanceName=a":
+                return 200, [{"instance": {"instanceName": "a"}}]
+            return 404, {"error": "Not Found"}
+
+        transport = InMemoryTransport(handler)
+        client = EvolutionAPI("http://test", "key", transport=transport)
+
+        assert client.instances.fetch("a") == [{"instance": {"instanceName": "a"}}]
+        with pytest.raises(EvolutionAPIError) as excinfo:
+            client.instances.fetch("b")
+        assert excinfo.value.status_code == 404
+        assert excinfo.value.error_message == "Not Found"
+        assert transport.requests[0].headers["apikey"] == "key"
+        assert client.session is None
+        assert client.adapter is None
+
+    def test_request_bodies_and_headers(self):
+        transport = InMemoryTransport(lambda request: (201, b"{}", {"X-Id": "1"}))
+        client = EvolutionAPI("http://test", "key", transport=transport)
+
+        client._post("/instance/create", json={"instanceName": "a"})
+        client.upload("/upload", b"raw", field=None, content_type="audio/ogg")
+
+        created, uploaded = transport.requests
+        assert json.loads(created.body) == {"instanceName": "a"}
+        assert uploaded.headers["Content-Type"] == "audio/ogg"
+        assert b"".join(uploaded.body) == b"raw"
+
+    def test_network_errors_are_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise requests.ConnectionError("reset")
+            return 200, {"ok": True}
+
+        client = EvolutionAPI(
+            "http://test",
+            "key",
+            transport=InMemoryTransport(handler),
+            retry_policy=RetryPolicy(backoff_factor=0, jitter=False),
+        )
+
+        assert client._get("/") == {"ok": True}
+        assert len(calls) == 2
+        assert client.retry_stats().retries == 1
+
+    def test_shared_by_every_node(self):
+        transport = InMemoryTransport(lambda request: (200, {"url": request.url}))
+        client = MultiNodeEvolutionAPI(
+            ["http://node1", "http://node2"], "key", transport=transport
+        )
+
+        urls = [client._get("/")["url"] for _ in range(2)]
+
+        assert urls == ["http://node1/", "http://node2/"]
+        assert all(node.transport is transport for node in client.nodes)
+
+
+class TestHTTP2Transport:
+    """Over HTTP/1.1 servers the transport falls back to HTTP/1.1."""
+
+    def test_requests(self, base_url, tmp_path):
+        client = EvolutionAPI(base_url, "key", transport=HTTP2Transport())
+        path = tmp_path / "audio.ogg"
+        path.write_bytes(b"ogg" * 100)
+
+        fetched = client._get("/instance/fetchInstances", params={"instanceName": "a"})
+        created = client._post("/instance/create", json={"instanceName": "a"})
+        uploaded = client.upload("/upload", path, field=None)
+        with pytest.raises(EvolutionAPIError) as excinfo:
+            client._get("/missing")
+
+        assert fetched == {
+            "path": "/instance/fetchInstances?instanceName=a",
+            "apikey": "key",
+        }
+        assert json.loads(created["body"]) == {"instanceName": "a"}
+        assert created["contentType"] == "application/json"
+        assert uploaded["body"] == "ogg" * 100
+        assert uploaded["contentType"] == "audio/ogg"
+        assert excinfo.value.status_code == 404
+        client.close()
+
+    def test_download(self, base_url, tmp_path):
+        path = tmp_path / "response.json"
+        with EvolutionAPI(base_url, "key", transport=HTTP2Transport()) as client:
+            written = client.download("/media", path)
+
+        assert written == path.stat().st_size
+        assert json.loads(path.read_bytes())["path"] == "/media"
+
+    def test_network_errors_are_requests_errors(self, base_url):
+        transport = HTTP2Transport(PoolConfig(read_timeout=0.1))
+        slow = EvolutionAPI(base_url, "key", transport=transport)
+        down = EvolutionAPI(closed_port_url(), "key", transport=HTTP2Transport())
+
+        with pytest.raises(requests.Timeout):
+            slow._get("/slow")
+        with pytest.raises(requests.ConnectionError):
+            down._get("/")
+
+    def test_streamed_read_errors_are_requests_errors(self, base_url, tmp_path):
+        with EvolutionAPI(base_url, "key", transport=HTTP2Transport()) as client:
+            with pytest.raises(requests.ConnectionError):
+                client.download("/truncated", tmp_path / "media")
+
+    def test_slow_connect_does_not_hold_up_other_hosts(self, base_url):
+        # A full accept queue leaves new connections hanging until timeout.
+        with socket.socket() as listener, socket.socket() as queued:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen(0)
+            queued.connect(listener.getsockname())
+            hanging_url = f"http://127.0.0.1:{listener.getsockname()[1]}"
+
+            transport = HTTP2Transport(PoolConfig(connect_timeout=1))
+            hanging = EvolutionAPI(hanging_url, "key", transport=transport)
+            healthy = EvolutionAPI(base_url, "key", transport=transport)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                stuck = executor.submit(hanging._get, "/")
+                time.sleep(0.1)
+                started = time.perf_counter()
+                assert healthy._get("/")["path"] == "/"
+                elapsed = time.perf_counter() - started
+                with pytest.raises(requests.RequestException):
+                    stuck.result()
+            transport.close()
+
+        assert elapsed < 0.5
+
+    def test_multiplexes_concurrent_requests(self):
+        pytest.importorskip("h2")
+        from benchmarks.h2_stub_server import H2StubServer
+
+        server = H2StubServer(latency=0.05)
+        base_url = server.start()
+        transport = HTTP2Transport(http1=False)
+        client = EvolutionAPI(base_url, "key", transport=transport)
+        try:
+            with ThreadPoolExecutor(max_workers=50) as executor:
+                results = list(
+                    executor.map(lambda i: client.instances.fetch(f"i-{i}"), range(200))
+                )
+        finally:
+            client.close()
+            server.stop()
+
+        assert [r[0]["instance"]["instanceName"] for r in results] == [
+            f"i-{i}" for i in range(200)
+        ]
+        assert server.connections == 1
+        assert client.pool_stats().created == 1
+        assert client.pool_stats().reused == 199
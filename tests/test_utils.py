@@ -0,0 +1,56 @@
+from evolutionapi.utils import instance_name_from_request, path_template, request_key
+
+
+class TestRequestKey:
+    def test_params_order_does_not_matter(self):
+        """Test that keys are independent of the params order."""
+        assert request_key("get", "/path", {"a": 1, "b": 2}) == request_key(
+            "GET", "/path", {"b": 2, "a": 1}
+        )
+
+    def test_distinct_requests(self):
+        """Test that method, path and params all take part in the key."""
+        keys = {
+            request_key("GET", "/path"),
+            request_key("POST", "/path"),
+            request_key("GET", "/other"),
+            request_key("GET", "/path", {"a": 1}),
+        }
+        assert len(keys) == 4
+
+
+class TestInstanceNameFromRequest:
+    def test_from_params(self):
+        assert (
+            instance_name_from_request(
+                "/instance/fetchInstances", params={"instanceName": "teste-docs"}
+            )
+            == "teste-docs"
+        )
+
+    def test_from_json(self):
+        assert (
+            instance_name_from_request(
+                "/instance/create", json={"instanceName": "teste-docs"}
+            )
+            == "teste-docs"
+        )
+
+    def test_from_path(self):
+        assert (
+            instance_name_from_request("/message/sendText/teste-docs") == "teste-docs"
+        )
+
+    def test_not_instance_specific(self):
+        assert instance_name_from_request("/instance/fetchInstances") is None
+
+
+class TestPathTemplate:
+    def test_replaces_instance(self):
+        assert path_template("/instance/connect/teste-docs") == (
+            "/instance/connect/{instance}"
+        )
+
+    def test_keeps_static_paths(self):
+        assert path_template("/instance/fetchInstances") == "/instance/fetchInstances"
+        assert path_template("/") == "/"
@@ -0,0 +1,395 @@
+import asyncio
+import io
+import json
+import threading
+
+import pytest
+import requests
+
+from evolutionapi.exceptions import WebhookPayloadError
+from evolutionapi.webhooks import (
+    AsgiWebhookApp,
+    AsyncWebhookDispatcher,
+    DedupWindow,
+    WebhookApp,
+    WebhookDispatcher,
+    make_server,
+    normalize_event,
+    parse_event,
+)
+
+
+def payload(event="messages.upsert", instance="teste-docs", message_id="ABC", **data):
+    return {
+        "event": event,
+        "instance": instance,
+        "data": {"key": {"id": message_id, "remoteJid": "5511@s.whatsapp.net"}, **data},
+        "server_url": "https://example.evolution-api.com",
+        "apikey": "123456",
+    }
+
+
+def wsgi_call(app, body, method="POST", path="/webhook"):
+    data = json.dumps(body).encode() if not isinstance(body, bytes) else body
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "CONTENT_LENGTH": str(len(data)),
+        "wsgi.input": io.BytesIO(data),
+    }
+    replies = []
+    content = app(environ, lambda status, headers: replies.append((status, headers)))
+    status, headers = replies[0]
+    return int(status.split()[0]), dict(headers), json.loads(b"".join(content))
+
+
+class TestParseEvent:
+    def test_normalize_event(self):
+        assert normalize_event("messages.upsert") == "MESSAGES_UPSERT"
+        assert normalize_event("/messages-upsert") == "MESSAGES_UPSERT"
+        assert normalize_event("MESSAGES_UPSERT") == "MESSAGES_UPSERT"
+
+    def test_parse(self):
+        event = parse_event(json.dumps(payload()).encode())
+
+        assert event.event == "MESSAGES_UPSERT"
+        assert event.instance == "teste-docs"
+        assert event.message_id == "ABC"
+        assert event.payload["apikey"] == "123456"
+
+    def test_event_from_path(self):
+        """Test that webhook_by_events path suffixes name the event."""
+        body = payload()
+        del body["event"]
+
+        assert parse_event(body, "/connection-update").event == "CONNECTION_UPDATE"
+
+    def test_message_update_key(self):
+        """Test that status updates of a message are not duplicates of each other."""
+        delivered = parse_event(
+            {
+                "event": "messages.update",
+                "data": {"keyId": "A", "status": "DELIVERY_ACK"},
+            }
+        )
+        read = parse_event(
+            {"event": "messages.update", "data": {"keyId": "A", "status": "READ"}}
+        )
+
+        assert delivered.message_id == "A"
+        assert delivered.dedup_key != read.dedup_key
+
+    @pytest.mark.parametrize("body", [b"not json", b"[1]", b'{"data": {}}'])
+    def test_invalid(self, body):
+        with pytest.raises(WebhookPayloadError):
+            parse_event(body)
+
+
+class TestDedupWindow:
+    def test_expires(self, clock):
+        window = DedupWindow(ttl=10, clock=clock)
+
+        assert window.seen("a") is False
+        assert window.seen("a") is True
+        clock.now = 10
+        assert window.seen("a") is False
+
+    def test_maxsize(self):
+        window = DedupWindow(maxsize=2)
+        for key in "abc":
+            window.seen(key)
+
+        assert window.seen("a") is False
+        assert window.seen("c") is True
+
+
+class TestWebhookDispatcher:
+    def test_routes_by_event(self):
+        """Test that handlers receive their events and wildcard handlers all."""
+        dispatcher = WebhookDispatcher(workers=2)
+        upserts, everything = [], []
+        dispatcher.on("MESSAGES_UPSERT", upserts.append)
+
+        @dispatcher.on()
+        def handle_all(event):
+            everything.append(event)
+
+        with dispatcher:
+            dispatcher.submit(parse_event(payload()))
+            dispatcher.submit(parse_event(payload(event="connection.update")))
+
+        assert [event.event for event in upserts] == ["MESSAGES_UPSERT"]
+        assert len(everything) == 2
+        assert dispatcher.stats().handled == 3
+
+    def test_preserves_order_per_instance(self):
+        dispatcher = WebhookDispatcher(workers=4)
+        received = []
+        dispatcher.on("messages.upsert", received.append)
+
+        with dispatcher:
+            for i in range(200):
+                instance = f"instance-{i % 5}"
+                dispatcher.submit(
+                    parse_event(payload(instance=instance, message_id=f"{i:04d}"))
+                )
+
+        for i in range(5):
+            ids = [e.message_id for e in received if e.instance == f"instance-{i}"]
+            assert ids == sorted(ids)
+        assert len(received) == 200
+
+    def test_dedup(self):
+        dispatcher = WebhookDispatcher(dedup=DedupWindow())
+        received = []
+        dispatcher.on("messages.upsert", received.append)
+
+        with dispatcher:
+            for _ in range(3):
+                dispatcher.submit(parse_event(payload()))
+
+        assert len(received) == 1
+        assert dispatcher.stats().duplicates == 2
+
+    def test_batches_by_size(self):
+        dispatcher = WebhookDispatcher(workers=1)
+        batches = []
+        dispatcher.on_batch("messages.upsert", batches.append, max_size=3, max_wait=60)
+
+        with dispatcher:
+            for i in range(7):
+                dispatcher.submit(parse_event(payload(message_id=i)))
+
+        # Two full batches, and the remainder flushed on stop.
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+
+    def test_batches_by_time(self):
+        dispatcher = WebhookDispatcher()
+        flushed = threading.Event()
+        batches = []
+
+        @dispatcher.on_batch(max_size=100, max_wait=0.05)
+        def handle(batch):
+            batches.append(batch)
+            flushed.set()
+
+        with dispatcher:
+            dispatcher.submit(parse_event(payload()))
+            assert flushed.wait(2)
+
+        assert [len(batch) for batch in batches] == [1]
+
+    def test_backpressure(self):
+        """Test that events are refused once the queue is full."""
+        dispatcher = WebhookDispatcher(workers=1, queue_size=1)
+        release = threading.Event()
+        dispatcher.on("messages.upsert", lambda event: release.wait(5))
+
+        with dispatcher:
+            results = [
+                dispatcher.submit(parse_event(payload(message_id=i))) for i in range(5)
+            ]
+            release.set()
+
+        assert results[-1] is False
+        assert dispatcher.stats().rejected >= 3
+
+    def test_rejected_event_is_handled_on_redelivery(self):
+        dispatcher = WebhookDispatcher(workers=1, queue_size=1, dedup=DedupWindow())
+        release = threading.Event()
+        received = []
+
+        @dispatcher.on("messages.upsert")
+        def handle(event):
+            release.wait(5)
+            received.append(event.message_id)
+
+        with dispatcher:
+            submitted = [
+                dispatcher.submit(parse_event(payload(message_id=i))) for i in range(3)
+            ]
+            rejected = submitted.index(False)
+            release.set()
+            while dispatcher.submit(parse_event(payload(message_id=rejected))) is False:
+                pass
+
+        assert received.count(rejected) == 1
+        assert dispatcher.stats().duplicates == 0
+
+    def test_handler_errors(self):
+        errors = []
+        dispatcher = WebhookDispatcher(on_error=lambda event, exc: errors.append(exc))
+        dispatcher.on("messages.upsert", lambda event: 1 / 0)
+
+        with dispatcher:
+            dispatcher.submit(parse_event(payload()))
+
+        assert isinstance(errors[0], ZeroDivisionError)
+        assert dispatcher.stats().errors == 1
+
+
+class TestWebhookApp:
+    def test_accepts_event(self):
+        dispatcher = WebhookDispatcher()
+        received = []
+        dispatcher.on("messages.upsert", received.append)
+        app = WebhookApp(dispatcher)
+
+        with dispatcher:
+            status, _, body = wsgi_call(app, payload())
+
+        assert status == 200
+        assert body == {"status": "accepted"}
+        assert received[0].message_id == "ABC"
+
+    def test_event_suffix(self):
+        dispatcher = WebhookDispatcher()
+        received = []
+        dispatcher.on("qrcode.updated", received.append)
+        body = payload()
+        del body["event"]
+
+        with dispatcher:
+            status, _, _ = wsgi_call(
+                WebhookApp(dispatcher), body, path="/webhook/qrcode-updated"
+            )
+
+        assert status == 200
+        assert len(received) == 1
+
+    @pytest.mark.parametrize(
+        "method, path, body, expected",
+        [
+            ("POST", "/other", payload(), 404),
+            ("GET", "/webhook", b"", 405),
+            ("POST", "/webhook", b"not json", 400),
+        ],
+    )
+    def test_errors(self, method, path, body, expected):
+        app = WebhookApp(WebhookDispatcher())
+
+        assert wsgi_call(app, body, method=method, path=path)[0] == expected
+
+    def test_verify(self):
+        app = WebhookApp(
+            WebhookDispatcher(), verify=lambda event: event.payload["apikey"] == "x"
+        )
+
+        assert wsgi_call(app, payload())[0] == 401
+
+    def test_queue_full(self):
+        dispatcher = WebhookDispatcher(workers=1, queue_size=1)
+        release = threading.Event()
+        dispatcher.on("messages.upsert", lambda event: release.wait(5))
+        app = WebhookApp(dispatcher)
+
+        with dispatcher:
+            statuses = [wsgi_call(app, payload(message_id=i)) for i in range(4)]
+            release.set()
+
+        status, headers, _ = statuses[-1]
+        assert status == 503
+        assert headers["Retry-After"] == "1"
+
+    def test_standalone_server(self):
+        dispatcher = WebhookDispatcher()
+        received = []
+        dispatcher.on("messages.upsert", received.append)
+        server = make_server(dispatcher, host="127.0.0.1", port=0)
+        threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+
+        try:
+            response = requests.post(
+                f"http://127.0.0.1:{server.server_address[1]}/webhook", json=payload()
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+            dispatcher.stop()
+
+        assert response.status_code == 200
+        assert len(received) == 1
+
+
+class TestAsyncWebhooks:
+    def test_dispatcher(self):
+        received = []
+
+        async def run():
+            dispatcher = AsyncWebhookDispatcher(dedup=DedupWindow())
+
+            @dispatcher.on("messages.upsert")
+            async def handle(event):
+                received.append(event)
+
+            batches = []
+            dispatcher.on_batch(handler=batches.append, max_size=2)
+
+            async with dispatcher:
+                for i in (1, 2, 2, 3):
+                    await dispatcher.submit(parse_event(payload(message_id=i)))
+            return batches
+
+        batches = asyncio.run(run())
+
+        assert [event.message_id for event in received] == [1, 2, 3]
+        assert [len(batch) for batch in batches] == [2, 1]
+
+    def test_asgi_app(self):
+        received = []
+
+        async def request(app, body, path="/webhook"):
+            messages = [
+                {"type": "http.request", "body": body[:10], "more_body": True},
+                {"type": "http.request", "body": body[10:]},
+            ]
+            sent = []
+
+            async def receive():
+                return messages.pop(0)
+
+            async def send(message):
+                sent.append(message)
+
+            await app({"type": "http", "method": "POST", "path": path}, receive, send)
+            return sent[0]["status"], json.loads(sent[1]["body"])
+
+        async def run():
+            dispatcher = AsyncWebhookDispatcher()
+            dispatcher.on("messages.upsert", received.append)
+            app = AsgiWebhookApp(dispatcher)
+            results = [
+                await request(app, json.dumps(payload()).encode()),
+                await request(app, b"not json at all"),
+                await request(app, b"{}", path="/other"),
+            ]
+            await dispatcher.stop()
+            return results
+
+        results = asyncio.run(run())
+
+        assert [status for status, _ in results] == [200, 400, 404]
+        assert len(received) == 1
+
+    def test_asgi_lifespan(self):
+        async def run():
+            dispatcher = AsyncWebhookDispatcher()
+            app = AsgiWebhookApp(dispatcher)
+            messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+            sent = []
+
+            async def receive():
+                return messages.pop(0)
+
+            async def send(message):
+                sent.append(message["type"])
+
+            await app({"type": "lifespan"}, receive, send)
+            return sent
+
+        assert asyncio.run(run()) == [
+            "lifespan.startup.complete",
+            "lifespan.shutdown.complete",
+        ]
@@ -0,0 +1,233 @@
+import asyncio
+import json
+
+import pytest
+from websockets.asyncio.server import serve
+
+from evolutionapi.async_client import AsyncEvolutionAPI
+from evolutionapi.websocket import EventStream, StreamConnectError
+
+OPEN = "0" + json.dumps({"sid": "e1", "pingInterval": 25000, "pingTimeout": 20000})
+
+
+def message(i, event="messages.upsert"):
+    return {"event": event, "instance": "teste-docs", "data": {"key": {"id": f"M{i}"}}}
+
+
+class StubSocketIO:
+    """Minimal Socket.IO v4 server emitting numbered events."""
+
+    def __init__(self, batches, namespace="/teste-docs", recovery=False):
+        # batches: events to emit per connection, then the connection closes
+        self.batches = list(batches)
+        self.namespace = namespace
+        self.recovery = recovery
+        self.connects = []
+        self.paths = []
+        self.pongs = 0
+
+    async def handler(self, websocket):
+        self.paths.append(websocket.request.path)
+        await websocket.send(OPEN)
+        connect = await websocket.recv()
+        self.connects.append(connect)
+        prefix = "40" if self.namespace == "/" else f"40{self.namespace},"
+        if not connect.startswith(prefix):
+            requested = connect[2:].partition(",")[0]
+            error = json.dumps({"message": "Invalid namespace"})
+            await websocket.send(f"44{requested},{error}")
+            return
+        ack = {"sid": "s1"}
+        if self.recovery:
+            ack["pid"] = "p1"
+        await websocket.send(f"{prefix}{json.dumps(ack)}")
+        await websocket.send("2")
+        self.pongs += (await websocket.recv()) == "3"
+
+        events = self.batches.pop(0) if self.batches else []
+        ns = "" if self.namespace == "/" else f"{self.namespace},"
+        for i, event in events:
+            args = [event["event"], event]
+            if self.recovery:
+                args.append(f"offset-{i}")
+            await websocket.send(f"42{ns}{json.dumps(args)}")
+        if self.batches:
+            return  # drop the connection, the client must reconnect
+        await websocket.wait_closed()
+
+
+async def run_stub(stub, scenario):
+    async with serve(stub.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        return await asyncio.wait_for(scenario(f"http://127.0.0.1:{port}"), 5)
+
+
+def numbered(start, stop, event="messages.upsert"):
+    return [(i, message(i, event)) for i in range(start, stop)]
+
+
+class TestEventStream:
+    def test_url(self):
+        stream = EventStream("https://evo.example.com/", "x", api_key="k")
+
+        assert stream.url == (
+            "wss://evo.example.com/socket.io/?EIO=4&transport=websocket&apikey=k"
+        )
+
+    def test_iterates_events(self):
+        """Test that events are parsed and pings answered."""
+        stub = StubSocketIO([numbered(0, 3)])
+
+        async def scenario(base_url):
+            async with EventStream(base_url, "teste-docs", api_key="k") as stream:
+                return [event async for event, _ in zip_range(stream, 3)]
+
+        events = asyncio.run(run_stub(stub, scenario))
+
+        assert [event.message_id for event in events] == ["M0", "M1", "M2"]
+        assert events[0].event == "MESSAGES_UPSERT"
+        assert events[0].instance == "teste-docs"
+        assert stub.pongs == 1
+        assert "apikey=k" in stub.paths[0]
+
+    def test_filters_events(self):
+        stub = StubSocketIO(
+            [numbered(0, 2) + numbered(2, 3, event="connection.update")]
+        )
+
+        async def scenario(base_url):
+            async with EventStream(
+                base_url, "teste-docs", events=["connection.update"]
+            ) as stream:
+                return [event async for event, _ in zip_range(stream, 1)]
+
+        [event] = asyncio.run(run_stub(stub, scenario))
+        assert event.event == "CONNECTION_UPDATE"
+
+    def test_reconnects(self):
+        """Test that a dropped connection is reopened with backoff."""
+        stub = StubSocketIO([numbered(0, 2), numbered(2, 4)])
+
+        async def scenario(base_url):
+            async with EventStream(
+                base_url, "teste-docs", reconnect_delay=0.01
+            ) as stream:
+                events = [event async for event, _ in zip_range(stream, 4)]
+                return events, stream.stats()
+
+        events, stats = asyncio.run(run_stub(stub, scenario))
+
+        assert [event.message_id for event in events] == ["M0", "M1", "M2", "M3"]
+        assert stats.connects == 2
+
+    def test_resumes_with_recovery(self):
+        """Test that the session id and last offset are sent on reconnect."""
+        stub = StubSocketIO([numbered(0, 2), numbered(2, 3)], recovery=True)
+
+        async def scenario(base_url):
+            async with EventStream(
+                base_url, "teste-docs", reconnect_delay=0.01
+            ) as stream:
+                events = [event async for event, _ in zip_range(stream, 3)]
+                return events, stream.stats()
+
+        events, stats = asyncio.run(run_stub(stub, scenario))
+
+        assert stub.connects[0] == "40/teste-docs,"
+        assert json.loads(stub.connects[1].split(",", 1)[1]) == {
+            "pid": "p1",
+            "offset": "offset-1",
+        }
+        assert stats.recovered == 1
+        assert len(events) == 3
+
+    def test_drop_oldest(self):
+        """Test that a slow consumer loses the oldest events, not memory."""
+        stub = StubSocketIO([numbered(0, 10)])
+
+        async def scenario(base_url):
+            async with EventStream(
+                base_url, "teste-docs", queue_size=3, overflow="drop_oldest"
+            ) as stream:
+                while stream.stats().received < 10:
+                    await asyncio.sleep(0.01)
+                events = [event async for event, _ in zip_range(stream, 3)]
+                return events, stream.stats()
+
+        events, stats = asyncio.run(run_stub(stub, scenario))
+
+        assert [event.message_id for event in events] == ["M7", "M8", "M9"]
+        assert stats.dropped == 7
+
+    def test_block_applies_backpressure(self):
+        """Test that reading stops while the buffer is full."""
+        stub = StubSocketIO([numbered(0, 10)])
+
+        async def scenario(base_url):
+            async with EventStream(base_url, "teste-docs", queue_size=2) as stream:
+                await stream.start()
+                await asyncio.sleep(0.2)
+                received = stream.stats().received
+                events = [event async for event, _ in zip_range(stream, 10)]
+                return received, events
+
+        received, events = asyncio.run(run_stub(stub, scenario))
+
+        assert received <= 3
+        assert len(events) == 10
+
+    def test_gives_up_after_max_reconnects(self):
+        stub = StubSocketIO([], namespace="/other")
+
+        async def scenario(base_url):
+            stream = EventStream(
+                base_url, "teste-docs", reconnect_delay=0.01, max_reconnects=1
+            )
+            with pytest.raises(StreamConnectError, match="Invalid namespace"):
+                async for _ in stream:
+                    pass
+
+        asyncio.run(run_stub(stub, scenario))
+        assert len(stub.connects) == 2
+
+    def test_callbacks(self):
+        stub = StubSocketIO([numbered(0, 2)])
+        received = []
+
+        async def scenario(base_url):
+            stream = EventStream(base_url, "teste-docs")
+
+            @stream.on("messages.upsert")
+            async def handle(event):
+                received.append(event.message_id)
+                if len(received) == 2:
+                    await stream.close()
+
+            await stream.run()
+
+        asyncio.run(run_stub(stub, scenario))
+        assert received == ["M0", "M1"]
+
+    def test_async_client_events(self):
+        stub = StubSocketIO([numbered(0, 1)])
+
+        async def scenario(base_url):
+            async with AsyncEvolutionAPI(base_url, "key") as client:
+                async with client.events("teste-docs") as stream:
+                    return [event async for event, _ in zip_range(stream, 1)]
+
+        [event] = asyncio.run(run_stub(stub, scenario))
+        assert event.message_id == "M0"
+        assert "apikey=key" in stub.paths[0]
+
+
+async def zip_range(stream, count):
+    """Yield the first ``count`` events of a stream."""
+    if count == 0:
+        return
+    index = 0
+    async for event in stream:
+        yield event, index
+        index += 1
+        if index == count:
+            return